@@ -63,11 +63,9 @@ class Site:
         for start_url in to_be_scraped:
             force = to_be_scraped[start_url]
             local_metadata = process_nextrequest(
-                subpages_dir, start_url, force, throttle
+                subpages_dir, start_url, force, throttle, cache=self.cache
             )
             metadata.extend(local_metadata)
 
         json_filename = self.data_dir / (self.site_slug + ".json")
-        self.cache.write_json(json_filename, metadata)
-
-        return json_filename
+        return self.cache.write_export(json_filename, metadata)
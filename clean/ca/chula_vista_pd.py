@@ -1,12 +1,11 @@
 import logging
-import time
 import urllib.parse
 from pathlib import Path
 
-from bs4 import BeautifulSoup
-
 from .. import utils
 from ..cache import Cache
+from ..parsing import make_soup
+from ..ratelimit import limiter
 from .config.chula_vista_pd import index_request_headers
 
 logger = logging.getLogger(__name__)
@@ -49,14 +48,13 @@ class Site:
         # construct a local filename relative to the cache directory - agency slug + page url (ca_chula_vista_pd/senate-bill-1421.html)
         # download the page (if not already cached)
         # save the index page url to cache (sensible name)
+        limiter.throttle(self.base_url, throttle)
         base_name = f"{self.base_url.split('/')[-1]}.html"
         filename = f"{self.agency_slug}/{base_name}"
-        self.cache.download(
-            filename, self.base_url, force=True, headers=index_request_headers
-        )
+        self.cache.download(filename, self.base_url, headers=index_request_headers)
         metadata = []
         html = self.cache.read(filename)
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html)
         content_areas = soup.find_all("div", class_="content_area clearfix")
         desired_element = None
         for content_area in content_areas:
@@ -104,10 +102,8 @@ class Site:
                         }
                         metadata.append(payload)
 
-                    time.sleep(throttle)
         else:
             logger.error("HTML for the desired Elelemt")
 
         outfile = self.data_dir.joinpath(f"{self.agency_slug}.json")
-        self.cache.write_json(outfile, metadata)
-        return outfile
+        return self.cache.write_export(outfile, metadata)
@@ -1,11 +1,10 @@
 import re
-import time
 from pathlib import Path
 
-from bs4 import BeautifulSoup
-
 from .. import utils
 from ..cache import Cache
+from ..parsing import make_soup
+from ..ratelimit import limiter
 from .config.corona_pd import index_request_headers
 
 
@@ -14,9 +13,11 @@ class Site:
 
     Attributes:
         name (str): The official name of the agency
+        page_regions (tuple): The parts of each page the scraper reads; nothing else is parsed
     """
 
     name = "Corona Police Department."
+    page_regions = ("div.accordion_widget",)
 
     def __init__(
         self,
@@ -43,9 +44,15 @@ class Site:
         return f"{state_postal}_{mod.stem}"  # ca_corona_pd
 
     def scrape_meta(self, throttle=0):
+        outfile = self.data_dir.joinpath(f"{self.agency_slug}.json")
+        return self.cache.write_export(outfile, self.iter_meta(throttle))
+
+    def iter_meta(self, throttle=0):
+        """Yield metadata on each downloadable file as it's found."""
         # construct a local filename relative to the cache directory - agency slug + page url (ca_corona_pd/trust-and-transparency.html)
         # download the page (if not already cached)
         # save the index page url to cache (sensible name)
+        limiter.throttle(self.base_url, throttle)
         base_name = f"{self.base_url.split('/')[-1].split('#')[0]}.html"
         filename = f"{self.agency_slug}/{base_name}"
         self.cache.download(
@@ -53,9 +60,8 @@ class Site:
             self.base_url,
             headers=index_request_headers,
         )
-        metadata = []
         html = self.cache.read(filename)
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html, only=self.page_regions)
         body = soup.find("div", class_="accordion_widget mn-accordion")
         links = body.find_all("a")
         for link in links:
@@ -75,11 +81,7 @@ class Site:
                     "title": title,
                     "parent_page": str(filename),
                 }
-                metadata.append(payload)
-            time.sleep(throttle)
-        outfile = self.data_dir.joinpath(f"{self.agency_slug}.json")
-        self.cache.write_json(outfile, metadata)
-        return outfile
+                yield payload
 
     def _get_clean_case_num(self, element):
         parent_tag = element.find_parent(["p", "td"])
@@ -1,12 +1,11 @@
 import re
-import time
 from pathlib import Path
 
-from bs4 import BeautifulSoup
-
 from .. import utils
 from ..cache import Cache
 from ..config.fremont_pd import index_request_headers
+from ..parsing import make_soup
+from ..ratelimit import limiter
 
 
 class Site:
@@ -46,6 +45,7 @@ class Site:
         # construct a local filename relative to the cache directory - agency slug + page url (ca_fremont_pd/officer-involved-shootings.html)
         # download the page (if not already cached)
         # save the index page url to cache (sensible name)
+        limiter.throttle(self.base_url, throttle)
         base_name = f"{self.base_url.split('/')[-1]}.html"
         filename = f"{self.agency_slug}/{base_name}"
         self.cache.download(
@@ -56,7 +56,7 @@ class Site:
         metadata = []
         date_pattern = r"\b(?:January|February|March|April|May|June|July|August|September|October|November|December) \d{1,2}, \d{4}\b"
         html = self.cache.read(filename)
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html)
         body = soup.find("div", class_="content_area normal_content_area clearfix")
         div_to_exclude = body.find(
             "div", class_="downloadmessage no_external_url_indication"
@@ -98,6 +98,7 @@ class Site:
 
             if "nixle" in asset_link:
                 name = asset_link.split("/")[-1]
+                limiter.throttle(asset_link, throttle)
                 nixle_data = self._get_doc_from_nixle(title, asset_link)
                 if nixle_data:
                     payload = {
@@ -135,11 +136,9 @@ class Site:
                     "details": {"date": date, "year": year},
                 }
                 metadata.append(payload)
-            time.sleep(throttle)
 
         outfile = self.data_dir.joinpath(f"{self.agency_slug}.json")
-        self.cache.write_json(outfile, metadata)
-        return outfile
+        return self.cache.write_export(outfile, metadata)
 
     def _get_doc_from_nixle(self, title, asset_link):
         child_name = f"{asset_link.split('/')[-1]}.html"
@@ -149,7 +148,7 @@ class Site:
             asset_link,
         )
         html = self.cache.read(filename)
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html)
         body = soup.find("div", class_="full_message_aux")
         link = body.find("a")
         if link:
@@ -1,8 +1,8 @@
-import time
 from pathlib import Path
 
 from .. import utils
 from ..cache import Cache
+from ..ratelimit import limiter
 
 
 class Site:
@@ -53,6 +53,7 @@ class Site:
         # construct a local filename relative to the cache directory - agency slug + page url (ca_fresno_county_sheriff/SheriffPublic.json)
         # download the page (if not already cached)
         # save the index page url to cache (sensible name)
+        limiter.throttle(self.folder_url, throttle)
         base_name = "SheriffPublic.json"
         filename = f"{self.agency_slug}/{base_name}"
         base_output_json = self.cache_dir.joinpath(filename)
@@ -75,7 +76,6 @@ class Site:
                     self.cache.write_json(output_json, r.json())
                     output_dict = {"fileName": filename, "filePath": output_json}
                     local_index_json.append(output_dict)
-                time.sleep(throttle)
         for download_json_path in local_index_json:  # This Iteration is for the Years
             download_dict = self.cache.read_json(download_json_path["filePath"])
             results = download_dict.get("data", {}).get("results", [])
@@ -93,8 +93,7 @@ class Site:
                         metadata.append(payload)
 
         outfile = self.data_dir.joinpath(f"{self.agency_slug}.json")
-        self.cache.write_json(outfile, metadata)
-        return outfile
+        return self.cache.write_export(outfile, metadata)
 
     def _get_child_pages(self, result, parent_path, year, case_id):
         childMetadata = []
@@ -1,13 +1,11 @@
 import logging
-import time
 from pathlib import Path
 from urllib.parse import parse_qs, urlparse
 
-import requests
-from bs4 import BeautifulSoup
-
 from .. import utils
 from ..cache import Cache
+from ..parsing import make_soup
+from ..ratelimit import limiter
 
 logger = logging.getLogger(__name__)
 
@@ -51,12 +49,13 @@ class Site:
         # construct a local filename relative to the cache directory - agency slug + page url (ca_grass_valley_pd/records-release.html)
         # download the page (if not already cached)
         # save the index page url to cache (sensible name)
+        limiter.throttle(self.index_url, throttle)
         base_name = f"{self.index_url.split('/')[-1]}.html"
         filename = f"{self.agency_slug}/{base_name}"
-        self.cache.download(filename, self.index_url, force=True)
+        self.cache.download(filename, self.index_url)
         metadata = []
         html = self.cache.read(filename)
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html)
         content_areas = soup.find("div", class_="content-after-inner")
         h2_elements = content_areas.find_all("h2", class_="title")
         links = [h2.find("a") for h2 in h2_elements]
@@ -69,9 +68,9 @@ class Site:
                 title = link.string
                 child_name = f"{link_href.split('/')[-1]}.html"
                 child_filename = f"{self.agency_slug}/{child_name}"
-                self.cache.download(child_filename, link_href, force=True)
+                self.cache.download(child_filename, link_href)
                 html = self.cache.read(child_filename)
-                soup = BeautifulSoup(html, "html.parser")
+                soup = make_soup(html)
                 content_areas = soup.find("section", class_="page-content")
                 child_links = content_areas.find_all("a")
                 video_counter = 1
@@ -89,6 +88,7 @@ class Site:
                         }
                         metadata.append(payload)
                     if "sharepoint" in link:
+                        limiter.throttle(link, throttle)
                         download_link = self._get_sharepoint_link(link)
                         if download_link:
                             name = download_link.split("/")[-1]
@@ -115,14 +115,11 @@ class Site:
                         }
                         metadata.append(payload)
 
-            time.sleep(throttle)
-
         outfile = self.data_dir.joinpath(f"{self.agency_slug}.json")
-        self.cache.write_json(outfile, metadata)
-        return outfile
+        return self.cache.write_export(outfile, metadata)
 
     def _get_sharepoint_link(self, url):
-        response = requests.get(url)
+        response = utils.get_session(url).get(url)
         logger.debug(f"Response code: {response.status_code}")
 
         if response.status_code == 200:
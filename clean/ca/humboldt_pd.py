@@ -1,10 +1,11 @@
-import time
 from pathlib import Path
 
-from bs4 import BeautifulSoup, Tag
+from bs4 import Tag
 
 from .. import utils
 from ..cache import Cache
+from ..parsing import make_soup
+from ..ratelimit import limiter
 
 
 class Site:
@@ -12,9 +13,11 @@ class Site:
 
     Attributes:
         name (str): The official name of the agency
+        page_regions (tuple): The parts of the index page the scraper reads; nothing else is parsed
     """
 
     name = "Humboldt Police"
+    page_regions = ("table.fr-alternate-rows",)
 
     def __init__(
         self,
@@ -44,6 +47,7 @@ class Site:
         # construct a local filename relative to the cache directory - agency slug + page url (ca_humboldt_pd/SB-1421-AB-748-Information.html)
         # download the page (if not already cached)
         # save the index page url to cache (sensible name)
+        limiter.throttle(self.base_url, throttle)
         base_name = f"{self.base_url.split('#')[0].split('/')[-1]}.html"
         base_filename = f"{self.agency_slug}/{base_name}"
         self.cache.download(base_filename, self.base_url)
@@ -53,7 +57,7 @@ class Site:
         }
         child_pages = [base_page_data]
         html = self.cache.read(base_filename)
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html, only=self.page_regions)
         body = soup.find("table", class_="fr-alternate-rows")
         child_links = body.find_all("a")
         for link in child_links:
@@ -66,17 +70,16 @@ class Site:
                     "page_name": child_file_name,
                 }
                 child_pages.append(child_page_data)
-            time.sleep(throttle)
         metadata = self._get_asset_links(child_pages, base_filename)
         outfile = self.data_dir.joinpath(f"{self.agency_slug}.json")
-        self.cache.write_json(outfile, metadata)
-        return outfile
+        return self.cache.write_export(outfile, metadata)
 
     def _get_asset_links(self, pages, parent_page) -> list:
         metadata = []
         for page in pages:
             html = self.cache.read(page["page_name"])
-            soup = BeautifulSoup(html, "html.parser")
+            # Case pages link their documents in different places, so parse them whole
+            soup = make_soup(html)
             document_body = soup.find("div", class_="relatedDocuments")
             if isinstance(document_body, Tag):
                 links = document_body.find_all("a")
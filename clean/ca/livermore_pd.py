@@ -69,6 +69,4 @@ class Site:
             metadata.extend(local_metadata)
 
         json_filename = self.data_dir / (self.site_slug + ".json")
-        self.cache.write_json(json_filename, metadata)
-
-        return json_filename
+        return self.cache.write_export(json_filename, metadata)
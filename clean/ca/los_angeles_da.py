@@ -1,12 +1,11 @@
-import time
 from datetime import datetime
 from pathlib import Path
 from typing import List
 
-from bs4 import BeautifulSoup
-
 from .. import utils
 from ..cache import Cache
+from ..parsing import make_soup
+from ..ratelimit import limiter
 from ..utils import MetadataDict
 
 
@@ -57,6 +56,7 @@ class Site:
 
         #     # Create a list of years to scrape
         #     # e.g. [2016, 2017...]
+        limiter.throttle(self.base_url, throttle)
         current_year = datetime.now().year
         years = range(2016, current_year + 1)
         metadata: List[MetadataDict] = []  # Explicitly set as a list of MetadataDict
@@ -75,33 +75,44 @@ class Site:
         for report_type in report_types:
             for year in years:
                 cache_path = self._download_index_page(year, str(report_type["url"]))
-                html = self.cache.read(cache_path)
-                soup = BeautifulSoup(html, "html.parser")
-
-                body = soup.find_all("span", {"style": "text-decoration: underline;"})
-                for span in body:
-                    links = span.find_all("a")
-                    for link in links:
-                        url = link.get("href")
-                        # Check if the URL contains any of the keywords for this report type
-                        if any(keyword in url for keyword in report_type["keywords"]):
-                            title = link.get("title", link.get_text(strip=True))
-                            asset_url = self.base_url + url.strip()
-                            case_id = "".join(link.stripped_strings)
-                            payload: MetadataDict = {
-                                "asset_url": asset_url,
-                                "case_id": case_id,
-                                "name": asset_url.split("pdf/")[-1],
-                                "title": title,
-                                "parent_page": str(report_type["url"]),
-                            }
-                            metadata.append(payload)
-                            time.sleep(throttle)
+                # Unchanged index pages aren't parsed again
+                metadata.extend(
+                    self.cache.parse(
+                        cache_path,
+                        self._extract_reports,
+                        report_type["keywords"],
+                        str(report_type["url"]),
+                    )
+                )
 
         outfile = self.data_dir.joinpath(f"{self.agency_slug}.json")
-        self.cache.write_json(outfile, metadata)
-
-        return outfile
+        return self.cache.write_export(outfile, metadata)
+
+    def _extract_reports(
+        self, html: str, keywords: List[str], parent_page: str
+    ) -> List[MetadataDict]:
+        """Extract links to one report type's PDFs from a year's index page."""
+        metadata: List[MetadataDict] = []
+        soup = make_soup(html)
+        body = soup.find_all("span", {"style": "text-decoration: underline;"})
+        for span in body:
+            links = span.find_all("a")
+            for link in links:
+                url = link.get("href")
+                # Check if the URL contains any of the keywords for this report type
+                if any(keyword in url for keyword in keywords):
+                    title = link.get("title", link.get_text(strip=True))
+                    asset_url = self.base_url + url.strip()
+                    case_id = "".join(link.stripped_strings)
+                    payload: MetadataDict = {
+                        "asset_url": asset_url,
+                        "case_id": case_id,
+                        "name": asset_url.split("pdf/")[-1],
+                        "title": title,
+                        "parent_page": parent_page,
+                    }
+                    metadata.append(payload)
+        return metadata
 
     def _download_index_page(self, year: int, base_url: str):
         url = f"{base_url}{year}"
@@ -1,14 +1,13 @@
 import logging
 from pathlib import Path
-from time import sleep
 from typing import Dict, List, Set
 from urllib.parse import unquote, urlparse
 
-from bs4 import BeautifulSoup
-
 from .. import utils
 from ..cache import Cache
+from ..parsing import make_soup
 from ..platforms.nextrequest import process_nextrequest
+from ..ratelimit import limiter
 
 logger = logging.getLogger(__name__)
 
@@ -27,9 +26,11 @@ class Site:
 
     Attributes:
         name (str): The official name of the agency
+        page_regions (tuple): The parts of each page the scraper reads; nothing else is parsed
     """
 
     name = "Los Angeles Police Department"
+    page_regions = ("title", "div.grid-content", "div.link-box")
 
     def __init__(
         self,
@@ -83,16 +84,15 @@ class Site:
         Returns:
             Path: Local path of JSON file containing metadata on downloadable files
         """
+        limiter.throttle(self.first_url, throttle)
         lookup = self.fetch_indexes(throttle)
         json_filename, metadata = self.fetch_subpages(throttle)
 
         logger.debug("Adding origin details to metadata")
-        for i, entry in enumerate(metadata):
+        for entry in metadata:
             if entry["case_id"] in lookup:
-                metadata[i]["details"]["bln_source"] = lookup[entry["case_id"]]
-        self.cache.write_json(json_filename, metadata)
-
-        return json_filename
+                entry.update_details({"bln_source": lookup[entry["case_id"]]})
+        return self.cache.write_export(json_filename, metadata)
 
     def url_to_filename(self, url: str):
         """Turn a URL into a proposed filename."""
@@ -144,8 +144,6 @@ class Site:
 
         indexes_todo.add(self.first_url)
 
-        # Need to add sleep between calls
-
         while not scraping_complete:
             index_passes += 1
             for page_url in list(
@@ -163,10 +161,8 @@ class Site:
 
                 self.cache.write_binary(filename, r.content)
 
-                sleep(throttle)
-
                 # Need to write the page
-                soup = BeautifulSoup(r.content, features="html.parser")
+                soup = make_soup(r.content, only=self.page_regions)
 
                 page_title = soup.title
                 if page_title:
@@ -211,6 +207,8 @@ class Site:
                 )
 
         self.cache.write_json(self.detail_urls, detail_urls)
+        # Keep the case URL list through cache evictions; fetch_subpages reads it back
+        self.cache.pin(self.detail_urls)
 
         self.cache.write_json(self.indexes_scraped, indexes_scraped)
 
@@ -248,10 +246,10 @@ class Site:
         for start_url in to_be_scraped:
             force = to_be_scraped[start_url]
             local_metadata = process_nextrequest(
-                subpages_dir, start_url, force, throttle
+                subpages_dir, start_url, force, throttle, cache=self.cache
             )
             metadata.extend(local_metadata)
 
         json_filename = self.data_dir / (self.site_slug + ".json")
-        self.cache.write_json(json_filename, metadata)
+        json_filename = self.cache.write_export(json_filename, metadata)
         return json_filename, metadata
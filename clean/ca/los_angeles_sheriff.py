@@ -1,11 +1,9 @@
 import logging
-import time
 from pathlib import Path
 
-import requests
-
 from .. import utils
 from ..cache import Cache
+from ..ratelimit import limiter
 from .config.los_angeles_sheriff import (
     detail_payload,
     detail_request_headers,
@@ -47,6 +45,7 @@ class Site:
             utils.create_directory(localdir)
 
     def scrape_meta(self, throttle: int = 0) -> Path:
+        limiter.throttle(self.rooturl, throttle)
         rawindex = self._fetch_index()
         oldtimestamps = self._fetch_old_timestamps()
         indextimes = self._build_timestamps(rawindex)
@@ -60,7 +59,7 @@ class Site:
 
     def _fetch_index(self):
         indexjsonurl = "https://lasdsb1421.powerappsportals.us/_services/entity-grid-data.json/f46b70cc-580b-4f1a-87c3-41deb48eb90d"
-        r = requests.post(
+        r = utils.get_session(indexjsonurl).post(
             indexjsonurl,
             headers=index_request_headers,
             data=index_payload,
@@ -100,6 +99,8 @@ class Site:
     def _save_timestamps(self, indextimestamps):
         targetfilename = self.siteslug + "/timestamplog.json"
         self.cache.write_json(self.cache_dir / targetfilename, indextimestamps)
+        # Keep the log through cache evictions; it drives incremental scrapes
+        self.cache.pin(self.cache_dir / targetfilename)
         return
 
     def _get_detail_json(self, recordid: str):
@@ -113,7 +114,7 @@ class Site:
             + recordid
         )
         targetfilename = f"{self.siteslug}/subpages/{recordid}.json"
-        r = requests.post(
+        r = utils.get_session(targeturl).post(
             targeturl,
             headers=local_request_headers,
             data=local_payload,
@@ -152,7 +153,6 @@ class Site:
     def _fetch_detail_pages(self, detailtodo, throttle):
         for recordid in detailtodo:
             self._get_detail_json(recordid)
-            time.sleep(throttle)
 
     def _build_caseindex(self, rawindex):
         caseindex = {}
@@ -225,5 +225,4 @@ class Site:
     def _save_assetlist(self, assetlist):
         targetfilename = self.data_dir / (self.siteslug + ".json")
         logger.debug(f"Saving asset list to {targetfilename}")
-        self.cache.write_json(self.cache_dir / targetfilename, assetlist)
-        return targetfilename
+        return self.cache.write_export(targetfilename, assetlist)
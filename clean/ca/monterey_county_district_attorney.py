@@ -1,11 +1,10 @@
 import re
-import time
 from pathlib import Path
 
-from bs4 import BeautifulSoup
-
 from .. import utils
 from ..cache import Cache
+from ..parsing import make_soup
+from ..ratelimit import limiter
 from .config.monterey_county_district_attorney import index_request_headers
 
 
@@ -14,9 +13,11 @@ class Site:
 
     Attributes:
         name (str): The official name of the agency
+        page_regions (tuple): The parts of each page the scraper reads; nothing else is parsed
     """
 
     name = "Monterey County District Attorney"
+    page_regions = ("table#oisTable",)
 
     def __init__(
         self,
@@ -43,9 +44,15 @@ class Site:
         return f"{state_postal}_{mod.stem}"  # ca_monterey_county_district_attorney
 
     def scrape_meta(self, throttle=0):
+        outfile = self.data_dir.joinpath(f"{self.agency_slug}.json")
+        return self.cache.write_export(outfile, self.iter_meta(throttle))
+
+    def iter_meta(self, throttle=0):
+        """Yield metadata on each downloadable file as it's found."""
         # construct a local filename relative to the cache directory - agency slug + page url (ca_monterey_county_district_attorney/officer-involved-shootings.html)
         # download the page (if not already cached)
         # save the index page url to cache (sensible name)
+        limiter.throttle(self.base_url, throttle)
 
         date_pattern = re.compile(r"(\w+\s\d{1,2},\s?\d{4})")
         name_pattern = re.compile(r"\(([^)]+)\)")
@@ -55,9 +62,8 @@ class Site:
         filename = f"{self.agency_slug}/{base_name}"
 
         self.cache.download(filename, self.base_url, headers=index_request_headers)
-        metadata = []
         html = self.cache.read(filename)
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html, only=self.page_regions)
         body = soup.find("table", id="oisTable")
         links = body.find_all("a")
         for link in links:
@@ -86,8 +92,4 @@ class Site:
                 "parent_page": str(filename),
                 "details": {"date": date, "year": year_from_date},
             }
-            metadata.append(payload)
-            time.sleep(throttle)
-        outfile = self.data_dir.joinpath(f"{self.agency_slug}.json")
-        self.cache.write_json(outfile, metadata)
-        return outfile
+            yield payload
@@ -1,12 +1,11 @@
 import re
-import time
 import urllib.parse
 from pathlib import Path
 
-from bs4 import BeautifulSoup
-
 from .. import utils
 from ..cache import Cache
+from ..parsing import make_soup
+from ..ratelimit import limiter
 
 
 class Site:
@@ -14,9 +13,11 @@ class Site:
 
     Attributes:
         name (str): The official name of the agency
+        page_regions (tuple): The parts of each page the scraper reads; nothing else is parsed
     """
 
     name = "City of Napa Police Department"
+    page_regions = ("div.moduleContentNew",)
 
     def __init__(
         self,
@@ -67,12 +68,13 @@ class Site:
         # construct a local filename relative to the cache directory - agency slug + page url (ca_napa_pd/Penal-Code-Section-8327-b.html)
         # download the page (if not already cached)
         # save the index page url to cache (sensible name)
+        limiter.throttle(self.base_url, throttle)
         base_name = f"{self.base_url.split('/')[-1]}.html"
         filename = f"{self.agency_slug}/{base_name}"
         self.cache.download(filename, self.base_url)
         metadata = []
         html = self.cache.read(filename)
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html, only=self.page_regions)
         body = soup.find("div", class_="moduleContentNew")
         sections = body.find_all("div", class_="row outer wide")
         for section in sections[1:]:
@@ -138,10 +140,8 @@ class Site:
                                     "parent_page": str(filename),
                                 }
                                 metadata.append(payload)
-                    time.sleep(throttle)
         outfile = self.data_dir.joinpath(f"{self.agency_slug}.json")
-        self.cache.write_json(outfile, metadata)
-        return outfile
+        return self.cache.write_export(outfile, metadata)
 
     def process_document_center(self, folder_id, folder_name):
         documents_list = []
@@ -1,10 +1,9 @@
 import logging
 from pathlib import Path
 
-from bs4 import BeautifulSoup
-
 from .. import utils
 from ..cache import Cache
+from ..parsing import make_soup
 from ..platforms.nextrequest import process_nextrequest
 
 logger = logging.getLogger(__name__)
@@ -64,7 +63,7 @@ class Site:
         self.cache.download(filename, self.disclosure_url)
         metadata = []
         html = self.cache.read(filename)
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html)
         body = soup.find_all(
             "table", class_="w-full border text-sm border-cool-gray-500"
         )[-1]
@@ -80,17 +79,16 @@ class Site:
             sb_category = td_tags[1].get_text(strip=True)
             if "nextrequest" in link.get("href"):
                 local_metadata = process_nextrequest(
-                    subpages_dir, link.get("href"), True, throttle
+                    subpages_dir, link.get("href"), False, throttle, cache=self.cache
                 )
                 for data in local_metadata:
-                    data["details"]["officer_name"] = officer_name
-                    data["details"]["sb_category"] = sb_category
+                    data.update_details(
+                        {"officer_name": officer_name, "sb_category": sb_category}
+                    )
                 metadata.extend(local_metadata)
             else:
                 print("link unknown: ", link.get("href"))
             count += 1
 
         json_filename = self.data_dir / (self.site_slug + ".json")
-        self.cache.write_json(json_filename, metadata)
-
-        return json_filename
+        return self.cache.write_export(json_filename, metadata)
@@ -1,9 +1,8 @@
 from pathlib import Path
 
-from bs4 import BeautifulSoup
-
 from .. import utils
 from ..cache import Cache
+from ..parsing import make_soup
 
 
 class Site:
@@ -35,7 +34,7 @@ class Site:
         file_stem = self.disclosure_url.split("/")[-1]
         html_location = f"{self.agency_slug}/{file_stem}.html"
         html = self.cache.read(html_location)
-        soup = BeautifulSoup(html, "html.parser")  # type: ignore
+        soup = make_soup(html)  # type: ignore
         title = soup.find("title").text.strip()  # type: ignore
         links = soup.article.find_all("a")  # type: ignore
         urls = []
@@ -64,8 +63,7 @@ class Site:
             }
             metadata.append(payload)
         outfile = self.data_dir.joinpath(f"{self.agency_slug}.json")
-        self.cache.write_json(outfile, metadata)
-        return outfile
+        return self.cache.write_export(outfile, metadata)
 
     def _download_index_pages(self, url: str) -> Path:
         file_stem = url.split("/")[-1]
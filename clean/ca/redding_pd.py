@@ -1,12 +1,11 @@
 import re
-import time
 import urllib.parse
 from pathlib import Path
 
-from bs4 import BeautifulSoup
-
 from .. import utils
 from ..cache import Cache
+from ..parsing import make_soup
+from ..ratelimit import limiter
 
 
 class Site:
@@ -47,12 +46,13 @@ class Site:
         # construct a local filename relative to the cache directory - agency slug + page url (redding_pd/senate_bill_1421_releases.html)
         # download the page (if not already cached)
         # save the index page url to cache (sensible name)
+        limiter.throttle(self.index_url, throttle)
         base_name = f"{self.index_url.split('/')[-1].split('.')[0]}.html"
         filename = f"{self.agency_slug}/{base_name}"
-        self.cache.download(filename, self.index_url, force=True)
+        self.cache.download(filename, self.index_url)
         metadata = []
         html = self.cache.read(filename)
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html)
         content_table = soup.find("table")
         links = content_table.find_all("a")
         for link in links:
@@ -83,8 +83,6 @@ class Site:
                     },
                 }
                 metadata.append(payload)
-            time.sleep(throttle)
 
         outfile = self.data_dir.joinpath(f"{self.agency_slug}.json")
-        self.cache.write_json(outfile, metadata)
-        return outfile
+        return self.cache.write_export(outfile, metadata)
@@ -1,11 +1,10 @@
-import time
 import urllib.parse
 from pathlib import Path
 
-from bs4 import BeautifulSoup
-
 from .. import utils
 from ..cache import Cache
+from ..parsing import make_soup
+from ..ratelimit import limiter
 
 
 class Site:
@@ -13,9 +12,11 @@ class Site:
 
     Attributes:
         name (str): The official name of the agency
+        page_regions (tuple): The parts of each page the scraper reads; nothing else is parsed
     """
 
     name = "Riverside Police Department"
+    page_regions = ("section.col-sm-9",)
 
     def __init__(
         self,
@@ -44,15 +45,20 @@ class Site:
         return f"{state_postal}_{mod.stem}"  # ca_river_side_pd
 
     def scrape_meta(self, throttle=0):
+        outfile = self.data_dir.joinpath(f"{self.agency_slug}.json")
+        return self.cache.write_export(outfile, self.iter_meta(throttle))
+
+    def iter_meta(self, throttle=0):
+        """Yield metadata on each downloadable file as it's found."""
         # construct a local filename relative to the cache directory - agency slug + page url (ca_river_side_pd/officer-involved-deaths-oid.html)
         # download the page (if not already cached)
         # save the index page url to cache (sensible name)
+        limiter.throttle(self.base_url, throttle)
         base_name = f"{self.base_url.split('/')[-2]}.html"
         filename = f"{self.agency_slug}/{base_name}"
         self.cache.download(filename, self.base_url)
-        metadata = []
         html = self.cache.read(filename)
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html, only=self.page_regions)
         body = soup.find("section", class_="col-sm-9")
         sections = body.select("div#accordion>div.panel.panel-default")
         for section in sections:
@@ -82,8 +88,4 @@ class Site:
                             "parent_page": str(filename),
                             "details": {"date": date},
                         }
-                        metadata.append(payload)
-                    time.sleep(throttle)
-        outfile = self.data_dir.joinpath(f"{self.agency_slug}.json")
-        self.cache.write_json(outfile, metadata)
-        return outfile
+                        yield payload
@@ -8,6 +8,7 @@ from bs4 import BeautifulSoup, ResultSet, Tag
 
 from .. import utils
 from ..cache import Cache
+from ..parsing import make_soup
 from ..utils import MetadataDict
 
 BASE_URL = "https://www.cityofsacramento.gov"
@@ -85,7 +86,7 @@ class Site:
         file_stem = self.disclosure_url.split("/")[-1]
         html_location = f"{self.agency_slug}/{file_stem}.html"
         html = self.cache.read(html_location)
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html)
         lists = soup.select("#container-392a98e5b6 .paragraph li")
 
         for url in self._extract_index_urls(lists):
@@ -101,8 +102,7 @@ class Site:
 
         metadata = self._extract_child_links(links)
         outfile = self.data_dir.joinpath(f"{self.agency_slug}.json")
-        self.cache.write_json(outfile, metadata)
-        return outfile
+        return self.cache.write_export(outfile, metadata)
 
     def _extract_index_urls(self, lists: ResultSet[Tag]):
         """
@@ -237,7 +237,7 @@ class Site:
         base_file = f"{self.agency_slug}/{filepath_stem}.html"
         cache_path = self.cache.download(base_file, url, "utf-8")
         html = self.cache.read(cache_path)
-        return BeautifulSoup(html, "html.parser")
+        return make_soup(html)
 
     def _clean_text(self, text: str) -> str:
         """
@@ -1,11 +1,10 @@
 import logging
-import time
 from pathlib import Path
 
-from bs4 import BeautifulSoup
-
 from .. import utils
 from ..cache import Cache
+from ..parsing import make_soup
+from ..ratelimit import limiter
 
 logger = logging.getLogger(__name__)
 
@@ -49,12 +48,13 @@ class Site:
         # construct a local filename relative to the cache directory - agency slug + page url (san_diego_harbor_pd/transparency-disclosures.html)
         # download the page (if not already cached)
         # save the index page url to cache (sensible name)
+        limiter.throttle(self.base_url, throttle)
         base_name = f"{self.base_url.split('/')[-1]}.html"
         filename = f"{self.agency_slug}/{base_name}"
         self.cache.download(filename, self.base_url)
         metadata = []
         html = self.cache.read(filename)
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html)
         body = soup.find(
             "div",
             class_="field field--name-field-paragraphs field--type-entity-reference-revisions field--label-hidden field__items",
@@ -83,11 +83,10 @@ class Site:
                     logger.debug(payload)
                     metadata.append(payload)
                 elif "sandiego" in link_href:
+                    limiter.throttle(link_href, throttle)
                     metadata.extend(self.scrape_san_diego(link_href, data))
-                time.sleep(throttle)
         outfile = self.data_dir.joinpath(f"{self.agency_slug}.json")
-        self.cache.write_json(outfile, metadata)
-        return outfile
+        return self.cache.write_export(outfile, metadata)
 
     def scrape_san_diego(self, link, data):
         child_name = f'{data["title"]}.html'
@@ -95,7 +94,7 @@ class Site:
         self.cache.download(filename, link)
         metadata = []
         html = self.cache.read(filename)
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html)
         body = soup.find(
             "div",
             class_="clearfix text-formatted field field--name-body field--type-text-with-summary field--label-hidden field__item",
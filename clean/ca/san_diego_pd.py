@@ -1,12 +1,13 @@
 import re
-import time
 import urllib.parse
 from pathlib import Path
-
-from bs4 import BeautifulSoup
+from typing import Iterator
 
 from .. import utils
 from ..cache import Cache
+from ..parsing import make_soup
+from ..profiling import phase
+from ..ratelimit import limiter
 from ..utils import MetadataDict
 
 
@@ -15,9 +16,11 @@ class Site:
 
     Attributes:
         name (str): The official name of the agency
+        page_regions (tuple): The parts of each page the scraper reads; nothing else is parsed
     """
 
     name = "San Diego Police Department"
+    page_regions = ("div.view-header", "div.view-content", "li.pager__item--last")
 
     def __init__(
         self,
@@ -55,64 +58,77 @@ class Site:
         Returns:
             Path: Local path of JSON file containing metadata on downloadable files
         """
-        # Run the scraper on home page
-        first_index_page_local = self._download_index_page(self.disclosure_url)
-        local_index_pages = [first_index_page_local]
-        # Extract URLs for all index pages from home page
-        index_page_urls = self._get_index_page_urls(first_index_page_local)
-        # Download remaining index pages
-        for url in index_page_urls:
-            time.sleep(throttle)
-            local_index_pages.append(self._download_index_page(url))
+        outfile = self.data_dir.joinpath(f"{self.agency_slug}.json")
+        return self.cache.write_export(outfile, self.iter_meta(throttle))
+
+    def iter_meta(self, throttle: int = 0) -> Iterator[MetadataDict]:
+        """Yield metadata on downloadable files as each child page is processed.
+
+        Args:
+            throttle (int): Number of seconds to wait between requests. Defaults to 0.
+        """
+        limiter.throttle(self.disclosure_url, throttle)
+        with phase("fetch index"):
+            # Run the scraper on home page
+            first_index_page_local = self._download_index_page(self.disclosure_url)
+            local_index_pages = [first_index_page_local]
+            # Extract URLs for all index pages from home page
+            index_page_urls = self._get_index_page_urls(first_index_page_local)
+            # Download remaining index pages
+            for url in index_page_urls:
+                local_index_pages.append(self._download_index_page(url))
         # Gather child pages ({page name, url, source index page})
         child_pages = []
-        for index_page in local_index_pages:
-            child_pages.extend(self._get_child_page(index_page, throttle))
-        downloadable_files = self._get_asset_links()
-        return downloadable_files
+        with phase("fetch children"):
+            for index_page in local_index_pages:
+                child_pages.extend(self._get_child_page(index_page, throttle))
+        yield from self._iter_assets()
 
     # Helper functions
-    def _get_asset_links(self) -> Path:
-        """Extract link to files and videos from child pages."""
-        metadata = []
+    def _iter_assets(self) -> Iterator[MetadataDict]:
+        """Yield links to files and videos from the cached child pages."""
         # Process child page HTML files in index page folders,
-        # building a list of file metadata (name, url, etc.) along the way
+        # yielding file metadata (name, url, etc.) along the way.
+        # Pages that haven't changed since the last run aren't parsed again.
         for item in Path(self.cache_dir, self.agency_slug).iterdir():
             if item.is_dir() and item.name.startswith("sb16"):
                 for html_file in item.iterdir():
                     if html_file.suffix == ".html":
-                        html = self.cache.read(html_file)
-                        soup = BeautifulSoup(html, "html.parser")
-                        title = soup.find("div", "view-header").text.strip()  # type: ignore
-                        links = soup.find("div", class_="view-content").find_all("a")  # type: ignore
-                        # Save links to files, videos, etc with relevant metadata
-                        # for downstream processing
-                        for link in links:
-                            # Remove pagination part from html_file name
-                            payload: MetadataDict = {
-                                "title": title,
-                                "parent_page": str(html_file),
-                                "asset_url": link["href"].replace("\n", ""),
-                                "name": link.text.strip().replace("\n", ""),
-                                "case_id": re.sub(r"_page=\d+$", "", html_file.stem),
-                            }
-                            metadata.append(payload)
-        # Store the metadata in a JSON file in the data directory
-        outfile = self.data_dir.joinpath(f"{self.agency_slug}.json")
-        self.cache.write_json(outfile, metadata)
-        # Return path to metadata file for downstream use
-        return outfile
+                        with phase("extract assets"):
+                            assets = self.cache.parse(
+                                html_file, self._extract_assets, str(html_file)
+                            )
+                        yield from assets
+
+    def _extract_assets(self, html: str, html_file: str) -> list[MetadataDict]:
+        """Extract links to files and videos from one child page."""
+        soup = make_soup(html, only=self.page_regions)
+        title = soup.find("div", "view-header").text.strip()  # type: ignore
+        links = soup.find("div", class_="view-content").find_all("a")  # type: ignore
+        # Save links to files, videos, etc with relevant metadata
+        # for downstream processing
+        metadata = []
+        for link in links:
+            # Remove pagination part from html_file name
+            payload: MetadataDict = {
+                "title": title,
+                "parent_page": html_file,
+                "asset_url": link["href"].replace("\n", ""),
+                "name": link.text.strip().replace("\n", ""),
+                "case_id": re.sub(r"_page=\d+$", "", Path(html_file).stem),
+            }
+            metadata.append(payload)
+        return metadata
 
     def _get_child_page(self, index_page: Path, throttle: int = 0) -> list[dict]:
         """Get URLs for child pages from index pages."""
         html = self.cache.read(index_page)
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html, only=self.page_regions)
         # Get all the child page URLs
         parent_div = soup.find("div", class_="view-content")
         links = parent_div.find_all("a")  # type: ignore
         child_pages = []
         for anchor in links:
-            time.sleep(throttle)
             page_meta = {
                 "source_index_page": index_page,  # index page where this child page was found
                 "source_name": anchor.text.strip(),
@@ -145,7 +161,7 @@ class Site:
         """Get the URLs for all index pages."""
         # Read the cached HTML file for home page
         html = self.cache.read(first_index_page)
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html, only=self.page_regions)
         # Gross, but necessary to pass mypy type checking
         last_page = (
             soup.find("li", class_="pager__item pager__item--last")  # type: ignore
@@ -1,10 +1,9 @@
-import time
 from pathlib import Path
 
-from bs4 import BeautifulSoup
-
 from .. import utils
 from ..cache import Cache
+from ..parsing import make_soup
+from ..ratelimit import limiter
 
 
 class Site:
@@ -12,9 +11,11 @@ class Site:
 
     Attributes:
         name (str): The official name of the agency
+        page_regions (tuple): The parts of each page the scraper reads; nothing else is parsed
     """
 
     name = "Santa Rosa Police"
+    page_regions = ("div.fr-view",)
 
     def __init__(
         self,
@@ -44,12 +45,13 @@ class Site:
         # construct a local filename relative to the cache directory - agency slug + page url (ca_santa_rosa/3201.html)
         # download the page (if not already cached)
         # save the index page url to cache (sensible name)
+        limiter.throttle(self.base_url, throttle)
         base_name = f"{self.base_url.split('/')[-2]}.html"
         filename = f"{self.agency_slug}/{base_name}"
         self.cache.download(filename, self.base_url)
         metadata = []
         html = self.cache.read(filename)
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html, only=self.page_regions)
         body = soup.find("div", class_="fr-view")
         links = body.find_all("a")
         for link in links:
@@ -63,10 +65,8 @@ class Site:
                     "name": link.string,
                 }
                 metadata.append(payload)
-            time.sleep(throttle)
         outfile = self.data_dir.joinpath(f"{self.agency_slug}.json")
-        self.cache.write_json(outfile, metadata)
-        return outfile
+        return self.cache.write_export(outfile, metadata)
 
     def _make_download_path(self, asset):
         url = asset["asset_url"]
@@ -1,9 +1,8 @@
 from pathlib import Path
 
-from bs4 import BeautifulSoup
-
 from .. import utils
 from ..cache import Cache
+from ..parsing import make_soup
 
 
 class Site:
@@ -11,10 +10,12 @@ class Site:
 
     Attributes:
         name (str): The official name of the agency
+        page_regions (tuple): The parts of each page the scraper reads; nothing else is parsed
     """
 
     name = "Sonoma County Sheriff's Office"
     agency_slug = "ca_sonoma_county_sheriff"
+    page_regions = ("div.main-content",)
 
     def __init__(self, data_dir=utils.CLEAN_DATA_DIR, cache_dir=utils.CLEAN_CACHE_DIR):
         """Initialize a new instance.
@@ -44,7 +45,7 @@ class Site:
         self.cache.download(filename, self.base_url)
         metadata = []
         html = self.cache.read(filename)
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html, only=self.page_regions)
         body = soup.find("div", class_="main-content")
         links = body.find_all("a")
         for link in links:
@@ -59,8 +60,7 @@ class Site:
                 }
                 metadata.append(payload)
         outfile = self.data_dir.joinpath(f"{self.agency_slug}.json")
-        self.cache.write_json(outfile, metadata)
-        return outfile
+        return self.cache.write_export(outfile, metadata)
 
     def _make_download_path(self, asset):
         # TODO: Update the logic to gracefully handle PDFs in addition to zip fiiles
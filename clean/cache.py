@@ -1,16 +1,55 @@
 import csv
+import hashlib
+import io
 import json
 import logging
+import mimetypes
 import os
+import sqlite3
+import time
 import typing
 from os.path import expanduser, join
 from pathlib import Path
 from typing import Union
 
+import requests
+
+from . import compression as compression_module
+from . import exports, freshness, parsing, sinks
+from .cache_index import INDEX_NAME, CacheIndex, IndexEntry
+from .metrics import metrics
+from .parse_cache import PARSED_NAME, ParseCache, encode_args, extractor_key
+from .profiling import phase
 from .utils import MetadataDict, get_url, get_youtube_url
 
 logger = logging.getLogger(__name__)
 
+T = typing.TypeVar("T")
+
+# How much of a response body to hold in memory at once while downloading
+CHUNK_SIZE = 64 * 1024
+
+# Interrupted downloads are kept under these suffixes so they can be resumed
+PARTIAL_SUFFIX = ".part"
+PARTIAL_STATE_SUFFIX = ".part.json"
+
+# How many times to pick a dropped transfer back up before giving up
+RESUME_ATTEMPTS = 5
+
+# Share of the byte budget eviction frees the cache down to, so the next
+# few writes don't each set off another round
+EVICT_TO = 0.9
+
+# How many eviction candidates to read from the index at a time
+EVICT_BATCH = 100
+
+RESUMABLE_ERRORS = (
+    requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    ConnectionError,
+)
+
 
 class Cache:
     """Basic interface to save files to and fetch from cache.
@@ -32,20 +71,87 @@ class Cache:
 
             cache.files('fl')
 
+    Text files (HTML, JSON, CSV, XML) inside the cache directory can be
+    stored compressed by setting CLEAN_CACHE_COMPRESSION to "gzip" or "zstd".
+    Files keep their names and are decompressed transparently on read, so
+    scrapers don't need to know; older uncompressed files stay readable.
+
+    What scrapers extract from cached pages can be kept too, with
+    :meth:`parse`, so unchanged pages aren't parsed again on the next run.
+
+    The cache can also be held to a byte budget. Once it's over, the least
+    recently used files are deleted until it's back under 90% of the budget,
+    except for files pinned with :meth:`pin` because a scraper relies on
+    them between runs.
+
     Args:
         path (str): Full path to cache directory. Defaults to CLEAN_ETL_DIR
             or, if env var not specified, $HOME/.clean-scraper/cache
+        compression (str): "none", "gzip" or "zstd". Defaults to CLEAN_CACHE_COMPRESSION or "none".
+        max_bytes (int): Byte budget, enforced after every write. Defaults to CLEAN_CACHE_MAX_BYTES or no limit.
+        index (bool): Keep an index and parse cache in the folder. Turn it off for
+            folders of downloaded assets, which should hold nothing but the assets
+            and are never evicted, whatever the byte budget. Defaults to True.
     """
 
-    def __init__(self, path: Union[Path, None]):
+    def __init__(
+        self,
+        path: Union[Path, None],
+        compression: typing.Optional[str] = None,
+        max_bytes: typing.Optional[int] = None,
+        index: bool = True,
+    ):
         """Initialize a new instance."""
         self.root_dir = self._path_from_env or self._path_default
         self.path = path or str(Path(self.root_dir, "cache"))
+        self.indexed = index
+        self.index = CacheIndex(Path(self.path, INDEX_NAME))
+        self.parsed = ParseCache(Path(self.path, PARSED_NAME))
+        self.compression = compression_module.resolve_codec(compression)
+        if max_bytes is None and index:
+            max_bytes = parse_size(os.environ.get("CLEAN_CACHE_MAX_BYTES"))
+        # Only indexed files can be evicted
+        self.max_bytes = max_bytes if index else None
+        # Running guess at the cache's size, so every write needn't sum the index
+        self._estimated_size: typing.Optional[int] = None
 
     def exists(self, name):
-        """Test whether the provided file path exists."""
+        """Test whether the provided file path exists.
+
+        Leftovers from interrupted downloads never count as cached files.
+        """
+        if _is_partial(name):
+            return False
         return Path(self.path, name).exists()
 
+    def is_fresh(self, name, url: typing.Optional[str] = None) -> bool:
+        """Test whether a cached file can be used without asking the server again.
+
+        Args:
+            name (str): Partial name, relative to cache dir, or a full path inside it
+            url (str): The URL the file comes from. Optional.
+
+        Returns: False if the file is missing or older than its TTL in :mod:`clean.freshness`
+        """
+        if not self.exists(name):
+            metrics.observe_cache("miss")
+            return False
+        path = Path(self.path, name)
+        rel = self._index_name(path)
+        agency = rel.split("/", 1)[0] if rel and "/" in rel else None
+        ttl = freshness.get_policy().ttl(agency, url, rel)
+        if ttl is None:
+            fresh = True
+        else:
+            entry = self._lookup(rel) if rel else None
+            if entry and entry["fetched_at"]:
+                fetched_at = entry["fetched_at"]
+            else:
+                fetched_at = path.stat().st_mtime
+            fresh = time.time() - fetched_at < ttl
+        metrics.observe_cache("hit" if fresh else "miss")
+        return fresh
+
     def read(self, name):
         """Read text file from cache.
 
@@ -57,8 +163,10 @@ class Cache:
         """
         path = Path(self.path, name)
         logger.debug(f"Reading from cache {path}")
-        with open(path, newline="", encoding="utf-8") as infile:
-            return infile.read()
+        with compression_module.open_read(path, text=True) as infile:
+            content = infile.read()
+        self._touch(path)
+        return content
 
     def read_csv(self, name):
         """Read csv file from cache.
@@ -71,8 +179,10 @@ class Cache:
         """
         path = Path(self.path, name)
         logger.debug(f"Reading CSV from cache {path}")
-        with open(path, encoding="utf-8") as fh:
-            return list(csv.reader(fh))
+        with compression_module.open_read(path, text=True) as fh:
+            rows = list(csv.reader(fh))
+        self._touch(path)
+        return rows
 
     def read_json(self, name: Path) -> Union[list[dict], dict]:
         """Read JSON file from cache.
@@ -83,8 +193,53 @@ class Cache:
         Returns:
             list of dictionaries or one dictionary
         """
-        with open(name, encoding="utf-8") as fh:
-            return json.load(fh)
+        with compression_module.open_read(name, text=True) as fh:
+            data = json.load(fh)
+        self._touch(Path(name))
+        return data
+
+    def parse(self, name, extract: typing.Callable[..., T], *args) -> T:
+        """Extract data from a cached page, reusing the last run's result if nothing changed.
+
+        ``extract`` is called with the page's text and ``args`` only when the
+        page's content, the args, the source of the module defining
+        ``extract`` or of the shared parsing helpers, the HTML parser backend,
+        or, for a scraper's method, its ``page_regions`` differ from the last
+        time it ran on this page. Otherwise its stored result is returned
+        without reading the HTML into BeautifulSoup at all.
+
+        The result must be JSON-serializable, and it's always returned as
+        decoded JSON, so tuples come back as lists. It must depend only on
+        the page's content, its name and ``args``.
+
+        Example: ::
+
+            records = cache.parse(html_file, self._extract_assets, str(html_file))
+
+        Args:
+            name (str): Partial name, relative to cache dir, or a full path inside it
+            extract (callable): Takes the page's text, then ``args``, and returns what it found
+            *args: Extra JSON-serializable arguments for ``extract``, which are part of the key
+        """
+        path = Path(self.path, name)
+        html = self.read(path)
+        digest = hashlib.sha256(html.encode("utf-8")).hexdigest()
+        extractor, version = extractor_key(extract)
+        if version is not None:
+            # The same source can extract differently with another backend or regions
+            regions = getattr(getattr(extract, "__self__", None), "page_regions", None)
+            version = encode_args((version, parsing.resolve_parser(), regions))
+        page = self._index_name(path) or str(path)
+        key = encode_args(args)
+        if version is not None and self.indexed:
+            cached = self.parsed.get(extractor, page, key, version, digest)
+            if cached is not None:
+                logger.debug(f"Reusing what {extractor} extracted from {path}")
+                return json.loads(cached)
+        result = json.dumps(extract(html, *args))
+        if version is not None and self.indexed:
+            self.parsed.put(extractor, page, key, version, digest, result)
+        return json.loads(result)
 
     def download(
         self,
@@ -97,11 +252,20 @@ class Cache:
         """
         Download the provided URL and save it in the cache *if* it doesn't already exist in cache.
 
+        Cached files are reused until they go stale under the freshness
+        policy in :mod:`clean.freshness`. By default they never do.
+
+        With ``force=True``, or once the file is stale, it is revalidated
+        rather than blindly refetched: the ETag and Last-Modified saved from
+        the last download are sent as ``If-None-Match`` and
+        ``If-Modified-Since``. If the server answers 304 Not Modified, the
+        cached body is kept and only its modification time is bumped.
+
         Args:
             name (str): The path where the file will be saved. Can be a simple string like "ca_san_diego_pd/video.mp4"
             url (str): The URL to download
             encoding (str): The encoding of the response. Optional.
-            force (bool): If True, will download the file if it already exists in the cache.
+            force (bool): If True, will revalidate the file with the server if it already exists in the cache.
             **kwargs: Additional arguments to pass to requests.get()
 
         Returns: The local file system path where the file is cached
@@ -111,29 +275,327 @@ class Cache:
         local_path.parent.mkdir(parents=True, exist_ok=True)
         url_queue = [url]
         # Request the URL
-        if not force and self.exists(name):
+        if force:
+            metrics.observe_cache("miss")
+        elif self.is_fresh(name, url):
             logger.debug(f"File found in cache: {local_path}")
+            self._touch(local_path)
             return local_path
 
         if "youtube" in url or "youtu.be" in url:
             logger.debug("Detected Youtube URL")
             url_queue = get_youtube_url(url)
 
-        for url in url_queue:
-            with get_url(url, stream=True, **kwargs) as r:
-                # If there's no encoding, set it
-                if encoding:
-                    r.encoding = encoding
-                elif r.encoding is None:
-                    r.encoding = "utf-8"
-                logger.debug(f"Downloading {url} to {local_path}")
-                # Write out the file in little chunks
-                with open(local_path, "wb") as f:
-                    for chunk in r.iter_content(chunk_size=8192):
-                        f.write(chunk)
+        with phase("fetch"):
+            for url in url_queue:
+                self._stream_to_file(url, local_path, encoding, **kwargs)
         # Return the path
         return local_path
 
+    def _stream_to_file(
+        self,
+        url: str,
+        local_path: Path,
+        encoding: typing.Optional[str] = None,
+        **kwargs,
+    ):
+        """Stream a URL into local_path, resuming an earlier partial download if possible.
+
+        The body is written to a ``.part`` file next to the target and only
+        renamed into place once it is complete. Alongside it, a ``.part.json``
+        file records the validators (Content-Length, ETag, Last-Modified) of the
+        response that started the transfer. If the transfer drops, the next
+        attempt asks for the remaining bytes with a ``Range`` header, guarded by
+        ``If-Range``, and falls back to a full fetch if the server ignores it.
+
+        Args:
+            url (str): The URL to download
+            local_path (Path): Final location of the file
+            encoding (str): The encoding of the response. Optional.
+            **kwargs: Additional arguments to pass to requests.get()
+        """
+        part_path = local_path.with_name(f"{local_path.name}{PARTIAL_SUFFIX}")
+        state_path = local_path.with_name(f"{local_path.name}{PARTIAL_STATE_SUFFIX}")
+        state = self._read_partial_state(part_path, state_path, url)
+        validators = self._read_validators(local_path, url)
+        response = None
+        hasher = None
+
+        for attempt in range(1, RESUME_ATTEMPTS + 1):
+            offset = part_path.stat().st_size if state else 0
+            if offset and offset == state.get("content_length"):
+                # Everything arrived last time; only the rename was missed
+                break
+            request_kwargs = kwargs
+            if validators and not offset:
+                # Ask the server to skip the body if our copy is still current
+                headers = dict(kwargs.get("headers") or {})
+                if validators.get("etag"):
+                    headers["If-None-Match"] = validators["etag"]
+                if validators.get("last_modified"):
+                    headers["If-Modified-Since"] = validators["last_modified"]
+                request_kwargs = {**kwargs, "headers": headers}
+            elif offset:
+                headers = dict(kwargs.get("headers") or {})
+                headers["Range"] = f"bytes={offset}-"
+                if state.get("validator"):
+                    headers["If-Range"] = state["validator"]
+                request_kwargs = {**kwargs, "headers": headers}
+                logger.debug(f"Resuming {url} from byte {offset:,}")
+            try:
+                with get_url(url, stream=True, **request_kwargs) as r:
+                    if validators and r.status_code == 304:
+                        logger.debug(f"{url} not modified; keeping {local_path}")
+                        metrics.observe_cache("revalidated")
+                        os.utime(local_path)
+                        self._index_download(local_path, url, r)
+                        return
+                    # If there's no encoding, set it
+                    if encoding:
+                        r.encoding = encoding
+                    elif r.encoding is None:
+                        r.encoding = "utf-8"
+                    if offset and self._resumes_at(r, offset, state):
+                        mode = "ab"
+                        hasher = _update_hash(hashlib.sha256(), part_path)
+                    else:
+                        if offset:
+                            logger.debug(f"{url} ignored the range request")
+                        mode = "wb"
+                        hasher = hashlib.sha256()
+                        state = self._partial_state(url, r)
+                        if state["resumable"]:
+                            with open(state_path, "w", encoding="utf-8") as fh:
+                                json.dump(state, fh)
+                        else:
+                            state_path.unlink(missing_ok=True)
+                    logger.debug(f"Downloading {url} to {local_path}")
+                    # Write out the file in little chunks
+                    received = 0
+                    try:
+                        with open(part_path, mode) as f:
+                            for chunk in r.iter_content(chunk_size=CHUNK_SIZE):
+                                f.write(chunk)
+                                hasher.update(chunk)
+                                received += len(chunk)
+                    finally:
+                        metrics.observe_bytes(url, received)
+                    response = r
+            except RESUMABLE_ERRORS as e:
+                if state and state["resumable"] and attempt < RESUME_ATTEMPTS:
+                    logger.warning(f"Download of {url} interrupted ({e}); resuming")
+                    continue
+                if not (state and state["resumable"]):
+                    part_path.unlink(missing_ok=True)
+                raise
+            except AssertionError:
+                if not offset:
+                    part_path.unlink(missing_ok=True)
+                    raise
+                # The server refused the range (e.g. 416); start over
+                logger.debug(f"Range request for {url} failed; fetching it in full")
+                part_path.unlink(missing_ok=True)
+                state_path.unlink(missing_ok=True)
+                state = {}
+                continue
+            except BaseException:
+                if not (state and state["resumable"]):
+                    part_path.unlink(missing_ok=True)
+                raise
+            break
+        else:
+            raise OSError(f"Gave up downloading {url} after {RESUME_ATTEMPTS} attempts")
+
+        # Make sure we got everything the server promised
+        expected = state.get("content_length") if state else None
+        size = part_path.stat().st_size
+        if expected is not None and size != expected:
+            part_path.unlink(missing_ok=True)
+            state_path.unlink(missing_ok=True)
+            raise OSError(f"Expected {expected:,} bytes from {url} but got {size:,}")
+        os.replace(part_path, local_path)
+        state_path.unlink(missing_ok=True)
+        content_type = response.headers.get("Content-Type") if response else None
+        codec = self._codec_for(local_path, content_type)
+        if codec:
+            compression_module.compress_file(local_path, codec)
+        metrics.observe_written(local_path.stat().st_size)
+        if response is not None:
+            self._index_download(
+                local_path, url, response, hasher.hexdigest() if hasher else None
+            )
+
+    def _read_validators(self, local_path: Path, url: str) -> dict:
+        """Look up the ETag and Last-Modified stored for a cached copy of url."""
+        if not local_path.exists():
+            return {}
+        name = self._index_name(local_path)
+        entry = self._lookup(name) if name else None
+        if entry and entry["url"] == url:
+            validators = {
+                "etag": entry["etag"],
+                "last_modified": entry["last_modified"],
+            }
+            if any(validators.values()):
+                return validators
+        return {}
+
+    def _index_download(self, local_path: Path, url: str, response, sha256=None):
+        """Record a downloaded or revalidated file in the index."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        fields = {
+            "url": url,
+            "etag": etag if isinstance(etag, str) else None,
+            "last_modified": last_modified if isinstance(last_modified, str) else None,
+        }
+        if response.status_code == 304:
+            # A 304 may omit validators that haven't changed
+            previous = self._read_validators(local_path, url)
+            for key in ("etag", "last_modified"):
+                fields[key] = fields[key] or previous.get(key)
+            name = self._index_name(local_path)
+            entry = self._lookup(name) if name else None
+            if entry and entry["sha256"]:
+                fields["sha256"] = entry["sha256"]
+        else:
+            content_type = response.headers.get("Content-Type")
+            fields["content_type"] = (
+                content_type if isinstance(content_type, str) else None
+            )
+            if sha256:
+                fields["sha256"] = sha256
+        self._index_file(local_path, **fields)
+
+    def _codec_for(
+        self, path: Path, content_type: typing.Optional[str] = None
+    ) -> typing.Optional[str]:
+        """Pick the codec for a file: compress text inside the cache, leave the rest alone."""
+        if not self.compression:
+            return None
+        if not compression_module.is_compressible(path, content_type):
+            return None
+        if self._index_name(path) is None:
+            # Exports and other files outside the cache are for people; keep them plain
+            return None
+        return self.compression
+
+    def _index_name(self, path: Union[Path, str]) -> typing.Optional[str]:
+        """Return a path relative to the cache root, or None if it lies outside."""
+        try:
+            name = Path(path).resolve().relative_to(Path(self.path).resolve())
+        except ValueError:
+            return None
+        return name.as_posix()
+
+    def _index_file(self, path: Path, **fields):
+        """Add or refresh a file's index entry. The index is best-effort."""
+        name = self._index_name(path)
+        if name is None or _is_internal(name) or not self.indexed:
+            return
+        fields.setdefault("content_type", mimetypes.guess_type(name)[0])
+        if "sha256" not in fields:
+            fields["sha256"] = _hash_file(path)
+        size = path.stat().st_size
+        try:
+            self.index.record(name, size=size, fetched_at=time.time(), **fields)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not update cache index for {name}: {e}")
+            return
+        if self.max_bytes is None:
+            return
+        if self._estimated_size is None:
+            self._estimated_size = self.index.total_size()
+        else:
+            # Overwrites are counted twice, which only brings the next check forward
+            self._estimated_size += size
+        if self._estimated_size > self.max_bytes:
+            self.evict(exclude=name)
+
+    def _touch(self, path: Path):
+        """Note that a cached file was used, for least-recently-used eviction."""
+        name = self._index_name(path)
+        if name is None or not self.indexed:
+            return
+        try:
+            self.index.touch(name, time.time())
+        except sqlite3.Error as e:
+            logger.debug(f"Could not update cache index for {name}: {e}")
+
+    def _lookup(self, name: str) -> typing.Optional[IndexEntry]:
+        if not self.indexed:
+            return None
+        try:
+            return self.index.get(name)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read cache index for {name}: {e}")
+            return None
+
+    def _read_partial_state(self, part_path: Path, state_path: Path, url: str) -> dict:
+        """Load the resume state for a partial download, discarding it if unusable."""
+        if not part_path.exists():
+            state_path.unlink(missing_ok=True)
+            return {}
+        try:
+            with open(state_path, encoding="utf-8") as fh:
+                state = json.load(fh)
+        except (OSError, ValueError):
+            state = {}
+        if state.get("url") != url or not state.get("resumable"):
+            logger.debug(f"Discarding unusable partial download {part_path}")
+            part_path.unlink(missing_ok=True)
+            state_path.unlink(missing_ok=True)
+            return {}
+        return state
+
+    def _partial_state(self, url: str, response) -> dict:
+        """Capture what we need to safely resume a response later."""
+        headers = response.headers
+        content_length = headers.get("Content-Length")
+        content_encoding = headers.get("Content-Encoding")
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        # If-Range only accepts strong ETags
+        validator = None
+        if isinstance(etag, str) and not etag.startswith("W/"):
+            validator = etag
+        elif isinstance(last_modified, str):
+            validator = last_modified
+        # Content-Length and byte offsets count the body as sent, so they only
+        # match what iter_content() writes when it isn't compressed in transit
+        identity = not isinstance(content_encoding, str) or (
+            content_encoding.lower() == "identity"
+        )
+        length = (
+            int(content_length)
+            if identity and isinstance(content_length, str) and content_length.isdigit()
+            else None
+        )
+        return {
+            "url": url,
+            "content_length": length,
+            "validator": validator,
+            "resumable": bool(
+                length is not None and headers.get("Accept-Ranges") != "none"
+            ),
+        }
+
+    def _resumes_at(self, response, offset: int, state: dict) -> bool:
+        """Check that a response is a partial body that picks up at offset."""
+        if response.status_code != 206:
+            return False
+        content_range = response.headers.get("Content-Range", "")
+        try:
+            unit, spec = content_range.split(" ", 1)
+            start = int(spec.split("-", 1)[0])
+            total = spec.split("/", 1)[1]
+        except (ValueError, IndexError):
+            return False
+        if unit != "bytes" or start != offset:
+            return False
+        expected = state.get("content_length")
+        return total == "*" or expected is None or int(total) == expected
+
     def write(self, name, content):
         """Save text content to a file in cache.
 
@@ -160,8 +622,12 @@ class Cache:
         out = Path(self.path, name)
         out.parent.mkdir(parents=True, exist_ok=True)
         logger.debug(f"Writing to cache {out}")
-        with open(out, "w", newline="", encoding="utf-8") as fh:
-            fh.write(content)
+        with compression_module.open_write(out, self._codec_for(out)) as fh:
+            fh.write(content.encode("utf-8"))
+        metrics.observe_written(out.stat().st_size)
+        self._index_file(
+            out, sha256=hashlib.sha256(content.encode("utf-8")).hexdigest()
+        )
         return str(out)
 
     def write_binary(self, name, content):
@@ -185,8 +651,10 @@ class Cache:
         out = Path(self.path, name)
         out.parent.mkdir(parents=True, exist_ok=True)
         logger.debug(f"Writing to cache {out}")
-        with open(out, "wb") as fh:
+        with compression_module.open_write(out, self._codec_for(out)) as fh:
             fh.write(content)
+        metrics.observe_written(out.stat().st_size)
+        self._index_file(out, sha256=hashlib.sha256(content).hexdigest())
         return str(out)
 
     def write_json(
@@ -228,12 +696,70 @@ class Cache:
             full_path = self.path.joinpath(out)  # type: ignore
         else:
             full_path = out
-        out.parent.mkdir(parents=True, exist_ok=True)
+        full_path.parent.mkdir(parents=True, exist_ok=True)
         logger.debug(f"Writing to cache {full_path}")
-        with open(full_path, "w", newline="") as fh:
-            json.dump(files_meta, fh, indent=4)
+        codec = self._codec_for(full_path)
+        with phase("write"), compression_module.open_write(full_path, codec) as raw:
+            with io.TextIOWrapper(raw, encoding="utf-8", newline="") as fh:
+                # Indentation only helps people reading the file; skip it when compressing
+                json.dump(files_meta, fh, indent=None if codec else 4)
+        metrics.observe_written(full_path.stat().st_size)
+        self._index_file(full_path, content_type="application/json")
         return full_path
 
+    def write_export(
+        self,
+        name: Union[Path, str],
+        records: typing.Iterable,
+        export_format: typing.Optional[str] = None,
+    ) -> Path:
+        """Save an agency's metadata export, streaming records to disk as they arrive.
+
+        ``records`` can be a list or a generator, such as a site's
+        ``iter_meta``. It's written one record at a time through a
+        :mod:`clean.sinks` sink, so a generator is never held in memory.
+        Records go to a ``.part`` file that replaces the previous export only
+        once it's complete. If the scrape fails, the previous export is left
+        as it was and what was gathered is saved beside it as ``.failed``.
+
+        The file gets the suffix for its format: .json, .jsonl, .csv or
+        .sqlite3. A leftover export in another format is removed, so
+        :func:`clean.exports.find_export` always finds the latest one.
+
+        Example: ::
+
+            outfile = self.data_dir.joinpath(f"{self.agency_slug}.json")
+            return self.cache.write_export(outfile, self.iter_meta(throttle))
+
+        Args:
+            name (Path|str): Full path, or a partial path relative to cache dir, ending in .json
+            records (iterable): Metadata dicts for downloadable assets
+            export_format (str): "json", "jsonl", "csv" or "sqlite" (default: the one set by :func:`clean.exports.use_format`, CLEAN_EXPORT_FORMAT or "json")
+
+        Returns:
+            Path: Full path to the saved file
+        """
+        export_format = exports.resolve_format(export_format)
+        sink_class = sinks.SINKS[export_format]
+        out = Path(self.path, name).with_suffix(sink_class.suffix)
+        sink = sink_class(out, self._codec_for(out))
+        logger.debug(f"Writing {export_format} export to {sink.path}")
+        with sink:
+            for record in records:
+                with phase("write"):
+                    sink.write(record)
+        for sink_class in sinks.SINKS.values():
+            stale = out.with_suffix(sink_class.suffix)
+            if stale != out and stale.exists():
+                stale.unlink()
+                stale_name = self._index_name(stale)
+                if stale_name:
+                    self.index.remove(stale_name)
+        logger.debug(f"Exported {sink.count:,} records to {out}")
+        metrics.observe_written(out.stat().st_size)
+        self._index_file(out)
+        return out
+
     def files(self, subdir=".", glob_pattern="*"):
         """
         Retrieve all files and folders in a subdir relative to cache dir.
@@ -256,7 +782,159 @@ class Cache:
             glob_pattern (str): Glob pattern. Defaults to all files in specified subdir ('*')
         """
         _dir = Path(self.path).joinpath(subdir)
-        return [str(p) for p in _dir.glob(glob_pattern)]
+        return [str(p) for p in _dir.glob(glob_pattern) if not _is_internal(p)]
+
+    def lookup(self, name: str) -> typing.Optional[IndexEntry]:
+        """Return the index entry for a cached file.
+
+        Example: ::
+
+            entry = cache.lookup("ca_san_diego_pd/sb16-sb1421-ab748.html")
+            entry["url"], entry["fetched_at"], entry["sha256"]
+
+        Args:
+            name (str): Partial name, relative to cache dir
+
+        Returns: The entry, or None if the file isn't indexed
+        """
+        return self._lookup(Path(name).as_posix())
+
+    def lookup_url(self, url: str) -> list[IndexEntry]:
+        """Return index entries for every cached file downloaded from a URL."""
+        return self.index.by_url(url)
+
+    def entries(
+        self, subdir: str = "", agency: typing.Optional[str] = None
+    ) -> list[IndexEntry]:
+        """List indexed files without walking the filesystem.
+
+        Example: ::
+
+            # Everything cached for an agency
+            cache.entries(agency="ca_los_angeles_pd")
+
+            # Just one folder
+            cache.entries("ca_los_angeles_pd/subpages")
+
+        Args:
+            subdir (str): Only list files under this folder, relative to cache dir
+            agency (str): Only list files in this agency's top-level folder
+
+        Returns: Matching entries, sorted by name
+        """
+        prefix = Path(subdir).as_posix().strip("/") if subdir else ""
+        if prefix in ("", "."):
+            prefix = ""
+        else:
+            prefix += "/"
+        return self.index.entries(prefix, agency=agency)
+
+    def pin(self, name: Union[Path, str]):
+        """Protect a cached file from eviction.
+
+        Use this for files a scraper reads back on its next run to work out
+        what changed, so a full cache never costs it its memory.
+
+        Example: ::
+
+            cache.pin("ca_los_angeles_sheriff/timestamplog.json")
+
+        Args:
+            name (Path|str): Partial name, relative to cache dir, or a full path inside it
+        """
+        self._set_pinned(name, True)
+
+    def unpin(self, name: Union[Path, str]):
+        """Let a pinned file be evicted again."""
+        self._set_pinned(name, False)
+
+    def _set_pinned(self, name: Union[Path, str], pinned: bool):
+        rel = self._index_name(Path(self.path, name))
+        if rel is None:
+            raise ValueError(f"{name} is outside the cache at {self.path}")
+        self.index.record(rel, pinned=int(pinned))
+
+    def evict(
+        self,
+        max_bytes: typing.Optional[int] = None,
+        exclude: typing.Optional[str] = None,
+    ) -> dict:
+        """Delete least recently used files once the cache is over its byte budget.
+
+        Files are deleted until the cache is back under 90% of the budget.
+        Pinned files are never deleted. Only indexed files count toward the
+        budget, so run :meth:`reindex` first on a cache that predates the index.
+
+        Args:
+            max_bytes (int): Budget to enforce (default: the cache's max_bytes)
+            exclude (str): A name to keep regardless, e.g. the file just written
+
+        Returns: The number of files removed and bytes freed
+        """
+        budget = self.max_bytes if max_bytes is None else max_bytes
+        result = {"removed": 0, "freed": 0}
+        if budget is None:
+            return result
+        total = self.index.total_size()
+        self._estimated_size = total
+        if total <= budget:
+            return result
+        target = int(budget * EVICT_TO)
+        while total > target:
+            batch = self.index.least_recently_used(EVICT_BATCH, exclude=exclude)
+            if not batch:
+                break
+            for entry in batch:
+                if total <= target:
+                    break
+                Path(self.path, entry["name"]).unlink(missing_ok=True)
+                self.index.remove(entry["name"])
+                self.parsed.remove(entry["name"])
+                size = entry["size"] or 0
+                total -= size
+                result["removed"] += 1
+                result["freed"] += size
+        self._estimated_size = total
+        logger.info(
+            f"Evicted {result['removed']:,} files ({result['freed']:,} bytes) from {self.path}"
+        )
+        if total > budget:
+            logger.warning(f"{self.path} is still {total:,} bytes; the rest is pinned")
+        return result
+
+    def reindex(self) -> dict:
+        """Bring the index in line with the files actually on disk.
+
+        Files missing from the index are added, with their modification time
+        standing in for the fetch time, and entries for deleted files are
+        dropped. Run it once on a cache that predates the index.
+
+        Returns: Counts of entries added and removed
+        """
+        root = Path(self.path)
+        on_disk = {}
+        for path in root.rglob("*"):
+            if path.is_file() and not _is_internal(path.relative_to(root)):
+                on_disk[path.relative_to(root).as_posix()] = path
+        indexed = set(self.index.names())
+        added = removed = 0
+        for name, path in on_disk.items():
+            if name not in indexed:
+                stat = path.stat()
+                self.index.record(
+                    name,
+                    size=stat.st_size,
+                    sha256=_hash_file(path),
+                    fetched_at=stat.st_mtime,
+                    content_type=mimetypes.guess_type(name)[0],
+                )
+                added += 1
+        for name in indexed - set(on_disk):
+            self.index.remove(name)
+            self.parsed.remove(name)
+            removed += 1
+        logger.info(f"Reindexed {root}: {added:,} added, {removed:,} removed")
+        return {"added": added, "removed": removed}
 
     @property
     def _path_from_env(self):
@@ -267,3 +945,45 @@ class Cache:
     def _path_default(self):
         """Get the default filesystem location of the cache."""
         return join(expanduser("~"), ".clean-scraper")
+
+
+def parse_size(value: typing.Optional[str]) -> typing.Optional[int]:
+    """Convert a size such as '500M', '2G' or '1048576' to bytes.
+
+    Returns None when no value is provided.
+    """
+    if value is None or not str(value).strip():
+        return None
+    text = str(value).strip().upper().rstrip("B")
+    units = {"K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def _hash_file(path: Path) -> str:
+    """Compute the SHA-256 hex digest of a file's content, decompressing it if needed."""
+    hasher = hashlib.sha256()
+    with compression_module.open_read(path) as fh:
+        for chunk in iter(lambda: fh.read(CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _update_hash(hasher, path: Path):
+    """Feed a file into a hash object in chunks and return the hash object."""
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher
+
+
+def _is_internal(name) -> bool:
+    """Test whether a cache path is bookkeeping rather than a cached file."""
+    path = Path(name)
+    return _is_partial(name) or path.name.startswith((INDEX_NAME, PARSED_NAME))
+
+
+def _is_partial(name) -> bool:
+    """Test whether a cache path belongs to an unfinished download."""
+    return str(name).endswith((PARTIAL_SUFFIX, PARTIAL_STATE_SUFFIX))
@@ -0,0 +1,227 @@
+import logging
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional, TypedDict
+
+logger = logging.getLogger(__name__)
+
+# File name of the index database, kept in the root of each cache directory
+INDEX_NAME = ".index.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    name TEXT PRIMARY KEY,
+    url TEXT,
+    agency TEXT,
+    fetched_at REAL,
+    size INTEGER,
+    sha256 TEXT,
+    content_type TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    accessed_at REAL,
+    pinned INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_url ON entries (url);
+CREATE INDEX IF NOT EXISTS entries_agency ON entries (agency, name);
+CREATE INDEX IF NOT EXISTS entries_fetched_at ON entries (fetched_at);
+"""
+
+# Columns added after the first release, and how to add them to older indexes
+MIGRATIONS = {
+    "accessed_at": "ALTER TABLE entries ADD COLUMN accessed_at REAL",
+    "pinned": "ALTER TABLE entries ADD COLUMN pinned INTEGER NOT NULL DEFAULT 0",
+}
+
+COLUMNS = (
+    "name",
+    "url",
+    "agency",
+    "fetched_at",
+    "size",
+    "sha256",
+    "content_type",
+    "etag",
+    "last_modified",
+    "accessed_at",
+    "pinned",
+)
+
+
+class IndexEntry(TypedDict):
+    name: str
+    url: Optional[str]
+    agency: Optional[str]
+    fetched_at: Optional[float]
+    size: Optional[int]
+    sha256: Optional[str]
+    content_type: Optional[str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    accessed_at: Optional[float]
+    pinned: int
+
+
+class CacheIndex:
+    """SQLite record of what's in a cache directory and where it came from.
+
+    Each cached file gets a row keyed by its path relative to the cache root,
+    holding the source URL, the agency (the top-level folder), when it was
+    fetched and last read, its size and SHA-256, content type, HTTP
+    validators and whether it's pinned against eviction.
+
+    Every operation opens its own short-lived connection, and the database
+    runs in WAL mode, so threads and worker processes can share one index.
+    The database file isn't created until the first write.
+
+    Args:
+        path (Path): Location of the SQLite database
+    """
+
+    def __init__(self, path: Path):
+        """Initialize a new instance."""
+        self.path = Path(path)
+        self._ready = False
+
+    def record(self, name: str, **fields):
+        """Add or update the entry for a cached file.
+
+        Fields that aren't provided keep their stored values.
+
+        Args:
+            name (str): Path relative to the cache root, e.g. 'ca_san_diego_pd/index.html'
+            **fields: Any of the other entry columns
+        """
+        unknown = set(fields) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown index fields: {', '.join(sorted(unknown))}")
+        fields.setdefault("agency", name.split("/", 1)[0] if "/" in name else None)
+        columns = ["name", *fields]
+        placeholders = ", ".join("?" for _ in columns)
+        updates = ", ".join(f"{col} = excluded.{col}" for col in fields)
+        sql = f"INSERT INTO entries ({', '.join(columns)}) VALUES ({placeholders})"
+        if updates:
+            sql += f" ON CONFLICT (name) DO UPDATE SET {updates}"
+        else:
+            sql += " ON CONFLICT (name) DO NOTHING"
+        with self._connect(create=True) as conn:
+            assert conn is not None
+            conn.execute(sql, [name, *fields.values()])
+
+    def remove(self, name: str):
+        """Forget the entry for a cached file."""
+        with self._connect() as conn:
+            if conn is not None:
+                conn.execute("DELETE FROM entries WHERE name = ?", (name,))
+
+    def get(self, name: str) -> Optional[IndexEntry]:
+        """Return the entry for a cached file, if there is one."""
+        rows = self._query("SELECT * FROM entries WHERE name = ?", (name,))
+        return rows[0] if rows else None
+
+    def by_url(self, url: str) -> List[IndexEntry]:
+        """Return every entry downloaded from the provided URL."""
+        return self._query("SELECT * FROM entries WHERE url = ? ORDER BY name", (url,))
+
+    def entries(
+        self, prefix: str = "", agency: Optional[str] = None
+    ) -> List[IndexEntry]:
+        """List entries, optionally limited to a folder prefix or an agency.
+
+        Args:
+            prefix (str): Only return names starting with this, e.g. 'ca_san_diego_pd/subpages/'
+            agency (str): Only return entries in this agency's folder
+
+        Returns: Matching entries, sorted by name
+        """
+        sql = "SELECT * FROM entries WHERE name >= ? AND name < ?"
+        params: list = [prefix, prefix + "\U0010ffff"]
+        if agency is not None:
+            sql += " AND agency = ?"
+            params.append(agency)
+        return self._query(sql + " ORDER BY name", params)
+
+    def touch(self, name: str, when: float):
+        """Record that a cached file was just used."""
+        with self._connect() as conn:
+            if conn is not None:
+                conn.execute(
+                    "UPDATE entries SET accessed_at = ? WHERE name = ?", (when, name)
+                )
+
+    def total_size(self) -> int:
+        """Return the combined size in bytes of every indexed file."""
+        with self._connect() as conn:
+            if conn is None:
+                return 0
+            return conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()[0]
+
+    def least_recently_used(
+        self, limit: Optional[int] = None, exclude: Optional[str] = None
+    ) -> List[IndexEntry]:
+        """List unpinned entries, least recently read or fetched first.
+
+        Args:
+            limit (int): Return at most this many entries (default: all of them)
+            exclude (str): A name to leave out
+
+        Returns: Matching entries, oldest first
+        """
+        return self._query(
+            "SELECT * FROM entries WHERE pinned = 0 AND name IS NOT ? "
+            "ORDER BY COALESCE(accessed_at, fetched_at, 0), name LIMIT ?",
+            (exclude, -1 if limit is None else limit),
+        )
+
+    def names(self) -> List[str]:
+        """Return every indexed name."""
+        with self._connect() as conn:
+            if conn is None:
+                return []
+            return [row[0] for row in conn.execute("SELECT name FROM entries")]
+
+    def _query(self, sql: str, params) -> List[IndexEntry]:
+        with self._connect() as conn:
+            if conn is None:
+                return []
+            conn.row_factory = sqlite3.Row
+            return [dict(row) for row in conn.execute(sql, params)]  # type: ignore
+
+    def _migrate(self, conn: sqlite3.Connection):
+        """Add columns that indexes created by older versions are missing."""
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(entries)")}
+        with conn:
+            for column, statement in MIGRATIONS.items():
+                if column not in existing:
+                    logger.debug(f"Adding {column} to cache index {self.path}")
+                    conn.execute(statement)
+
+    @contextmanager
+    def _connect(self, create: bool = False) -> Iterator[Optional[sqlite3.Connection]]:
+        """Open a connection for one operation, committing when it finishes.
+
+        Yields None, rather than creating an empty database, when the index
+        doesn't exist yet and ``create`` is False.
+        """
+        if not self.path.exists():
+            # Missing or deleted out from under us; rebuild the schema on write
+            self._ready = False
+            if not create:
+                yield None
+                return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            if not self._ready:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(SCHEMA)
+                self._migrate(conn)
+                self._ready = True
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
@@ -1,9 +1,13 @@
 import logging
 from pathlib import Path
+from typing import Optional
 
 import click
 
-from . import Runner, utils
+from . import Runner, freshness, utils
+from .cache import parse_size
+from .exports import EXPORT_FORMATS
+from .parsing import PARSERS
 
 
 @click.group()
@@ -12,6 +16,14 @@ def cli():
     pass
 
 
+def _check_freshness_file():
+    """Stop with a clear message if CLEAN_FRESHNESS_FILE can't be used."""
+    try:
+        freshness.get_policy()
+    except freshness.FreshnessFileError as e:
+        raise click.ClickException(str(e))
+
+
 @click.command(name="list")
 def list_agencies():
     """List all available agencies and their slugs.
@@ -31,7 +43,21 @@ def list_agencies():
 
 
 @click.command()
-@click.argument("agency")
+@click.argument("agencies", nargs=-1)
+@click.option(
+    "--all",
+    "all_agencies",
+    is_flag=True,
+    default=False,
+    help="Scrape every available agency",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Number of agencies to scrape in parallel. Default is one at a time.",
+)
 @click.option(
     "--data-dir",
     default=utils.CLEAN_DATA_DIR,
@@ -62,15 +88,76 @@ def list_agencies():
     "--throttle",
     "-t",
     default=0,
-    help="Set throttle on scraping in seconds. Default is no delay on file downloads.",
+    type=click.FloatRange(min=0),
+    help="Minimum seconds between requests to the same host. Default is no delay.",
+)
+@click.option(
+    "--burst",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Requests a host may receive back-to-back before the throttle applies. Default is 1.",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    default=False,
+    help="Profile the run, saving cProfile stats and a per-phase summary to --profile-dir.",
+)
+@click.option(
+    "--profile-dir",
+    default=utils.CLEAN_PROFILE_DIR,
+    type=click.Path(),
+    help="The Path where profiles are saved",
+)
+@click.option(
+    "--metrics-dir",
+    default=None,
+    envvar="CLEAN_METRICS_DIR",
+    type=click.Path(),
+    help="Save HTTP request metrics here in Prometheus textfile format, e.g. node_exporter's textfile directory",
+)
+@click.option(
+    "--report-dir",
+    default=None,
+    envvar="CLEAN_REPORTS_DIR",
+    type=click.Path(),
+    help="Save a JSON report of each agency's run here",
+)
+@click.option(
+    "--parser",
+    default=None,
+    type=click.Choice(("auto",) + PARSERS),
+    help="HTML parser to scrape pages with. Default is CLEAN_HTML_PARSER, or the fastest installed.",
+)
+@click.option(
+    "--format",
+    "export_format",
+    default=None,
+    type=click.Choice(EXPORT_FORMATS),
+    help="Format to save metadata in. Default is CLEAN_EXPORT_FORMAT, or json.",
+)
+@click.option(
+    "--changes/--no-changes",
+    default=True,
+    help="Save the records added, removed or changed since the last scrape to <agency>.changes.jsonl. Default is to save them.",
 )
 def scrape_meta(
-    agency: str,
+    agencies: tuple[str, ...],
+    all_agencies: bool,
+    jobs: int,
     data_dir: Path,
     cache_dir: Path,
     delete: bool,
     log_level: str,
-    throttle: int,
+    throttle: float,
+    burst: int,
+    profile: bool,
+    profile_dir: Path,
+    metrics_dir: Optional[Path],
+    report_dir: Optional[Path],
+    parser: Optional[str],
+    export_format: Optional[str],
+    changes: bool,
 ):
     """
     Command-line interface for generating metadata CSV about CLEAN files.
@@ -79,11 +166,19 @@ def scrape_meta(
     This file is required for downstream uage by the 'scrape' command, which
     relies on it to download the files (in particular the URL for videos and other files).
 
-    AGENCY -- An agency slug (e.g. ca_san_diego_pd)
+    AGENCIES -- One or more agency slugs (e.g. ca_san_diego_pd) or glob patterns (e.g. 'ca_*_pd')
 
     Use the 'list' command to see available agencies and their slugs.
 
       clean-scraper list
+
+    Scrape several agencies at once, four at a time:
+
+      clean-scraper scrape-meta --all --jobs 4
+
+    Find out where a slow scrape spends its time:
+
+      clean-scraper scrape-meta ca_san_diego_pd --profile
     """
     # Set higher log-level on third-party libs that use DEBUG logging,
     # In order to limit debug logging to our library
@@ -94,17 +189,52 @@ def scrape_meta(
     logger = logging.getLogger(__name__)
 
     # Runner config
+    _check_freshness_file()
     data_dir = Path(data_dir)
     cache_dir = Path(cache_dir)
-    runner = Runner(data_dir, cache_dir, throttle=throttle)
+    runner = Runner(
+        data_dir,
+        cache_dir,
+        throttle=throttle,
+        burst=burst,
+        profile_dir=Path(profile_dir) if profile else None,
+        metrics_dir=Path(metrics_dir) if metrics_dir else None,
+        reports_dir=Path(report_dir) if report_dir else None,
+        parser=parser,
+        export_format=export_format,
+        changes=changes,
+    )
 
     # Delete files, if asked
     if delete:
         logger.info("Deleting files generated from previous scraper run.")
         runner.delete()
 
+    # Work out which agencies to run
+    if all_agencies:
+        slugs = utils.match_scrapers(["*"])
+    else:
+        slugs = utils.match_scrapers(list(agencies))
+    if not slugs:
+        raise click.UsageError("Provide at least one agency slug or pass --all.")
+
     # Try running the scraper
-    runner.scrape_meta(agency)
+    if len(slugs) == 1:
+        runner.scrape_meta(slugs[0])
+        return
+
+    results = runner.scrape_meta_many(slugs, jobs=jobs)
+    click.echo("\nSummary:")
+    for result in results:
+        status = "ok" if result["ok"] else "FAILED"
+        detail = result["path"] if result["ok"] else result["error"]
+        click.echo(
+            f" - {result['agency']}: {status} in {result['seconds']:.1f}s ({detail})"
+        )
+    failures = [result for result in results if not result["ok"]]
+    click.echo(f"{len(results) - len(failures)} succeeded, {len(failures)} failed")
+    if failures:
+        raise SystemExit(1)
 
 
 @click.command()
@@ -140,7 +270,53 @@ def scrape_meta(
     "--throttle",
     "-t",
     default=0,
-    help="Set throttle on scraping in seconds. Default is no delay on file downloads.",
+    type=click.FloatRange(min=0),
+    help="Minimum seconds between requests to the same host. Default is no delay.",
+)
+@click.option(
+    "--burst",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Requests a host may receive back-to-back before the throttle applies. Default is 1.",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    default=8,
+    type=click.IntRange(min=1),
+    help="Maximum number of files to download at once. Default is 8.",
+)
+@click.option(
+    "--per-host",
+    default=2,
+    type=click.IntRange(min=1),
+    help="Maximum number of files to download at once from a single host. Default is 2.",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    default=False,
+    help="Profile the run, saving cProfile stats and a per-phase summary to --profile-dir.",
+)
+@click.option(
+    "--profile-dir",
+    default=utils.CLEAN_PROFILE_DIR,
+    type=click.Path(),
+    help="The Path where profiles are saved",
+)
+@click.option(
+    "--metrics-dir",
+    default=None,
+    envvar="CLEAN_METRICS_DIR",
+    type=click.Path(),
+    help="Save HTTP request metrics here in Prometheus textfile format, e.g. node_exporter's textfile directory",
+)
+@click.option(
+    "--report-dir",
+    default=None,
+    envvar="CLEAN_REPORTS_DIR",
+    type=click.Path(),
+    help="Save a JSON report of each agency's run here",
 )
 def download_agency(
     agency: str,
@@ -148,7 +324,14 @@ def download_agency(
     cache_dir: Path,
     assets_dir: Path,
     log_level: str,
-    throttle: int,
+    throttle: float,
+    burst: int,
+    jobs: int,
+    per_host: int,
+    profile: bool,
+    profile_dir: Path,
+    metrics_dir: Optional[Path],
+    report_dir: Optional[Path],
 ):
     """
     Command-line interface for downloading files from a CLEAN agency.
@@ -167,17 +350,72 @@ def download_agency(
     logging.basicConfig(level=log_level, format="%(asctime)s - %(name)s - %(message)s")
 
     # Runner config
+    _check_freshness_file()
     data_dir = Path(data_dir)
     cache_dir = Path(cache_dir)
-    runner = Runner(data_dir, cache_dir, assets_dir, throttle)
+    runner = Runner(
+        data_dir,
+        cache_dir,
+        assets_dir,
+        throttle,
+        burst,
+        profile_dir=Path(profile_dir) if profile else None,
+        metrics_dir=Path(metrics_dir) if metrics_dir else None,
+        reports_dir=Path(report_dir) if report_dir else None,
+    )
 
     # Try running the scraper
-    runner.download_agency(agency)
+    runner.download_agency(agency, jobs=jobs, per_host=per_host)
+
+
+@click.command()
+@click.argument("max_size")
+@click.option(
+    "--cache-dir",
+    default=utils.CLEAN_CACHE_DIR,
+    type=click.Path(),
+    help="The Path where results can be cached",
+)
+@click.option(
+    "--reindex/--no-reindex",
+    default=False,
+    help="Index files cached by older versions before pruning",
+)
+@click.option(
+    "--log-level",
+    "-l",
+    default="INFO",
+    type=click.Choice(
+        ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"), case_sensitive=False
+    ),
+    help="Set the logging level",
+)
+def prune_cache(max_size: str, cache_dir: Path, reindex: bool, log_level: str):
+    """
+    Shrink the cache to a size budget, deleting the least recently used files first.
+
+    MAX_SIZE -- The budget in bytes, or with a K, M, G or T suffix (e.g. 5G)
+
+    Files scrapers need for incremental runs are pinned and never deleted.
+
+      clean-scraper prune-cache 5G
+    """
+    logging.basicConfig(level=log_level, format="%(asctime)s - %(name)s - %(message)s")
+    try:
+        max_bytes = parse_size(max_size)
+    except ValueError:
+        max_bytes = None
+    if max_bytes is None:
+        raise click.BadParameter(f"Can't parse size {max_size!r}")
+    runner = Runner(cache_dir=Path(cache_dir))
+    result = runner.prune_cache(max_bytes, reindex=reindex)
+    click.echo(f"Removed {result['removed']:,} files, {result['freed']:,} bytes")
 
 
 cli.add_command(list_agencies)
 cli.add_command(scrape_meta)
 cli.add_command(download_agency)
+cli.add_command(prune_cache)
 
 if __name__ == "__main__":
     cli()
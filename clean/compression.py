@@ -0,0 +1,111 @@
+import gzip
+import io
+import logging
+import os
+from pathlib import Path
+from typing import IO, Optional, Union, cast
+
+try:
+    import zstandard  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Codec for text files written to the cache: "none", "gzip" or "zstd"
+CLEAN_CACHE_COMPRESSION = os.environ.get("CLEAN_CACHE_COMPRESSION", "none").lower()
+
+CODECS = ("none", "gzip", "zstd")
+
+# Compressed files keep their usual names; these magic numbers give them away
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Only text compresses well. Videos, PDFs and images are left alone.
+COMPRESSIBLE_SUFFIXES = frozenset({".html", ".htm", ".json", ".csv", ".txt", ".xml"})
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/xml")
+
+CHUNK_SIZE = 64 * 1024
+
+
+def resolve_codec(codec: Optional[str] = None) -> Optional[str]:
+    """Return the codec to write with, or None to store files uncompressed.
+
+    Falls back to gzip, with a warning, when zstd is asked for but the
+    ``zstandard`` package isn't installed.
+
+    Args:
+        codec (str): "none", "gzip" or "zstd" (default: CLEAN_CACHE_COMPRESSION)
+    """
+    codec = (codec or CLEAN_CACHE_COMPRESSION).lower()
+    if codec not in CODECS:
+        raise ValueError(f"Unknown cache compression {codec!r}; use one of {CODECS}")
+    if codec == "none":
+        return None
+    if codec == "zstd" and zstandard is None:
+        logger.warning("zstandard isn't installed; compressing the cache with gzip")
+        return "gzip"
+    return codec
+
+
+def is_compressible(name: Union[str, Path], content_type: Optional[str] = None) -> bool:
+    """Test whether a file is text worth compressing, by content type or extension."""
+    if isinstance(content_type, str) and content_type.lower().startswith(
+        COMPRESSIBLE_TYPES
+    ):
+        return True
+    return Path(name).suffix.lower() in COMPRESSIBLE_SUFFIXES
+
+
+def open_read(path: Union[str, Path], text: bool = False) -> IO:
+    """Open a cached file for reading, decompressing it if needed.
+
+    Args:
+        path (Path): The file to open
+        text (bool): Return a UTF-8 text stream rather than bytes (default: False)
+    """
+    raw = open(path, "rb")
+    magic = raw.read(4)
+    raw.seek(0)
+    stream: IO
+    if magic.startswith(GZIP_MAGIC):
+        raw.close()
+        stream = cast(IO, gzip.open(path, "rb"))
+    elif magic == ZSTD_MAGIC:
+        if zstandard is None:
+            raw.close()
+            raise RuntimeError(
+                f"{path} is zstd-compressed; install zstandard to read it"
+            )
+        stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+    else:
+        stream = raw
+    if text:
+        return io.TextIOWrapper(stream, encoding="utf-8", newline="")
+    return stream
+
+
+def open_write(path: Union[str, Path], codec: Optional[str]) -> IO:
+    """Open a file for writing bytes, compressing them with the provided codec."""
+    if codec == "gzip":
+        # mtime=0 keeps the output identical for identical content
+        return cast(IO, gzip.GzipFile(path, mode="wb", compresslevel=6, mtime=0))
+    if codec == "zstd":
+        raw = open(path, "wb")
+        return zstandard.ZstdCompressor(level=10).stream_writer(raw, closefd=True)
+    return open(path, "wb")
+
+
+def compress_file(path: Union[str, Path], codec: Optional[str]):
+    """Compress a file in place, replacing it only once the copy is complete."""
+    if codec is None:
+        return
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.compressing")
+    try:
+        with open(path, "rb") as src, open_write(tmp_path, codec) as dst:
+            for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                dst.write(chunk)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
@@ -0,0 +1,149 @@
+import json
+import logging
+import os
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterator, Union
+
+from .exports import read_export
+from .sinks import PART_SUFFIX, JsonLinesSink
+
+logger = logging.getLogger(__name__)
+
+# Folder beside the exports where each agency's last snapshot is kept
+SNAPSHOTS_DIR = ".snapshots"
+
+# Suffix of the change set written beside an agency's export
+CHANGES_SUFFIX = ".changes.jsonl"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS {db}.records (
+    asset_url TEXT NOT NULL,
+    case_id TEXT NOT NULL,
+    record TEXT NOT NULL,
+    PRIMARY KEY (asset_url, case_id)
+);
+"""
+
+NEW_OR_CHANGED = """
+SELECT new.record, old.record
+FROM main.records AS new
+LEFT JOIN previous.records AS old USING (asset_url, case_id)
+WHERE old.record IS NULL OR old.record != new.record
+ORDER BY new.rowid
+"""
+
+REMOVED = """
+SELECT old.record
+FROM previous.records AS old
+LEFT JOIN main.records AS new USING (asset_url, case_id)
+WHERE new.record IS NULL
+ORDER BY old.rowid
+"""
+
+
+def snapshot_path(data_dir: Union[str, Path], agency_slug: str) -> Path:
+    """Return where the snapshot of an agency's last export is kept."""
+    return Path(data_dir) / SNAPSHOTS_DIR / f"{agency_slug}.sqlite3"
+
+
+def changes_path(data_dir: Union[str, Path], agency_slug: str) -> Path:
+    """Return where an agency's latest change set is saved."""
+    return Path(data_dir) / f"{agency_slug}{CHANGES_SUFFIX}"
+
+
+def write_changes(export: Path, snapshot: Path, out: Path) -> Dict[str, int]:
+    """Compare an export with the snapshot of the last one and save what changed.
+
+    Records are matched on their ``asset_url`` and ``case_id``. The change
+    set is JSON Lines, one line per record that was added, removed or
+    changed. Changed records list each field that differs, with its old and
+    new value::
+
+        {"change": "changed", "asset_url": "...", "case_id": "...",
+         "fields": {"title": {"old": "...", "new": "..."}}, "record": {...}}
+
+    Added and changed records carry the new record, removed ones the old.
+    With no snapshot, as on an agency's first run, every record is added.
+    The export then becomes the snapshot for the next run.
+
+    Both sides are kept in SQLite rather than memory, so comparing large
+    exports is cheap. Where two records share a key, the last one wins.
+
+    Args:
+        export (Path): The export just written, in any format
+        snapshot (Path): The SQLite snapshot of the previous export, which is replaced
+        out (Path): Where to save the change set
+
+    Returns: The number of records added, removed and changed
+    """
+    snapshot.parent.mkdir(parents=True, exist_ok=True)
+    part = snapshot.with_name(snapshot.name + PART_SUFFIX)
+    part.unlink(missing_ok=True)
+    counts = {"added": 0, "removed": 0, "changed": 0}
+    conn = sqlite3.connect(part)
+    try:
+        conn.executescript(SCHEMA.format(db="main"))
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO records VALUES (?, ?, ?)",
+                (_row(record) for record in read_export(export)),
+            )
+        conn.execute(
+            "ATTACH DATABASE ? AS previous",
+            (str(snapshot) if snapshot.exists() else ":memory:",),
+        )
+        conn.executescript(SCHEMA.format(db="previous"))
+        with JsonLinesSink(out) as sink:
+            for change in _diff(conn):
+                counts[change["change"]] += 1
+                sink.write(change)
+    except BaseException:
+        conn.close()
+        part.unlink(missing_ok=True)
+        raise
+    conn.close()
+    os.replace(part, snapshot)
+    logger.debug(
+        f"{counts['added']:,} added, {counts['removed']:,} removed and "
+        f"{counts['changed']:,} changed since the last export; saved to {out}"
+    )
+    return counts
+
+
+def _row(record: dict) -> tuple:
+    """Key a record for the snapshot, serialized so equal records compare equal."""
+    return (
+        record.get("asset_url") or "",
+        record.get("case_id") or "",
+        json.dumps(record, sort_keys=True),
+    )
+
+
+def _diff(conn: sqlite3.Connection) -> Iterator[dict]:
+    """Yield the changes between the snapshots: additions and changes, then removals."""
+    for new_json, old_json in conn.execute(NEW_OR_CHANGED):
+        new = json.loads(new_json)
+        change = {
+            "change": "added",
+            "asset_url": new.get("asset_url"),
+            "case_id": new.get("case_id"),
+        }
+        if old_json is not None:
+            old = json.loads(old_json)
+            change["change"] = "changed"
+            change["fields"] = {
+                field: {"old": old.get(field), "new": new.get(field)}
+                for field in sorted(old.keys() | new.keys())
+                if old.get(field) != new.get(field)
+            }
+        change["record"] = new
+        yield change
+    for (old_json,) in conn.execute(REMOVED):
+        old = json.loads(old_json)
+        yield {
+            "change": "removed",
+            "asset_url": old.get("asset_url"),
+            "case_id": old.get("case_id"),
+            "record": old,
+        }
@@ -0,0 +1,149 @@
+import logging
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Deque, Dict, Iterable, List, Optional, Tuple, TypedDict
+from urllib.parse import urlparse
+
+from .cache import Cache
+
+logger = logging.getLogger(__name__)
+
+
+class DownloadFailure(TypedDict):
+    url: str
+    path: str
+    error: str
+
+
+class DownloadSummary(TypedDict):
+    queued: int
+    succeeded: List[str]
+    failed: List[DownloadFailure]
+
+
+class AssetDownloader:
+    """Download many assets concurrently, spreading the work across hosts.
+
+    A single thread pool caps the total number of transfers in flight, and
+    each host gets its own smaller cap so we never hammer one agency's server.
+    Jobs are only handed to the pool when their host has a free slot, which
+    keeps every worker busy when assets are spread over many hosts. Jobs are
+    read lazily, at most ``lookahead`` ahead of the downloads, so a long
+    export is never held in memory all at once.
+
+    Example: ::
+
+        downloader = AssetDownloader(max_workers=8, per_host=2)
+        summary = downloader.run([(url, Path("assets/case/file.pdf"))])
+
+    Args:
+        max_workers (int): Maximum number of downloads in flight (default: 8)
+        per_host (int): Maximum number of downloads in flight per host (default: 2)
+        root (Path): Folder the asset paths are relative to (default: each asset's own folder)
+        lookahead (int): Maximum number of jobs read ahead of the downloads (default: 1000)
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        per_host: int = 2,
+        root: Optional[Path] = None,
+        lookahead: int = 1000,
+    ):
+        """Initialize a new instance."""
+        self.max_workers = max(1, max_workers)
+        self.per_host = max(1, per_host)
+        self.root = root
+        self.lookahead = max(self.max_workers, lookahead)
+
+    def run(self, jobs: Iterable[Tuple[str, Path]]) -> DownloadSummary:
+        """Download every (url, local path) pair and report how it went.
+
+        Args:
+            jobs (iterable): Pairs of asset URL and the local Path it should be saved to
+
+        Returns: A summary with the number of jobs queued, the URLs that succeeded and details for those that failed
+        """
+        pending = iter(jobs)
+        exhausted = False
+        buffered = 0
+        queues: Dict[str, Deque[Tuple[str, Path]]] = {}
+        seen_paths = set()
+        summary: DownloadSummary = {"queued": 0, "succeeded": [], "failed": []}
+        active: Dict[str, int] = {}
+        in_flight: Dict[Future, Tuple[str, str, Path]] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                # Top up the per-host queues without reading too far ahead
+                while not exhausted and buffered < self.lookahead:
+                    try:
+                        url, local_path = next(pending)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    if local_path in seen_paths:
+                        logger.warning(
+                            f"Skipping {url}; {local_path} is already queued"
+                        )
+                        continue
+                    seen_paths.add(local_path)
+                    host = urlparse(url).netloc
+                    queues.setdefault(host, deque()).append((url, local_path))
+                    active.setdefault(host, 0)
+                    buffered += 1
+                    summary["queued"] += 1
+                if not queues and not in_flight:
+                    break
+
+                # Hand out work round-robin to hosts that have a free slot
+                for host in list(queues):
+                    if len(in_flight) >= self.max_workers:
+                        break
+                    while active[host] < self.per_host and queues[host]:
+                        if len(in_flight) >= self.max_workers:
+                            break
+                        url, local_path = queues[host].popleft()
+                        buffered -= 1
+                        future = executor.submit(self.download, url, local_path)
+                        in_flight[future] = (host, url, local_path)
+                        active[host] += 1
+                    if not queues[host]:
+                        del queues[host]
+
+                done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                for future in done:
+                    host, url, local_path = in_flight.pop(future)
+                    active[host] -= 1
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error(f"Failed to download asset {url}: {e}")
+                        summary["failed"].append(
+                            {"url": url, "path": str(local_path), "error": str(e)}
+                        )
+                    else:
+                        logger.info(f"Downloaded {url} to {local_path}")
+                        summary["succeeded"].append(url)
+        return summary
+
+    def download(self, url: str, local_path: Path):
+        """Download a single asset to the provided path.
+
+        The response is streamed to disk in fixed-size chunks through
+        :meth:`clean.cache.Cache.download`, so memory use does not depend on
+        the size of the file.
+
+        Args:
+            url (str): The asset URL
+            local_path (Path): Where the asset should be saved
+        """
+        logger.debug(f"Requesting {url} in thread {threading.current_thread().name}")
+        root = self.root or local_path.parent
+        name = local_path.relative_to(root)
+        # Assets are kept exactly as published, never compressed or indexed
+        Cache(root, compression="none", index=False).download(
+            str(name), url, force=True
+        )
@@ -0,0 +1,157 @@
+import csv
+import json
+import logging
+import os
+import re
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, Optional, Union
+
+from . import compression as compression_module
+from .sinks import SINKS, format_for
+
+logger = logging.getLogger(__name__)
+
+# Format metadata exports are written in: "json", "jsonl", "csv" or "sqlite"
+CLEAN_EXPORT_FORMAT = os.environ.get("CLEAN_EXPORT_FORMAT", "json").lower()
+
+EXPORT_FORMATS = tuple(SINKS)
+
+# How much of an export to read at once while streaming it back
+CHUNK_SIZE = 64 * 1024
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# Set by use_format(), overriding CLEAN_EXPORT_FORMAT
+_selected: Optional[str] = None
+
+
+def resolve_format(export_format: Optional[str] = None) -> str:
+    """Return the export format to write.
+
+    Args:
+        export_format (str): "json", "jsonl", "csv" or "sqlite" (default: the one set by use_format, or CLEAN_EXPORT_FORMAT)
+    """
+    export_format = (export_format or _selected or CLEAN_EXPORT_FORMAT).lower()
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(
+            f"Unknown export format {export_format!r}; use one of {EXPORT_FORMATS}"
+        )
+    return export_format
+
+
+@contextmanager
+def use_format(export_format: Optional[str]) -> Iterator[str]:
+    """Save exports in the provided format for the duration of the block.
+
+    A format of None leaves the current choice alone.
+    """
+    global _selected
+    previous = _selected
+    if export_format is not None:
+        _selected = resolve_format(export_format)
+    try:
+        yield resolve_format()
+    finally:
+        _selected = previous
+
+
+def read_export(path: Union[str, Path]) -> Iterator:
+    """Stream the records in a metadata export one at a time, whatever its format.
+
+    No format is ever loaded whole, so memory stays flat however many
+    records an agency has. CSV exports give back the ``details`` they were
+    saved with, decoded from JSON, and leave out empty columns.
+
+    Example: ::
+
+        for record in read_export(data_dir / "ca_san_diego_pd.json"):
+            print(record["asset_url"])
+
+    Args:
+        path (Path): The export; its suffix says which format it's in
+    """
+    path = Path(path)
+    export_format = format_for(path)
+    if export_format == "sqlite":
+        yield from _iter_sqlite(path)
+        return
+    with compression_module.open_read(path, text=True) as fh:
+        if export_format == "jsonl":
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+        elif export_format == "csv":
+            for row in csv.DictReader(fh):
+                record = {key: value for key, value in row.items() if value != ""}
+                if "details" in record:
+                    record["details"] = json.loads(record["details"])
+                yield record
+        else:
+            yield from _iter_array(fh)
+
+
+def find_export(data_dir: Union[str, Path], agency_slug: str) -> Path:
+    """Return an agency's metadata export, in whichever format it was saved.
+
+    Raises:
+        FileNotFoundError: If the agency has no export in ``data_dir``
+    """
+    for sink_class in SINKS.values():
+        path = Path(data_dir) / f"{agency_slug}{sink_class.suffix}"
+        if path.exists():
+            return path
+    raise FileNotFoundError(
+        f"No export for {agency_slug} in {data_dir}; run scrape-meta first"
+    )
+
+
+def _iter_array(fh: IO[str]) -> Iterator:
+    """Decode the items of a JSON array from a text stream as they're read."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    started = False
+    while True:
+        chunk = fh.read(CHUNK_SIZE)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        while True:
+            pos = WHITESPACE.match(buffer, pos).end()  # type: ignore
+            if pos == len(buffer):
+                break
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError("Export isn't a JSON list")
+                started = True
+                pos += 1
+            elif buffer[pos] == ",":
+                pos += 1
+            elif buffer[pos] == "]":
+                return
+            else:
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    break
+                # A number at the end of the buffer may continue in the next chunk
+                if end == len(buffer) and not eof:
+                    break
+                yield item
+                pos = end
+        if eof:
+            raise ValueError("Export ends before its JSON list does")
+
+
+def _iter_sqlite(path: Path) -> Iterator:
+    """Read records back from a SQLite export, in the order they were saved."""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        for (record,) in conn.execute("SELECT record FROM records ORDER BY position"):
+            yield json.loads(record)
+    finally:
+        conn.close()
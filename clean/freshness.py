@@ -0,0 +1,167 @@
+import fnmatch
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from typing import List, Optional, TypedDict, Union
+
+logger = logging.getLogger(__name__)
+
+
+class FreshnessRule(TypedDict, total=False):
+    agency: str
+    url: str
+    path: str
+    ttl: Union[str, int, float, None]
+
+
+# Built-in rules. Index pages these agencies update in place get rechecked
+# regularly; their case pages, and everything else, are trusted once cached.
+DEFAULT_RULES: List[FreshnessRule] = [
+    {
+        "agency": "ca_chula_vista_pd",
+        "path": "ca_chula_vista_pd/senate-bill-1421.html",
+        "ttl": "12h",
+    },
+    {
+        "agency": "ca_grass_valley_pd",
+        "path": "ca_grass_valley_pd/records-release.html",
+        "ttl": "12h",
+    },
+    {
+        "agency": "ca_redding_pd",
+        "path": "ca_redding_pd/senate_bill_1421_releases.html",
+        "ttl": "12h",
+    },
+    {"agency": "ca_oakland_pd", "url": "*nextrequest.com*", "ttl": "7d"},
+]
+
+# Loaded from CLEAN_FRESHNESS_FILE on first use; see get_policy()
+_policy: Optional["FreshnessPolicy"] = None
+
+TTL_UNITS = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60, "w": 7 * 24 * 60 * 60}
+
+
+def parse_ttl(value: Union[str, int, float, None]) -> Optional[float]:
+    """Convert a TTL such as '12h', '7d', 3600, 'always' or 'never' to seconds.
+
+    Args:
+        value: Seconds as a number, a number with an s/m/h/d/w suffix, 'always' (0) or 'never'
+
+    Returns: Seconds, or None if the file never expires
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = value.strip().lower()
+    if text == "never":
+        return None
+    if text == "always":
+        return 0.0
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*([smhdw]?)", text)
+    if not match:
+        raise ValueError(f"Can't parse TTL {value!r}")
+    number, unit = match.groups()
+    return float(number) * TTL_UNITS[unit or "s"]
+
+
+class FreshnessFileError(ValueError):
+    """Raised when the file named by CLEAN_FRESHNESS_FILE can't be read or has bad rules."""
+
+
+class FreshnessPolicy:
+    """Decide how long a cached page can be trusted before it's fetched again.
+
+    Rules are checked in order and the first match wins. A rule matches when
+    every pattern it provides matches: ``agency`` against the agency slug,
+    ``url`` against the source URL and ``path`` against the file's path in the
+    cache. Patterns use shell-style wildcards. Files that match no rule never
+    expire.
+
+    Stale files aren't thrown away: they're revalidated with a conditional
+    request, so a page that hasn't changed costs a few hundred bytes.
+
+    Rules from the JSON file named by the ``CLEAN_FRESHNESS_FILE`` environment
+    variable take precedence over the built-in defaults. For example: ::
+
+        [
+            {"agency": "ca_san_diego_pd", "path": "*/index*.html", "ttl": "12h"},
+            {"agency": "ca_los_angeles_pd", "url": "*nextrequest.com*", "ttl": "7d"},
+            {"path": "*/assets/*", "ttl": "never"}
+        ]
+
+    Args:
+        rules (list): Rules to check, in order (default: rules from CLEAN_FRESHNESS_FILE, then DEFAULT_RULES)
+    """
+
+    def __init__(self, rules: Optional[List[FreshnessRule]] = None):
+        """Initialize a new instance."""
+        if rules is None:
+            rules = _rules_from_env() + DEFAULT_RULES
+        self.rules: List[FreshnessRule] = []
+        for rule in rules:
+            # Fail early on typos rather than on the first lookup
+            parse_ttl(rule.get("ttl"))
+            self.rules.append(rule)
+
+    def ttl(
+        self,
+        agency: Optional[str] = None,
+        url: Optional[str] = None,
+        path: Optional[str] = None,
+    ) -> Optional[float]:
+        """Return the TTL in seconds for a cached file, or None if it never expires.
+
+        Args:
+            agency (str): The agency slug, e.g. 'ca_redding_pd'
+            url (str): The URL the file came from
+            path (str): The file's path relative to the cache root
+        """
+        for rule in self.rules:
+            if (
+                _matches(rule.get("agency"), agency)
+                and _matches(rule.get("url"), url)
+                and _matches(rule.get("path"), path)
+            ):
+                return parse_ttl(rule.get("ttl"))
+        return None
+
+
+def get_policy() -> FreshnessPolicy:
+    """Return the policy the cache checks, reading CLEAN_FRESHNESS_FILE the first time.
+
+    Raises: FreshnessFileError if the file can't be read or holds a bad rule
+    """
+    global _policy
+    if _policy is None:
+        _policy = FreshnessPolicy()
+    return _policy
+
+
+def _matches(pattern: Optional[str], value: Optional[str]) -> bool:
+    if pattern is None:
+        return True
+    if value is None:
+        return False
+    return fnmatch.fnmatchcase(value, pattern)
+
+
+def _rules_from_env() -> List[FreshnessRule]:
+    path = os.environ.get("CLEAN_FRESHNESS_FILE")
+    if not path:
+        return []
+    logger.debug(f"Reading freshness rules from {path}")
+    try:
+        with open(Path(path).expanduser(), encoding="utf-8") as fh:
+            rules = json.load(fh)
+        if not isinstance(rules, list) or not all(isinstance(r, dict) for r in rules):
+            raise ValueError("expected a JSON list of rules")
+        for rule in rules:
+            parse_ttl(rule.get("ttl"))
+    except (OSError, ValueError) as e:
+        raise FreshnessFileError(
+            f"Can't read freshness rules from CLEAN_FRESHNESS_FILE {path}: {e}"
+        ) from e
+    return rules
@@ -0,0 +1,304 @@
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds, in seconds, of the request latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Labels for requests made outside any agency's run
+NO_AGENCY = "unknown"
+NO_COMMAND = "none"
+
+# Plain counters kept per run (and host, for HTTP): metric name, attribute, help text
+COUNTERS = (
+    ("clean_cache_bytes_written_total", "written", "Bytes written to disk."),
+    ("clean_http_response_bytes_total", "bytes", "Response body bytes received."),
+    ("clean_http_retries_total", "retries", "Requests retried after a failure."),
+    (
+        "clean_http_throttle_seconds_total",
+        "throttled",
+        "Seconds waiting on rate limits.",
+    ),
+)
+
+# Cache lookup results, and the totals() field each one adds to
+CACHE_TOTALS = {
+    "hit": "cache_hits",
+    "miss": "cache_misses",
+    "revalidated": "cache_revalidated",
+}
+
+# (agency, command, host)
+Key = Tuple[str, str, str]
+
+
+class MetricsRegistry:
+    """In-process counters for every HTTP request, by agency, command and host.
+
+    Records request counts by status code, a latency histogram, bytes
+    received, retries and seconds spent waiting on the rate limiter. The
+    pooled sessions, retry policy and rate limiter report here
+    automatically; requests sent through a caller's own ``requests.Session``
+    aren't counted. The cache adds its hits and misses and the bytes it
+    writes.
+
+    Requests are attributed to whichever agency and command are set with
+    :meth:`agency`, which the :class:`clean.runner.Runner` does around each
+    run. :meth:`write_textfile` saves the counters in the Prometheus text
+    format for node_exporter's textfile collector.
+
+    Example: ::
+
+        from clean.metrics import metrics
+
+        with metrics.agency("ca_san_diego_pd", "scrape-meta"):
+            site.scrape_meta()
+        metrics.write_textfile("/var/lib/node_exporter/clean_ca_san_diego_pd.prom")
+
+    Args:
+        buckets (tuple): Upper bounds of the latency histogram buckets, in seconds (default: LATENCY_BUCKETS)
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        """Initialize a new instance."""
+        self.buckets = tuple(sorted(buckets))
+        self.current: Tuple[str, str] = (NO_AGENCY, NO_COMMAND)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget everything recorded so far."""
+        with self._lock:
+            self.requests: Dict[Tuple[str, str, str, str], int] = {}
+            # Per key: a count for each bucket, then the +Inf count and the sum
+            self.latency: Dict[Key, List[float]] = {}
+            self.bytes: Dict[Key, int] = {}
+            self.retries: Dict[Key, int] = {}
+            self.throttled: Dict[Key, float] = {}
+            self.runs: Dict[Tuple[str, str], float] = {}
+            self.cache_lookups: Dict[Tuple[str, str, str], int] = {}
+            self.written: Dict[Tuple[str, str], int] = {}
+
+    @contextmanager
+    def agency(self, slug: str, command: str = "scrape-meta") -> Iterator[None]:
+        """Attribute requests made inside the block to an agency's run.
+
+        Args:
+            slug (str): The agency slug, e.g. 'ca_san_diego_pd'
+            command (str): What's being run, e.g. 'scrape-meta' or 'download-agency'
+        """
+        previous = self.current
+        self.current = (slug, command)
+        try:
+            yield
+        finally:
+            self.current = previous
+            with self._lock:
+                self.runs[(slug, command)] = time.time()
+
+    def observe_request(self, url: str, status: Optional[int], seconds: float):
+        """Count a request and its latency.
+
+        Args:
+            url (str): The URL requested
+            status (int): The response status, or None if no response arrived
+            seconds (float): Time until the response, or the failure
+        """
+        key = self._key(url)
+        status_label = str(status) if status is not None else "error"
+        with self._lock:
+            request_key = (*key, status_label)
+            self.requests[request_key] = self.requests.get(request_key, 0) + 1
+            counts = self.latency.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            counts[bisect_left(self.buckets, seconds)] += 1
+            counts[-1] += seconds
+
+    def observe_bytes(self, url: str, size: int):
+        """Add to the bytes received from the URL's host."""
+        key = self._key(url)
+        with self._lock:
+            self.bytes[key] = self.bytes.get(key, 0) + size
+
+    def observe_retry(self, url: str):
+        """Count a retried request."""
+        key = self._key(url)
+        with self._lock:
+            self.retries[key] = self.retries.get(key, 0) + 1
+
+    def observe_throttle(self, url: str, seconds: float):
+        """Add to the time spent waiting on the URL's host's rate limit."""
+        key = self._key(url)
+        with self._lock:
+            self.throttled[key] = self.throttled.get(key, 0.0) + seconds
+
+    def observe_cache(self, result: str):
+        """Count a cache lookup.
+
+        Args:
+            result (str): 'hit', 'miss' or 'revalidated' (a 304 for a stale or forced file)
+        """
+        key = (*self.current, result)
+        with self._lock:
+            self.cache_lookups[key] = self.cache_lookups.get(key, 0) + 1
+
+    def observe_written(self, size: int):
+        """Add to the bytes written to disk by the current run."""
+        with self._lock:
+            self.written[self.current] = self.written.get(self.current, 0) + size
+
+    def totals(self, agency: str, command: str) -> Dict[str, float]:
+        """Sum one run's counters across hosts.
+
+        Returns: requests, failed_requests (errors and 4xx/5xx statuses), bytes_received, retries, throttle_seconds, cache_hits, cache_misses, cache_revalidated and bytes_written
+        """
+        run = (agency, command)
+        totals: Dict[str, float] = {
+            "requests": 0,
+            "failed_requests": 0,
+            "bytes_received": 0,
+            "retries": 0,
+            "throttle_seconds": 0.0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "cache_revalidated": 0,
+            "bytes_written": 0,
+        }
+        with self._lock:
+            totals["bytes_written"] = self.written.get(run, 0)
+            for (a, c, _, status), count in self.requests.items():
+                if (a, c) == run:
+                    totals["requests"] += count
+                    if status == "error" or int(status) >= 400:
+                        totals["failed_requests"] += count
+            for total, series in (
+                ("bytes_received", self.bytes),
+                ("retries", self.retries),
+                ("throttle_seconds", self.throttled),
+            ):
+                totals[total] += sum(v for k, v in series.items() if k[:2] == run)
+            for (a, c, result), count in self.cache_lookups.items():
+                if (a, c) == run:
+                    totals[CACHE_TOTALS[result]] += count
+        return totals
+
+    def render(
+        self, agency: Optional[str] = None, command: Optional[str] = None
+    ) -> str:
+        """Return the metrics in the Prometheus text exposition format.
+
+        Args:
+            agency (str): Only include this agency's series (default: every agency)
+            command (str): Only include this command's series (default: every command)
+        """
+
+        def keep(key: Sequence[str]) -> bool:
+            return agency in (None, key[0]) and command in (None, key[1])
+
+        lines: List[str] = []
+        with self._lock:
+            name = "clean_http_requests_total"
+            _header(lines, name, "counter", "HTTP requests sent, by response status.")
+            for (a, c, host, status), total in sorted(self.requests.items()):
+                if keep((a, c)):
+                    lines.append(f"{name}{_labels(a, c, host, status=status)} {total}")
+
+            name = "clean_http_request_duration_seconds"
+            _header(lines, name, "histogram", "Time until response headers arrived.")
+            for key, counts in sorted(self.latency.items()):
+                if keep(key):
+                    lines.extend(self._histogram(name, key, counts))
+
+            name = "clean_cache_lookups_total"
+            _header(lines, name, "counter", "Cached files looked up, by result.")
+            for (a, c, result), total in sorted(self.cache_lookups.items()):
+                if keep((a, c)):
+                    lines.append(f"{name}{_labels(a, c, result=result)} {total}")
+
+            for name, attr, help_text in COUNTERS:
+                _header(lines, name, "counter", help_text)
+                for key, value in sorted(getattr(self, attr).items()):
+                    if keep(key):
+                        lines.append(f"{name}{_labels(*key)} {_number(value)}")
+
+            name = "clean_run_last_timestamp_seconds"
+            _header(lines, name, "gauge", "When the agency's last run finished.")
+            for run, when in sorted(self.runs.items()):
+                if keep(run):
+                    lines.append(f"{name}{_labels(*run)} {when:.3f}")
+        return "\n".join(lines) + "\n"
+
+    def _histogram(self, name: str, key: Key, counts: List[float]) -> List[str]:
+        """Render one histogram's cumulative buckets, sum and count."""
+        lines = []
+        cumulative = 0.0
+        bounds = [_number(bound) for bound in self.buckets] + ["+Inf"]
+        for bound, observed in zip(bounds, counts):
+            cumulative += observed
+            labels = _labels(*key, le=bound)
+            lines.append(f"{name}_bucket{labels} {_number(cumulative)}")
+        lines.append(f"{name}_sum{_labels(*key)} {_number(counts[-1])}")
+        lines.append(f"{name}_count{_labels(*key)} {_number(cumulative)}")
+        return lines
+
+    def write_textfile(
+        self, path: Path, agency: Optional[str] = None, command: Optional[str] = None
+    ) -> Path:
+        """Save the metrics for node_exporter's textfile collector.
+
+        The file is written beside its destination and renamed into place, so
+        the collector never reads a half-written file.
+
+        Args:
+            path (Path): Destination, which must end in .prom for the collector to read it
+            agency (str): Only include this agency's series (default: every agency)
+            command (str): Only include this command's series (default: every command)
+
+        Returns: The path written
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(self.render(agency, command), encoding="utf-8")
+        os.replace(tmp_path, path)
+        logger.debug(f"Wrote metrics to {path}")
+        return path
+
+    def _key(self, url: str) -> Key:
+        host = (urlparse(url).hostname or "").lower()
+        return (*self.current, host)
+
+
+def _header(lines: List[str], name: str, kind: str, help_text: str):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _labels(agency: str, command: str, host: Optional[str] = None, **extra: str) -> str:
+    labels = {"agency": agency, "command": command}
+    if host is not None:
+        labels["host"] = host
+    labels.update(extra)
+    pairs = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    """Format a sample value, dropping the decimal point from whole numbers."""
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(round(float(value), 6))
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,155 @@
+import hashlib
+import importlib.util
+import inspect
+import json
+import logging
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# File name of the parse cache database, kept in the root of each cache directory
+PARSED_NAME = ".parsed.sqlite3"
+
+# Helpers every extractor leans on; editing them invalidates every stored result
+HELPER_MODULES = ("clean.parsing", "clean.utils")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS parsed (
+    extractor TEXT NOT NULL,
+    page TEXT NOT NULL,
+    args TEXT NOT NULL,
+    version TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    result TEXT NOT NULL,
+    parsed_at REAL,
+    PRIMARY KEY (extractor, page, args)
+);
+"""
+
+
+class ParseCache:
+    """SQLite store of what scrapers extracted from each cached page.
+
+    Results are keyed by the extracting function, the page and any extra
+    arguments, and are only reused while both the page's SHA-256 and the
+    scraper's version match. The version is a hash of the extractor's source
+    file and the shared parsing helpers, so editing a scraper invalidates its
+    results without anyone having to remember to. Each key keeps only its
+    latest result, and a page's results are dropped when it's evicted.
+
+    Like :class:`clean.cache_index.CacheIndex`, every operation opens its own
+    connection and the database isn't created until the first write.
+
+    Args:
+        path (Path): Location of the SQLite database
+    """
+
+    def __init__(self, path: Path):
+        """Initialize a new instance."""
+        self.path = Path(path)
+        self._ready = False
+
+    def get(
+        self, extractor: str, page: str, args: str, version: str, sha256: str
+    ) -> Optional[str]:
+        """Return the stored result, as JSON, if the page and scraper haven't changed."""
+        with self._connect() as conn:
+            if conn is None:
+                return None
+            row = conn.execute(
+                "SELECT result FROM parsed WHERE extractor = ? AND page = ? "
+                "AND args = ? AND version = ? AND sha256 = ?",
+                (extractor, page, args, version, sha256),
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(
+        self,
+        extractor: str,
+        page: str,
+        args: str,
+        version: str,
+        sha256: str,
+        result: str,
+    ):
+        """Store a result, as JSON, replacing any earlier one for the same key."""
+        with self._connect(create=True) as conn:
+            assert conn is not None
+            conn.execute(
+                "INSERT OR REPLACE INTO parsed VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (extractor, page, args, version, sha256, result, time.time()),
+            )
+
+    def remove(self, page: str):
+        """Forget every result extracted from a page."""
+        with self._connect() as conn:
+            if conn is not None:
+                conn.execute("DELETE FROM parsed WHERE page = ?", (page,))
+
+    def clear(self):
+        """Forget every stored result."""
+        with self._connect() as conn:
+            if conn is not None:
+                conn.execute("DELETE FROM parsed")
+
+    @contextmanager
+    def _connect(self, create: bool = False) -> Iterator[Optional[sqlite3.Connection]]:
+        """Open a connection for one operation, committing when it finishes."""
+        if not self.path.exists():
+            self._ready = False
+            if not create:
+                yield None
+                return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            if not self._ready:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(SCHEMA)
+                self._ready = True
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+
+def extractor_key(extract: Callable[..., Any]) -> Tuple[str, Optional[str]]:
+    """Name an extracting function and hash its module's source with the helpers'.
+
+    Returns: The function's dotted name and its version, or None for the version when the source can't be found
+    """
+    name = f"{extract.__module__}.{extract.__qualname__}"
+    versions = [_module_version(m) for m in (extract.__module__, *HELPER_MODULES)]
+    if any(version is None for version in versions):
+        return name, None
+    combined = "".join(version for version in versions if version)
+    return name, hashlib.sha256(combined.encode("utf-8")).hexdigest()
+
+
+def encode_args(args: tuple) -> str:
+    """Serialize an extractor's extra arguments for use in its key."""
+    return json.dumps(args, sort_keys=True, default=str)
+
+
+@lru_cache(maxsize=None)
+def _module_version(module_name: str) -> Optional[str]:
+    """Hash a module's source file; scrapers don't change while they're running."""
+    module = sys.modules.get(module_name)
+    try:
+        if module is not None:
+            source = inspect.getsourcefile(module)
+        else:
+            spec = importlib.util.find_spec(module_name)
+            source = spec.origin if spec else None
+    except (TypeError, ValueError):  # Built-in or compiled
+        source = None
+    if source is None:
+        return None
+    return hashlib.sha256(Path(source).read_bytes()).hexdigest()
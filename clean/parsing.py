@@ -0,0 +1,224 @@
+import logging
+import os
+import re
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from bs4 import BeautifulSoup, SoupStrainer
+
+logger = logging.getLogger(__name__)
+
+# HTML parser for BeautifulSoup: "auto" or one of PARSERS
+CLEAN_HTML_PARSER = os.environ.get("CLEAN_HTML_PARSER", "auto").lower()
+
+# Backends BeautifulSoup can build trees with, fastest first. html.parser
+# ships with Python, so it's always there to fall back on.
+PARSERS = ("lxml", "html.parser", "html5lib")
+
+# Parsers "auto" chooses between. html5lib is the most lenient, but slower
+# than html.parser, so it's only used when asked for.
+AUTO_PARSERS = ("lxml", "html.parser")
+
+FALLBACK_PARSER = "html.parser"
+
+# Backends that can skip markup outside a SoupStrainer while parsing
+STRAINABLE_PARSERS = ("lxml", "html.parser")
+
+# A region selector: a tag name, optionally with one .class or #id
+SELECTOR_PATTERN = re.compile(
+    r"^(?P<tag>[a-zA-Z][\w-]*)?(?:(?P<kind>[.#])(?P<value>[\w-]+))?$"
+)
+
+# Set by use_parser(), overriding CLEAN_HTML_PARSER
+_selected: Optional[str] = None
+
+# Missing backends already warned about, so each page doesn't repeat it
+_warned: Set[str] = set()
+
+T = TypeVar("T")
+
+
+class ParserMismatch(ValueError):
+    """Raised when parser backends extract different results from the same pages."""
+
+    def __init__(self, results: Dict[str, object]):
+        """Initialize a new instance."""
+        self.results = results
+        names = ", ".join(results)
+        super().__init__(f"Parsers disagree on the extracted data: {names}")
+
+
+def available_parsers() -> List[str]:
+    """Return the parser backends installed here, fastest first."""
+    from bs4.builder import builder_registry  # type: ignore[attr-defined]
+
+    return [name for name in PARSERS if builder_registry.lookup(name) is not None]
+
+
+def resolve_parser(parser: Optional[str] = None) -> str:
+    """Return the installed parser backend to build trees with.
+
+    "auto" picks lxml when it's installed, otherwise html.parser. Asking for
+    a backend that isn't installed falls back to html.parser with a warning.
+
+    Args:
+        parser (str): "auto", "lxml", "html.parser" or "html5lib" (default: the one set by use_parser, or CLEAN_HTML_PARSER)
+    """
+    name = (parser or _selected or CLEAN_HTML_PARSER).lower()
+    if name != "auto" and name not in PARSERS:
+        raise ValueError(
+            f"Unknown HTML parser {name!r}; use 'auto' or one of {PARSERS}"
+        )
+    installed = available_parsers()
+    if name == "auto":
+        return next(p for p in AUTO_PARSERS if p in installed)
+    if name not in installed:
+        if name not in _warned:
+            _warned.add(name)
+            logger.warning(
+                f"{name} isn't installed; parsing HTML with {FALLBACK_PARSER}"
+            )
+        return FALLBACK_PARSER
+    return name
+
+
+@contextmanager
+def use_parser(parser: Optional[str]) -> Iterator[str]:
+    """Parse HTML with the provided backend for the duration of the block.
+
+    Yields the backend actually used. A parser of None leaves the current
+    choice alone.
+
+    Example: ::
+
+        with use_parser("lxml"):
+            site.scrape_meta()
+    """
+    global _selected
+    previous = _selected
+    if parser is not None:
+        resolve_parser(parser)
+        _selected = parser.lower()
+    try:
+        yield resolve_parser()
+    finally:
+        _selected = previous
+
+
+def make_soup(
+    markup,
+    parser: Optional[str] = None,
+    only: Optional[Sequence[str]] = None,
+    **kwargs,
+) -> "BeautifulSoup":
+    """Parse HTML with the configured backend.
+
+    Scrapers should build every tree with this rather than calling
+    BeautifulSoup directly, so the backend can be chosen per run.
+
+    Passing ``only`` builds just the matching regions of the page, and
+    everything inside them, which saves time and memory on big pages. Code
+    that walks up or back out of those regions, with ``find_parent`` or
+    ``find_previous``, won't find what it's looking for, so list every
+    region the scraper reads. html5lib can't skip markup and always builds
+    the whole page.
+
+    Example: ::
+
+        soup = make_soup(html, only=["title", "div.view-content"])
+
+    Args:
+        markup (str): The HTML, as text, bytes or an open file
+        parser (str): Override the backend for this page (default: the configured one)
+        only (list): Selectors for the regions to keep, like 'div', 'div.view-content' or 'table#oisTable' (default: None, the whole page)
+        kwargs: Passed on to BeautifulSoup
+
+    Returns: The parsed tree
+    """
+    from bs4 import BeautifulSoup
+
+    backend = resolve_parser(parser)
+    if only and backend in STRAINABLE_PARSERS:
+        kwargs["parse_only"] = strainer(tuple(only))
+    return BeautifulSoup(markup, backend, **kwargs)
+
+
+@lru_cache(maxsize=None)
+def strainer(selectors: Tuple[str, ...]) -> "SoupStrainer":
+    """Build a SoupStrainer that keeps elements matching any of the selectors.
+
+    Args:
+        selectors (tuple): Like 'title', 'div.view-content' or 'table#oisTable'
+    """
+    from bs4 import SoupStrainer
+
+    rules = []
+    for selector in selectors:
+        match = SELECTOR_PATTERN.match(selector)
+        if not selector or match is None:
+            raise ValueError(f"Can't parse region selector {selector!r}")
+        rules.append((match["tag"], match["kind"], match["value"]))
+
+    def matches(name, attrs=None) -> bool:
+        if attrs is None:  # Called with a Tag when searching a built tree
+            name, attrs = name.name, name.attrs
+        for tag, kind, value in rules:
+            if tag is not None and tag != name:
+                continue
+            if kind == "#" and attrs.get("id") != value:
+                continue
+            if kind == ".":
+                classes = attrs.get("class") or []
+                if isinstance(classes, str):
+                    classes = classes.split()
+                if value not in classes:
+                    continue
+            return True
+        return False
+
+    return SoupStrainer(matches)
+
+
+def compare_parsers(
+    func: Callable[[], T], parsers: Optional[List[str]] = None
+) -> Dict[str, T]:
+    """Run ``func`` once with each parser backend and check the results match.
+
+    Use it to prove a scraper extracts identical metadata whichever backend
+    is installed, e.g. against cached pages or a recorded cassette.
+
+    Example: ::
+
+        compare_parsers(lambda: scrape_index(cache.read(index_path)))
+
+    Args:
+        func (callable): Does the parsing, through make_soup, and returns what it extracted
+        parsers (list): Backends to compare (default: every installed one)
+
+    Returns: Each backend's result
+
+    Raises:
+        ParserMismatch: If any backend's result differs from the first one's
+    """
+    parsers = parsers or available_parsers()
+    results: Dict[str, T] = {}
+    for name in parsers:
+        with use_parser(name):
+            results[name] = func()
+    first = next(iter(results.values()))
+    if any(result != first for result in results.values()):
+        raise ParserMismatch(dict(results))
+    return results
@@ -25,7 +25,7 @@ def process_muckrock(
     Args:
         base_directory (Path): The directory to save data in, e.g., cache/site-name/
         request_url (str): The url for the webpage of Muckrock you want documents from you want
-        force (bool, default False): Overwrite file, if it exists? Otherwise, use cached version.
+        force (bool, default False): Overwrite file, if it exists? Otherwise, use cached version until it goes stale under clean.freshness.
         throttle (int, default 2): Time to wait between calls (not using here because not required)
 
     Returns:
@@ -57,7 +57,7 @@ def fetch_muckrock(
     Args:
         base_directory (Path): The directory to save data in, e.g., cache/site-name/subpages
         request_url (str): The request_url for the webpage of Muckrock you want documents from you want
-        force (bool, default False): Overwrite file, if it exists? Otherwise, use cached version.
+        force (bool, default False): Overwrite file, if it exists? Otherwise, use cached version until it goes stale under clean.freshness.
 
     Returns:
         filename (str): Proposed filename; file NOT saved
@@ -79,7 +79,7 @@ def fetch_muckrock(
     else:
         request_headers = {}
 
-    if not force and local_cache.exists(filename):
+    if not force and local_cache.is_fresh(filename, request_url):
         logger.debug(f"File found in cache: {filename}")
         returned_json = None
         file_needs_write = False
@@ -1,12 +1,14 @@
 import logging
 from math import ceil
 from pathlib import Path, PurePath
-from time import sleep
-from typing import Dict, List
+from typing import Dict, List, Optional
 from urllib.parse import parse_qs, urlparse
 
 from .. import utils
 from ..cache import Cache
+from ..profiling import phase
+from ..ratelimit import limiter
+from ..records import MetadataRecord
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +20,11 @@ To-dos include:
 
 
 def process_nextrequest(
-    base_directory: Path, start_url: str, force: bool = False, throttle: int = 2
+    base_directory: Path,
+    start_url: str,
+    force: bool = False,
+    throttle: int = 2,
+    cache: Optional[Cache] = None,
 ):
     """Turn a base filepath and NextRequest folder URL into saved data and parsed Metadata.
 
@@ -27,29 +33,37 @@ def process_nextrequest(
     Args:
         base_direcory (Path): The directory to save data in, e.g., cache/site-name/subpages
         start_url (str): The web page for the folder of NextRequest docs you want
-        force (bool, default False): Overwrite file, if it exists? Otherwise, use cached version.
+        force (bool, default False): Overwrite file, if it exists? Otherwise, use cached version until it goes stale under clean.freshness.
         throttle (int, default 2): Time to wait between calls
+        cache (Cache, optional): The scraper's cache, which base_directory is inside. Defaults to the default cache.
     Returns:
-        List(Metadata)
+        List(MetadataRecord)
     """
+    local_cache = cache or Cache(path=None)
+
     # Download data, if necessary
-    filename, returned_json, file_needs_write = fetch_nextrequest(
-        base_directory, start_url, force, throttle=throttle
-    )
+    with phase("fetch documents"):
+        filename, returned_json, file_needs_write = fetch_nextrequest(
+            base_directory, start_url, force, throttle=throttle, cache=local_cache
+        )
 
     # Write data, if necessary
-    local_cache = Cache(path=None)
     if file_needs_write and returned_json:
         local_cache.write_json(filename, returned_json)
 
     # Read data (always necessary!)
-    local_metadata = parse_nextrequest(start_url, filename)
+    with phase("parse"):
+        local_metadata = parse_nextrequest(start_url, filename, cache=local_cache)
     return local_metadata
 
 
 # Type base_directory to Path
 def fetch_nextrequest(
-    base_directory: Path, start_url: str, force: bool = False, throttle: int = 2
+    base_directory: Path,
+    start_url: str,
+    force: bool = False,
+    throttle: int = 2,
+    cache: Optional[Cache] = None,
 ):
     """
     Given a link to a NextRequest documents folder, return a proposed filename and the JSON contents.
@@ -57,7 +71,8 @@ def fetch_nextrequest(
     Args:
         base_direcory (Path): The directory to save data in, e.g., cache/site-name/subpages
         start_url (str): The web page for the folder of NextRequest docs you want
-        force (bool, default False): Overwrite file, if it exists? Otherwise, use cached version.
+        force (bool, default False): Overwrite file, if it exists? Otherwise, use cached version until it goes stale under clean.freshness.
+        cache (Cache, optional): The scraper's cache, whose freshness rules apply. Defaults to the default cache.
     Returns:
         filename (str): Proposed filename; file NOT saved
         returned_json (None | dict): None if no rescrape needed; dict if JSON had to be downloaded
@@ -73,13 +88,15 @@ def fetch_nextrequest(
     # We're writing out the parsed (requests.json()) output of at least the first page,
     # and then folding in any additional pages' documents into that JSON.
 
-    local_cache = Cache(path=None)
+    local_cache = cache or Cache(path=None)
     filename = base_directory / f"{folder_id}.json"
-    if not force and local_cache.exists(filename):
+    if not force and local_cache.is_fresh(filename, start_url):
         logger.debug(f"File found in cache: {filename}")
         returned_json = None
         file_needs_write = False
     else:
+        # Space out page requests to this NextRequest host
+        limiter.throttle(json_url, throttle)
         # Remember pagination here!
         page_number = 1
         page_url = f"{json_url}{page_number}"
@@ -98,7 +115,6 @@ def fetch_nextrequest(
                 returned_json["documents"][i]["bln_total_documents"] = total_documents
             page_size = profile["page_size"]
             max_pages = find_max_pages(total_documents, page_size)
-            sleep(throttle)
             if total_documents > profile["doc_limit"]:
                 message = f"Request found with {total_documents:,} documents, exceeding limits. "
                 message += f"This is probably a bad URL that can't be properly scraped: {page_url}. "
@@ -144,7 +160,6 @@ def fetch_nextrequest(
                                 returned_json["documents"].extend(
                                     additional_json["documents"]
                                 )
-                        sleep(throttle)
             documents_found = len(returned_json["documents"])
             if documents_found != total_documents:
                 message = f"Expected {total_documents:,} documents "
@@ -155,18 +170,19 @@ def fetch_nextrequest(
     return (filename, returned_json, file_needs_write)
 
 
-def parse_nextrequest(start_url: str, filename: str):
+def parse_nextrequest(start_url: str, filename: str, cache: Optional[Cache] = None):
     """
     Given a link to a NextRequest documents folder and a filename to a JSON, return Metadata.
 
     Args:
         start_url (str): The web page for the folder of NextRequest docs you want
         filename: Filename to parse for JSON
+        cache (Cache, optional): The scraper's cache, which filename is inside. Defaults to the default cache.
     Returns:
-        List(Metadata)
+        List(MetadataRecord)
     """
     local_metadata: List = []
-    local_cache = Cache(path=None)
+    local_cache = cache or Cache(path=None)
     if not local_cache.exists(filename):
         logger.warning(f"No file {filename} found to go with {start_url}.")
         empty_list: List = []
@@ -255,7 +271,7 @@ def parse_nextrequest(start_url: str, filename: str):
                     logger.warning(f"Missing {source} from entry {entry}")
                 else:
                     line["details"][target] = entry[source]
-        local_metadata.append(line)
+        local_metadata.append(MetadataRecord.from_dict(line))
     return local_metadata
 
 
@@ -279,16 +295,17 @@ def fingerprint_nextrequest(start_url: str):
     parsed_url = urlparse(start_url)
     if parsed_url.path == "/documents":  # LAPDish type
         base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
+        folder_id = parse_qs(parsed_url.query)["folder_filter"][0]
         line = {
             "site_type": "lapdish",  # LAPDish type
             "base_url": base_url,
-            "folder_id": parse_qs(parsed_url.query)["folder_filter"][0],
+            "folder_id": folder_id,
             "page_size": 50,
             "doc_limit": 9950,  # Max number of accessible docs in a folder
             "tally_field": "total_count",
             "bln_page_url": "bln_page_url",
             "bln_total_documents": "bln_total_documents",
-            "json_url": f"{base_url}/client/documents?sort_field=count&sort_order=desc&page_size=50&folder_filter={line['folder_id']}&page_number=",  # type: ignore
+            "json_url": f"{base_url}/client/documents?sort_field=count&sort_order=desc&page_size=50&folder_filter={folder_id}&page_number=",
             "details": {
                 "document_path": "document_path",
                 "description": "description",
@@ -312,14 +329,15 @@ def fingerprint_nextrequest(start_url: str):
         and parsed_url.path.split("/")[1] == "requests"
     ):
         base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
+        folder_id = parsed_url.path.split("/")[2]
         line = {
             "site_type": "bartish",  # Bartish type
             "base_url": base_url,
-            "folder_id": urlparse(start_url).path.split("/")[2],
+            "folder_id": folder_id,
             "doc_limit": 9950,  # Max number of accessible docs in a folder
             "page_size": 25,
             "tally_field": "total_documents_count",
-            "json_url": f"{base_url}/client/request_documents?request_id={line['folder_id']}&page_number=",  # type: ignore
+            "json_url": f"{base_url}/client/request_documents?request_id={folder_id}&page_number=",
             "details": {
                 "document_path": "ds!document_path",
                 "bogus_asset_url": "asset_url",
@@ -0,0 +1,213 @@
+import cProfile
+import io
+import logging
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# How many functions the text summary lists
+TOP_FUNCTIONS = 30
+
+
+class PhaseTimer:
+    """Attribute wall-clock time to named, nestable phases of a run.
+
+    Time is charged to the innermost open phase only, so a "fetch" inside a
+    "fetch children" phase isn't counted twice. Totals are keyed by the path
+    of open phases, e.g. ``fetch children/parse``. Each thread keeps its own
+    stack of phases, so work done in download threads is attributed too.
+
+    The timer does nothing outside :meth:`recording`, which keeps
+    :func:`phase` cheap enough to leave in hot paths.
+
+    Example: ::
+
+        from clean.profiling import phase
+
+        with phase("fetch index"):
+            html = cache.download(name, url)
+    """
+
+    def __init__(self):
+        """Initialize a new instance."""
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._depth = 0
+        self._unpatch = None
+        self.totals: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+
+    def reset(self):
+        """Forget every recorded phase."""
+        with self._lock:
+            self.totals = {}
+            self.counts = {}
+
+    @contextmanager
+    def recording(self) -> Iterator["PhaseTimer"]:
+        """Enable the timer for the duration of the block.
+
+        Blocks can nest, as when a profiled run happens inside a reported one.
+        The outermost block resets the totals on entry and stops the timer
+        on exit, so inner blocks see everything recorded so far.
+        """
+        with self._lock:
+            self._depth += 1
+            if self._depth == 1:
+                self.totals = {}
+                self.counts = {}
+                self._unpatch = _time_parsing()
+                self.enabled = True
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._depth -= 1
+                if self._depth == 0:
+                    self.enabled = False
+                    if self._unpatch is not None:
+                        self._unpatch()
+                        self._unpatch = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Charge the time spent inside the block to the named phase.
+
+        Re-entering the phase that's already innermost, such as a fetch helper
+        calling another fetch helper, is folded into the outer one.
+        """
+        if not self.enabled:
+            yield
+            return
+        stack: List[str] = self._local.__dict__.setdefault("stack", [])
+        if stack and stack[-1] == name:
+            yield
+            return
+        self._charge(stack)
+        stack.append(name)
+        with self._lock:
+            key = "/".join(stack)
+            self.counts[key] = self.counts.get(key, 0) + 1
+        try:
+            yield
+        finally:
+            self._charge(stack)
+            stack.pop()
+
+    def summary(self) -> List[tuple[str, int, float]]:
+        """Return (phase, times entered, seconds) rows, slowest first."""
+        with self._lock:
+            rows = [
+                (key, self.counts.get(key, 0), seconds)
+                for key, seconds in self.totals.items()
+            ]
+        return sorted(rows, key=lambda row: row[2], reverse=True)
+
+    def _charge(self, stack: List[str]):
+        """Add the time since the last mark to the innermost open phase."""
+        now = time.perf_counter()
+        mark = getattr(self._local, "mark", now)
+        self._local.mark = now
+        if not stack:
+            return
+        key = "/".join(stack)
+        with self._lock:
+            self.totals[key] = self.totals.get(key, 0.0) + (now - mark)
+
+
+timer = PhaseTimer()
+
+
+def phase(name: str):
+    """Charge the time spent inside the block to the named phase of the run.
+
+    Args:
+        name (str): The phase, e.g. 'fetch index', 'parse' or 'write export'
+    """
+    return timer.phase(name)
+
+
+@contextmanager
+def profile(output: Path, top: int = TOP_FUNCTIONS) -> Iterator[PhaseTimer]:
+    """Profile the block with cProfile and the phase timer.
+
+    Writes two files: ``output`` holds the raw cProfile stats, which load in
+    ``python -m pstats``, snakeviz or gprof2dot, and a ``.txt`` file beside it
+    lists time per phase followed by the top functions by cumulative time.
+
+    cProfile only follows the thread that opened the block. Phases are
+    recorded in every thread.
+
+    Args:
+        output (Path): Where to write the stats, e.g. 'profiles/ca_san_diego_pd.prof'
+        top (int): How many functions to list in the summary (default: 30)
+    """
+    output = Path(output)
+    profiler = cProfile.Profile()
+    with timer.recording():
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            yield timer
+        finally:
+            profiler.disable()
+            elapsed = time.perf_counter() - start
+        output.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(output)
+        summary_path = output.with_suffix(".txt")
+        summary_path.write_text(format_summary(profiler, elapsed, top))
+        logger.info(f"Wrote profile to {output} and summary to {summary_path}")
+
+
+def format_summary(
+    profiler: cProfile.Profile, elapsed: float, top: int = TOP_FUNCTIONS
+) -> str:
+    """Lay out phase totals and the slowest functions as plain text."""
+    out = io.StringIO()
+    out.write(f"Total wall time: {elapsed:.2f}s\n\n")
+    out.write(f"{'phase':<50} {'calls':>7} {'seconds':>9} {'share':>6}\n")
+    accounted = 0.0
+    for key, count, seconds in timer.summary():
+        accounted += seconds
+        share = seconds / elapsed if elapsed else 0
+        out.write(f"{key:<50} {count:>7} {seconds:>9.2f} {share:>6.1%}\n")
+    # Whatever ran outside any phase in the main thread
+    other = max(0.0, elapsed - accounted)
+    out.write(f"{'(other)':<50} {'':>7} {other:>9.2f}\n\n")
+    stats = pstats.Stats(profiler, stream=out)
+    stats.sort_stats("cumulative").print_stats(top)
+    return out.getvalue()
+
+
+def _time_parsing():
+    """Charge BeautifulSoup tree building to a "parse" phase; return an undo function."""
+    try:
+        from bs4 import BeautifulSoup
+    except ImportError:  # pragma: no cover - bs4 is a core dependency
+        return lambda: None
+    init = BeautifulSoup.__init__
+
+    def timed_init(soup, *args, **kwargs):
+        with phase("parse"):
+            init(soup, *args, **kwargs)
+
+    BeautifulSoup.__init__ = timed_init  # type: ignore
+
+    def unpatch():
+        BeautifulSoup.__init__ = init  # type: ignore
+
+    return unpatch
+
+
+def profile_path(
+    profile_dir: Path, agency_slug: str, when: Optional[float] = None
+) -> Path:
+    """Return a timestamped stats path for an agency's run."""
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(when))
+    return Path(profile_dir) / f"{agency_slug}-{stamp}.prof"
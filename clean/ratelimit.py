@@ -0,0 +1,165 @@
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from .metrics import metrics
+from .profiling import phase
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket that spaces out calls to a steady rate.
+
+    The bucket holds up to ``burst`` tokens and refills at ``rate`` tokens per
+    second. Each call to :meth:`acquire` spends one token, waiting for the
+    bucket to refill if it's empty.
+
+    Args:
+        rate (float): Tokens added per second, e.g. 0.5 for one request every two seconds
+        burst (int): Most tokens the bucket can hold (default: 1)
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """Initialize a new instance."""
+        if rate <= 0:
+            raise ValueError("rate must be greater than zero")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Spend a token, sleeping until one is available.
+
+        Returns: The number of seconds spent waiting
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            # Reserve the token now so concurrent callers queue up behind us
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            with phase("throttle"):
+                time.sleep(wait)
+        return wait
+
+
+class RateLimiter:
+    """Per-host request rate limits shared by every HTTP call in the process.
+
+    Hosts without a rule of their own use the default rule, which is
+    unlimited until :meth:`configure` sets one. Limits only apply when a
+    request actually goes out over the network, so files served from the
+    cache never wait.
+
+    Example: ::
+
+        from clean.ratelimit import limiter
+
+        # At most one request every two seconds to any host
+        limiter.configure(rate=0.5)
+        # But let a sturdier host take bursts of five at two per second
+        limiter.configure(rate=2, burst=5, host="lacity.nextrequest.com")
+    """
+
+    def __init__(self):
+        """Initialize a new instance."""
+        self._default: Optional[tuple[float, int]] = None
+        self._rules: Dict[str, tuple[float, int]] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def configure(
+        self, rate: Optional[float] = None, burst: int = 1, host: Optional[str] = None
+    ):
+        """Set the request rate for one host, or the default for all hosts.
+
+        Args:
+            rate (float): Requests per second. None or zero removes the limit.
+            burst (int): Requests allowed back-to-back before the rate applies (default: 1)
+            host (str): Hostname the rule applies to (default: every host without its own rule)
+        """
+        rule = (rate, max(1, burst)) if rate else None
+        with self._lock:
+            if host is None:
+                self._default = rule
+                # Rebuild buckets for hosts that follow the default
+                for name in list(self._buckets):
+                    if name not in self._rules:
+                        del self._buckets[name]
+            else:
+                host = host.lower()
+                if rule is None:
+                    self._rules.pop(host, None)
+                else:
+                    self._rules[host] = rule
+                self._buckets.pop(host, None)
+
+    def throttle(self, url: str, seconds: float):
+        """Space requests to the URL's host at least ``seconds`` apart.
+
+        A shortcut for scrapers and platforms that take a ``throttle`` argument.
+        It only ever tightens the host's limit: a host already held to that
+        rate or slower keeps its rule, burst and bucket, so calling this
+        before every request is cheap and doesn't undo the spacing.
+
+        Args:
+            url (str): Any URL on the host
+            seconds (float): Minimum delay between requests. Zero leaves the host's limit alone.
+        """
+        if not seconds or seconds <= 0:
+            return
+        host = (urlparse(url).hostname or "").lower()
+        rate = 1 / seconds
+        with self._lock:
+            rule = self._rules.get(host, self._default)
+        if rule is not None and rule[0] <= rate:
+            return
+        self.configure(rate=rate, host=host)
+
+    def reset(self):
+        """Remove every rule and bucket."""
+        with self._lock:
+            self._default = None
+            self._rules = {}
+            self._buckets = {}
+
+    def acquire(self, url: str) -> float:
+        """Wait until a request to the URL's host is allowed.
+
+        Args:
+            url (str): The URL about to be requested
+
+        Returns: The number of seconds spent waiting
+        """
+        host = (urlparse(url).hostname or "").lower()
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked workers get fresh buckets but keep the rules
+                self._buckets = {}
+                self._pid = os.getpid()
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rule = self._rules.get(host, self._default)
+                if rule is None:
+                    return 0.0
+                bucket = TokenBucket(*rule)
+                self._buckets[host] = bucket
+        wait = bucket.acquire()
+        if wait:
+            logger.debug(f"Waited {wait:.2f}s to request {host}")
+            metrics.observe_throttle(url, wait)
+        return wait
+
+
+limiter = RateLimiter()
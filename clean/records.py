@@ -0,0 +1,138 @@
+import sys
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# Fields a record may have; see clean.utils.MetadataDict
+FIELDS = ("asset_url", "case_id", "name", "parent_page", "title", "details")
+
+# Strings in details longer than this are rarely repeated, so aren't interned
+INTERN_MAX_LENGTH = 256
+
+# One shared tuple per distinct order of field or detail names
+_shapes: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+class MetadataRecord(Mapping):
+    """A compact, read-only metadata record for agencies with many thousands of files.
+
+    Holds the same fields as a :class:`clean.utils.MetadataDict` in slots
+    instead of a dict per record. Details are kept as a tuple of values,
+    with their names stored once for every record that shares them. Short
+    case IDs, parent pages, titles and detail values are interned, so a
+    string repeated across records is only held once.
+
+    Records read like the dicts they replace: ``record["case_id"]`` and
+    ``record.get("details")`` work, and :meth:`to_dict` gives back a dict
+    with the fields in the order they were provided, so exports are
+    byte-for-byte the same. Export sinks accept records directly.
+
+    Example: ::
+
+        record = MetadataRecord(
+            asset_url="https://example.com/a.pdf",
+            case_id="21-107",
+            name="a.pdf",
+            parent_page="21-107.json",
+            title="a.pdf",
+            details={"file_extension": "pdf"},
+        )
+        record.update_details({"officer_name": "Smith"})
+
+    Records can't be changed in place, apart from :meth:`update_details`.
+
+    Args:
+        **fields: Any of asset_url, case_id, name, parent_page, title and details
+    """
+
+    __slots__ = (
+        "asset_url",
+        "case_id",
+        "name",
+        "parent_page",
+        "title",
+        "_fields",
+        "_detail_names",
+        "_detail_values",
+    )
+
+    def __init__(self, **fields: Any):
+        """Initialize a new instance."""
+        unknown = set(fields) - set(FIELDS)
+        if unknown:
+            raise ValueError(
+                f"Unknown metadata fields {sorted(unknown)}; records can only have {FIELDS}"
+            )
+        self.asset_url: Optional[str] = fields.get("asset_url")
+        self.name: Optional[str] = fields.get("name")
+        self.case_id: Optional[str] = _intern(fields.get("case_id"))
+        self.parent_page: Optional[str] = _intern(fields.get("parent_page"))
+        self.title: Optional[str] = _intern(fields.get("title"))
+        self._fields = _shape(tuple(fields))
+        self._detail_names: Tuple[str, ...] = ()
+        self._detail_values: Optional[Tuple[Any, ...]] = None
+        if fields.get("details") is not None:
+            self._set_details(fields["details"])
+
+    @classmethod
+    def from_dict(cls, record: Mapping) -> "MetadataRecord":
+        """Make a record from a metadata dict, keeping the order of its fields."""
+        return cls(**record)
+
+    @property
+    def details(self) -> Optional[Mapping]:
+        """Return the details as a read-only mapping, or None if the record has none."""
+        if self._detail_values is None:
+            return None
+        return MappingProxyType(dict(zip(self._detail_names, self._detail_values)))
+
+    def update_details(self, details: Mapping):
+        """Add to or replace the record's details, as ``record["details"].update()`` would."""
+        merged = dict(self.details or {})
+        merged.update(details)
+        self._set_details(merged)
+        if "details" not in self._fields:
+            self._fields = _shape(self._fields + ("details",))
+
+    def to_dict(self) -> dict:
+        """Return the record as a plain dict, ready to be serialized."""
+        record = {field: self[field] for field in self._fields}
+        if record.get("details") is not None:
+            record["details"] = dict(record["details"])
+        return record
+
+    def __getitem__(self, field: str) -> Any:
+        """Return a field, like a dict would."""
+        if field not in self._fields:
+            raise KeyError(field)
+        if field == "details":
+            return self.details
+        return getattr(self, field)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the record's fields, in the order they were provided."""
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        """Return the number of fields."""
+        return len(self._fields)
+
+    def __repr__(self) -> str:
+        """Show the record's fields."""
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def _set_details(self, details: Mapping):
+        self._detail_names = _shape(tuple(details))
+        self._detail_values = tuple(_intern(value) for value in details.values())
+
+
+def _shape(names: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Return the shared tuple for a sequence of names."""
+    return _shapes.setdefault(names, names)
+
+
+def _intern(value: Any) -> Any:
+    """Intern short strings; leave anything else alone."""
+    if isinstance(value, str) and len(value) <= INTERN_MAX_LENGTH:
+        return sys.intern(value)
+    return value
@@ -0,0 +1,194 @@
+"""Every agency scraper, readable without importing the scrapers themselves.
+
+Generated by scripts/build_registry.py from the Site classes in clean/<state>/.
+Don't edit it by hand; rerun the script after adding or renaming a scraper.
+"""
+
+from typing import List, Optional, TypedDict
+
+
+class ScraperInfo(TypedDict):
+    slug: str
+    state: str
+    agency: str
+    module: str
+    platform: Optional[str]
+
+
+SCRAPERS: List[ScraperInfo] = [
+    {
+        "slug": "ca_bay_area_rapid_transit_pd",
+        "state": "ca",
+        "agency": "Bay Area Rapid Transit Police Department",
+        "module": "clean.ca.bay_area_rapid_transit_pd",
+        "platform": "nextrequest",
+    },
+    {
+        "slug": "ca_california_department_of_corrections_and_rehabilitation",
+        "state": "ca",
+        "agency": "California Department of Corrections and Rehabilitation",
+        "module": "clean.ca.california_department_of_corrections_and_rehabilitation",
+        "platform": "muckrock",
+    },
+    {
+        "slug": "ca_chula_vista_pd",
+        "state": "ca",
+        "agency": "Chula Vista Police Department",
+        "module": "clean.ca.chula_vista_pd",
+        "platform": None,
+    },
+    {
+        "slug": "ca_corona_pd",
+        "state": "ca",
+        "agency": "Corona Police Department.",
+        "module": "clean.ca.corona_pd",
+        "platform": None,
+    },
+    {
+        "slug": "ca_fort_bragg_pd",
+        "state": "ca",
+        "agency": "Fort Bragg Police Department",
+        "module": "clean.ca.fort_bragg_pd",
+        "platform": "muckrock",
+    },
+    {
+        "slug": "ca_fremont_pd",
+        "state": "ca",
+        "agency": "Fremont Police Department.",
+        "module": "clean.ca.fremont_pd",
+        "platform": None,
+    },
+    {
+        "slug": "ca_fresno_county_sheriff",
+        "state": "ca",
+        "agency": "Fullerton Police Department",
+        "module": "clean.ca.fresno_county_sheriff",
+        "platform": None,
+    },
+    {
+        "slug": "ca_fresno_pd",
+        "state": "ca",
+        "agency": "Fresno Police Department",
+        "module": "clean.ca.fresno_pd",
+        "platform": "muckrock",
+    },
+    {
+        "slug": "ca_grass_valley_pd",
+        "state": "ca",
+        "agency": "Grass Valley Police Department",
+        "module": "clean.ca.grass_valley_pd",
+        "platform": None,
+    },
+    {
+        "slug": "ca_humboldt_pd",
+        "state": "ca",
+        "agency": "Humboldt Police",
+        "module": "clean.ca.humboldt_pd",
+        "platform": None,
+    },
+    {
+        "slug": "ca_livermore_pd",
+        "state": "ca",
+        "agency": "Livermore Police Department",
+        "module": "clean.ca.livermore_pd",
+        "platform": "muckrock",
+    },
+    {
+        "slug": "ca_los_angeles_da",
+        "state": "ca",
+        "agency": "Los Angeles District Attorney's Office",
+        "module": "clean.ca.los_angeles_da",
+        "platform": None,
+    },
+    {
+        "slug": "ca_los_angeles_pd",
+        "state": "ca",
+        "agency": "Los Angeles Police Department",
+        "module": "clean.ca.los_angeles_pd",
+        "platform": "nextrequest",
+    },
+    {
+        "slug": "ca_los_angeles_sheriff",
+        "state": "ca",
+        "agency": "Los Angeles Sheriff's Department",
+        "module": "clean.ca.los_angeles_sheriff",
+        "platform": None,
+    },
+    {
+        "slug": "ca_monterey_county_district_attorney",
+        "state": "ca",
+        "agency": "Monterey County District Attorney",
+        "module": "clean.ca.monterey_county_district_attorney",
+        "platform": None,
+    },
+    {
+        "slug": "ca_napa_pd",
+        "state": "ca",
+        "agency": "City of Napa Police Department",
+        "module": "clean.ca.napa_pd",
+        "platform": None,
+    },
+    {
+        "slug": "ca_oakland_pd",
+        "state": "ca",
+        "agency": "City of Oakland Police Department",
+        "module": "clean.ca.oakland_pd",
+        "platform": "nextrequest",
+    },
+    {
+        "slug": "ca_orange_county_sheriff",
+        "state": "ca",
+        "agency": "Orange County Sheriffs Department",
+        "module": "clean.ca.orange_county_sheriff",
+        "platform": None,
+    },
+    {
+        "slug": "ca_redding_pd",
+        "state": "ca",
+        "agency": "Redding Police Department",
+        "module": "clean.ca.redding_pd",
+        "platform": None,
+    },
+    {
+        "slug": "ca_riverside_pd",
+        "state": "ca",
+        "agency": "Riverside Police Department",
+        "module": "clean.ca.riverside_pd",
+        "platform": None,
+    },
+    {
+        "slug": "ca_sacramento_pd",
+        "state": "ca",
+        "agency": "Sacramento Police Department",
+        "module": "clean.ca.sacramento_pd",
+        "platform": None,
+    },
+    {
+        "slug": "ca_san_diego_harbor_pd",
+        "state": "ca",
+        "agency": "San Diego Harbor Police Department",
+        "module": "clean.ca.san_diego_harbor_pd",
+        "platform": None,
+    },
+    {
+        "slug": "ca_san_diego_pd",
+        "state": "ca",
+        "agency": "San Diego Police Department",
+        "module": "clean.ca.san_diego_pd",
+        "platform": None,
+    },
+    {
+        "slug": "ca_santa_rosa",
+        "state": "ca",
+        "agency": "Santa Rosa Police",
+        "module": "clean.ca.santa_rosa",
+        "platform": None,
+    },
+    {
+        "slug": "ca_sonoma_county_sheriff",
+        "state": "ca",
+        "agency": "Sonoma County Sheriff's Office",
+        "module": "clean.ca.sonoma_county_sheriff",
+        "platform": None,
+    },
+]
@@ -0,0 +1,186 @@
+import json
+import logging
+import time
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, TypedDict
+
+from .metrics import metrics
+from .profiling import timer
+
+logger = logging.getLogger(__name__)
+
+# Most error messages kept in one report
+MAX_ERRORS = 100
+
+
+class RunReport(TypedDict):
+    agency: str
+    command: str
+    started_at: str
+    finished_at: Optional[str]
+    seconds: Optional[float]
+    ok: Optional[bool]
+    phases: Dict[str, float]
+    totals: Dict[str, float]
+    cache_hit_ratio: Optional[float]
+    records: Optional[int]
+    assets: Dict[str, int]
+    changes: Dict[str, int]
+    output: Optional[str]
+    errors: List[str]
+
+
+class _ErrorCollector(logging.Handler):
+    """Keep the messages of errors logged during a run."""
+
+    def __init__(self, errors: List[str]):
+        """Initialize a new instance."""
+        super().__init__(level=logging.ERROR)
+        self.errors = errors
+
+    def emit(self, record: logging.LogRecord):
+        """Save the formatted message, up to MAX_ERRORS of them."""
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append(f"{record.name}: {record.getMessage()}")
+
+
+class RunRecorder:
+    """Gather a machine-readable report of how one agency's run went.
+
+    Requests made inside the block are attributed to the agency in
+    :mod:`clean.metrics`.
+
+    The report covers start and end times, time per phase (see
+    :mod:`clean.profiling`), request, cache and bytes-written totals from
+    :mod:`clean.metrics` and any errors, whether raised or only logged. The caller
+    fills in what only it knows, such as ``records`` or ``assets``, before
+    the block ends.
+
+    Phases are only timed when the report is saved, since timing them means
+    wrapping ``BeautifulSoup.__init__`` for the length of the run.
+
+    Example: ::
+
+        with RunRecorder("ca_san_diego_pd", "scrape-meta", reports_dir) as report:
+            path = site.scrape_meta()
+            report["output"] = str(path)
+
+    Args:
+        agency (str): The agency slug, e.g. 'ca_san_diego_pd'
+        command (str): What's being run, e.g. 'scrape-meta' or 'download-agency'
+        reports_dir (Path): Save the report under ``<reports_dir>/<agency>/`` when the run ends (default: None, don't save it)
+    """
+
+    def __init__(self, agency: str, command: str, reports_dir: Optional[Path] = None):
+        """Initialize a new instance."""
+        self.agency = agency
+        self.command = command
+        self.reports_dir = reports_dir
+        self.report: RunReport = {
+            "agency": agency,
+            "command": command,
+            "started_at": "",
+            "finished_at": None,
+            "seconds": None,
+            "ok": None,
+            "phases": {},
+            "totals": {},
+            "cache_hit_ratio": None,
+            "records": None,
+            "assets": {},
+            "changes": {},
+            "output": None,
+            "errors": [],
+        }
+        self.path: Optional[Path] = None
+
+    def __enter__(self) -> RunReport:
+        """Start timing phases and collecting errors."""
+        self.report["started_at"] = _timestamp(time.time())
+        self._start = time.perf_counter()
+        self._before = metrics.totals(self.agency, self.command)
+        with ExitStack() as contexts:
+            if self.reports_dir is not None:
+                contexts.enter_context(timer.recording())
+            contexts.enter_context(metrics.agency(self.agency, self.command))
+            self._contexts = contexts.pop_all()
+        self._handler = _ErrorCollector(self.report["errors"])
+        logging.getLogger().addHandler(self._handler)
+        return self.report
+
+    def __exit__(self, exc_type, exc, tb):
+        """Finish the report and save it; exceptions are recorded, not swallowed."""
+        logging.getLogger().removeHandler(self._handler)
+        report = self.report
+        try:
+            if self.reports_dir is not None:
+                report["phases"] = {
+                    key: round(seconds, 3) for key, _, seconds in timer.summary()
+                }
+        finally:
+            self._contexts.close()
+        report["finished_at"] = _timestamp(time.time())
+        report["seconds"] = round(time.perf_counter() - self._start, 3)
+        report["ok"] = exc is None
+        if exc is not None and len(report["errors"]) < MAX_ERRORS:
+            report["errors"].append(f"{type(exc).__name__}: {exc}")
+        after = metrics.totals(self.agency, self.command)
+        totals = {key: round(after[key] - self._before[key], 3) for key in after}
+        report["totals"] = totals
+        lookups = totals["cache_hits"] + totals["cache_misses"]
+        if lookups:
+            report["cache_hit_ratio"] = round(totals["cache_hits"] / lookups, 3)
+        if self.reports_dir is not None:
+            self.path = write_report(report, self.reports_dir)
+        return False
+
+
+def write_report(report: RunReport, reports_dir: Path) -> Path:
+    """Save a run report as ``<reports_dir>/<agency>/<started_at>-<command>.json``.
+
+    Runs that start in the same millisecond get a numbered file each.
+
+    Returns: The path written
+    """
+    stamp = report["started_at"].replace(":", "").replace("-", "").replace(".", "")
+    folder = Path(reports_dir) / report["agency"]
+    folder.mkdir(parents=True, exist_ok=True)
+    attempt = 1
+    while True:
+        suffix = f"-{attempt}" if attempt > 1 else ""
+        path = folder / f"{stamp}{suffix}-{report['command']}.json"
+        try:
+            with open(path, "x", encoding="utf-8") as fh:
+                json.dump(report, fh, indent=2)
+            break
+        except FileExistsError:
+            attempt += 1
+    logger.debug(f"Wrote run report to {path}")
+    return path
+
+
+def read_reports(
+    reports_dir: Path, agency: str, command: Optional[str] = None
+) -> List[RunReport]:
+    """Load an agency's saved run reports, oldest first, for trending.
+
+    Args:
+        reports_dir (Path): The folder reports were saved in
+        agency (str): The agency slug, e.g. 'ca_san_diego_pd'
+        command (str): Only return reports for this command (default: all of them)
+    """
+    pattern = f"*-{command}.json" if command else "*.json"
+    saved = []
+    for path in (Path(reports_dir) / agency).glob(pattern):
+        with open(path, encoding="utf-8") as fh:
+            report = json.load(fh)
+        saved.append((report["started_at"], path.stat().st_mtime_ns, report))
+    return [report for _, _, report in sorted(saved, key=lambda row: row[:2])]
+
+
+def _timestamp(when: float) -> str:
+    """Format a UTC ISO 8601 time, to the millisecond so file names don't collide."""
+    moment = datetime.fromtimestamp(when, timezone.utc)
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.") + f"{moment.microsecond // 1000:03d}Z"
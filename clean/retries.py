@@ -0,0 +1,130 @@
+import logging
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+
+import requests
+
+from .metrics import metrics
+from .profiling import phase
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth asking for again. Anything else that isn't ok is permanent.
+RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+# Network failures worth trying again
+RETRY_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+class RetryPolicy:
+    """Decide whether, and how long to wait before, retrying an HTTP request.
+
+    Only transient failures are retried: connection errors, timeouts and the
+    statuses in ``RETRY_STATUSES``. A 404 or 403 comes straight back so dead
+    links fail fast. Waits use exponential backoff with full jitter, and a
+    ``Retry-After`` header from the server takes precedence. No request spends
+    more than ``max_total`` seconds sleeping between attempts.
+
+    Example: ::
+
+        from clean.retries import default_policy
+
+        response = default_policy.call(lambda: session.get(url), url)
+
+    Args:
+        tries (int): Most attempts per request, including the first (default: 4)
+        base_delay (float): Backoff ceiling for the first retry, in seconds (default: 1)
+        max_delay (float): Longest single wait, in seconds (default: 30)
+        max_total (float): Longest total wait across all retries of a request, in seconds (default: 90)
+    """
+
+    def __init__(
+        self,
+        tries: int = 4,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        max_total: float = 90.0,
+    ):
+        """Initialize a new instance."""
+        self.tries = max(1, tries)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_total = max_total
+
+    def call(
+        self, send: Callable[[], requests.Response], url: str
+    ) -> requests.Response:
+        """Run ``send`` until it returns a final response or the policy gives up.
+
+        Args:
+            send (callable): Makes the request and returns the response
+            url (str): The URL being requested, for logging
+
+        Returns: The last response. It may not be ok if the retries ran out or the status was permanent.
+        """
+        slept = 0.0
+        attempt = 1
+        while True:
+            try:
+                response = send()
+            except RETRY_ERRORS as e:
+                delay = self.backoff(attempt)
+                if not self._can_wait(attempt, slept, delay):
+                    raise
+                logger.debug(f"{type(e).__name__} requesting {url}; retrying")
+            else:
+                if response.ok or response.status_code not in RETRY_STATUSES:
+                    return response
+                retry_after = self._retry_after(response)
+                if retry_after is None:
+                    delay = self.backoff(attempt)
+                else:
+                    delay = retry_after
+                if not self._can_wait(attempt, slept, delay):
+                    return response
+                logger.debug(f"Status {response.status_code} from {url}; retrying")
+                # Hand the connection back to the pool before waiting
+                response.close()
+            logger.debug(f"Waiting {delay:.1f}s before attempt {attempt + 1}")
+            metrics.observe_retry(url)
+            with phase("retry wait"):
+                time.sleep(delay)
+            slept += delay
+            attempt += 1
+
+    def backoff(self, attempt: int) -> float:
+        """Return a jittered wait for the provided attempt number.
+
+        Args:
+            attempt (int): The attempt that just failed, starting at 1
+
+        Returns: A random delay between zero and the exponential backoff ceiling
+        """
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+    def _can_wait(self, attempt: int, slept: float, delay: float) -> bool:
+        return attempt < self.tries and slept + delay <= self.max_total
+
+    def _retry_after(self, response: requests.Response) -> Optional[float]:
+        """Read a Retry-After header given as seconds or an HTTP date."""
+        value = response.headers.get("Retry-After")
+        if not isinstance(value, str) or not value.strip():
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, when.timestamp() - time.time())
+
+
+default_policy = RetryPolicy()
@@ -1,17 +1,36 @@
-import json
 import logging
 import shutil
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
 from importlib import import_module
 from pathlib import Path
-
-import requests
+from typing import ContextManager, Dict, Iterator, List, Optional, TypedDict
 
 from . import utils
+from .cache import Cache
+from .deltas import changes_path, snapshot_path, write_changes
+from .downloads import AssetDownloader
+from .exports import find_export, read_export, use_format
+from .metrics import metrics
+from .parsing import use_parser
+from .profiling import profile, profile_path
+from .ratelimit import limiter
+from .reports import MAX_ERRORS, RunRecorder, RunReport
 
 logger = logging.getLogger(__name__)
 
 
+class ScrapeResult(TypedDict):
+    agency: str
+    ok: bool
+    path: Optional[str]
+    error: Optional[str]
+    seconds: float
+
+
 class Runner:
     """High-level interface for agency files.
 
@@ -28,7 +47,14 @@ class Runner:
     Args:
         data_dir (str): Path where final output files are saved.
         cache_dir (str): Path to store intermediate files used in ETL.
-        throttle (int): Seconds to delay scraper actions (default: 0)
+        throttle (float): Minimum seconds between network requests to the same host (default: 0)
+        burst (int): Requests a host may receive back-to-back before the throttle applies (default: 1)
+        profile_dir (str): Profile each run and save the results here (default: None, no profiling)
+        metrics_dir (str): Save each run's HTTP metrics here for Prometheus's textfile collector (default: None)
+        reports_dir (str): Save a JSON report of each run here, in a folder per agency (default: None)
+        parser (str): HTML parser backend for scrapers, e.g. 'lxml' or 'html.parser' (default: None, CLEAN_HTML_PARSER or the fastest installed)
+        export_format (str): Format of metadata exports: 'json', 'jsonl', 'csv' or 'sqlite' (default: None, CLEAN_EXPORT_FORMAT or 'json')
+        changes (bool): Save what changed since the last scrape beside each export (default: True)
 
     """
 
@@ -37,13 +63,63 @@ class Runner:
         data_dir: Path = utils.CLEAN_DATA_DIR,
         cache_dir: Path = utils.CLEAN_CACHE_DIR,
         assets_dir: Path = utils.CLEAN_ASSETS_DIR,
-        throttle: int = 0,
+        throttle: float = 0,
+        burst: int = 1,
+        profile_dir: Optional[Path] = None,
+        metrics_dir: Optional[Path] = None,
+        reports_dir: Optional[Path] = None,
+        parser: Optional[str] = None,
+        export_format: Optional[str] = None,
+        changes: bool = True,
     ):
         """Initialize a new instance."""
         self.data_dir = data_dir
         self.cache_dir = cache_dir
         self.assets_dir = assets_dir
         self.throttle = throttle
+        self.burst = burst
+        self.profile_dir = profile_dir
+        self.metrics_dir = metrics_dir
+        self.reports_dir = reports_dir
+        self.parser = parser
+        self.export_format = export_format
+        self.changes = changes
+
+    def _configure_rate_limit(self):
+        """Apply the throttle as the default per-host rate for every HTTP request."""
+        rate = 1 / self.throttle if self.throttle and self.throttle > 0 else None
+        limiter.configure(rate=rate, burst=self.burst)
+
+    @contextmanager
+    def _track(self, agency_slug: str, command: str) -> Iterator[RunReport]:
+        """Report on the block, count its requests and profile it, as configured.
+
+        Scrapers inside the block parse HTML with the runner's parser and save
+        exports in its format.
+
+        Yields the run's report for the caller to add results to. The report
+        and metrics (``<metrics_dir>/clean_<agency>_<command>.prom``) are
+        saved when the block finishes, even if it fails.
+        """
+        profiler: ContextManager
+        if self.profile_dir is None:
+            profiler = nullcontext()
+        else:
+            name = (
+                agency_slug if command == "scrape-meta" else f"{agency_slug}-{command}"
+            )
+            profiler = profile(profile_path(self.profile_dir, name))
+        recorder = RunRecorder(agency_slug, command, self.reports_dir)
+        try:
+            with use_parser(self.parser), use_format(self.export_format):
+                with recorder as report, profiler:
+                    yield report
+        finally:
+            if self.metrics_dir is not None:
+                name = f"clean_{agency_slug}_{command.replace('-', '_')}.prom"
+                metrics.write_textfile(
+                    Path(self.metrics_dir) / name, agency_slug, command
+                )
 
     def _validate_agency_slug(self, agency_slug: str) -> tuple[str, str]:
         """Validate the agency slug and extract state and slug.
@@ -71,6 +147,10 @@ class Runner:
         Args:
             agency_slug (str): Unique scraper slug composed of two-letter state postal code and agency slug: e.g. ca_san_diego_pd
 
+        When the runner saves changes, the records added, removed or changed
+        since the last run are also written to ``<agency>.changes.jsonl``
+        beside the export. See :func:`clean.deltas.write_changes`.
+
         Returns: a Path object leading to a CSV file.
         """
         state, slug = self._validate_agency_slug(agency_slug)
@@ -78,59 +158,228 @@ class Runner:
         # Run the scrape method
         logger.info(f"Scraping {agency_slug}")
         site = state_mod.Site(self.data_dir, self.cache_dir)
-        data_path = site.scrape_meta(throttle=self.throttle)
+        self._configure_rate_limit()
+        with self._track(agency_slug, "scrape-meta") as report:
+            data_path = site.scrape_meta(throttle=self.throttle)
+            report["output"] = str(data_path)
+            report["records"] = _count_records(data_path)
+            if self.changes:
+                report["changes"] = _save_changes(data_path, agency_slug)
         # Run the path to the data file
         logger.info(f"Generated {data_path}")
         return data_path
 
-    def download_agency(self, agency_slug: str) -> Path:
+    def scrape_meta_many(
+        self, agency_slugs: List[str], jobs: int = 1
+    ) -> List[ScrapeResult]:
+        """Scrape metadata for several agencies, optionally in parallel.
+
+        Each agency runs in its own worker process, so a slow or broken site
+        only holds up its own worker. Failures are caught and reported rather
+        than aborting the remaining agencies.
+
+        Args:
+            agency_slugs (list): Agency slugs, e.g. ['ca_san_diego_pd', 'ca_los_angeles_pd']
+            jobs (int): Number of worker processes (default: 1, which runs serially in this process)
+
+        Returns: A list of results, one per agency, in the order they were provided.
+        """
+        if jobs <= 1 or len(agency_slugs) <= 1:
+            return [self._scrape_meta_result(slug) for slug in agency_slugs]
+
+        workers = min(jobs, len(agency_slugs))
+        logger.info(f"Scraping {len(agency_slugs)} agencies with {workers} workers")
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(logging.getLogger().level,),
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _scrape_meta_worker,
+                    self.data_dir,
+                    self.cache_dir,
+                    self.assets_dir,
+                    self.throttle,
+                    self.burst,
+                    self.profile_dir,
+                    self.metrics_dir,
+                    self.reports_dir,
+                    self.parser,
+                    self.export_format,
+                    self.changes,
+                    slug,
+                )
+                for slug in agency_slugs
+            ]
+            return [future.result() for future in futures]
+
+    def _scrape_meta_result(self, agency_slug: str) -> ScrapeResult:
+        """Run scrape_meta for one agency and capture the outcome and wall time."""
+        start = time.perf_counter()
+        try:
+            data_path = self.scrape_meta(agency_slug)
+        except Exception as e:
+            logger.exception(f"Scraping {agency_slug} failed")
+            return {
+                "agency": agency_slug,
+                "ok": False,
+                "path": None,
+                "error": f"{type(e).__name__}: {e}",
+                "seconds": time.perf_counter() - start,
+            }
+        return {
+            "agency": agency_slug,
+            "ok": True,
+            "path": str(data_path),
+            "error": None,
+            "seconds": time.perf_counter() - start,
+        }
+
+    def download_agency(
+        self, agency_slug: str, jobs: int = 8, per_host: int = 2
+    ) -> Path:
         """Download files for the provided agency.
 
+        Assets are fetched concurrently: up to ``jobs`` downloads at once, and
+        no more than ``per_host`` against any single host.
+
         Args:
-            geo_id (str): A full-name of the
             agency_slug (str): Unique scraper slug composed of two-letter state postal code and agency slug: e.g. ca_san_diego_pd
+            jobs (int): Maximum number of downloads in flight (default: 8)
+            per_host (int): Maximum number of downloads in flight per host (default: 2)
 
-        Returns: a Path object leading to a CSV file.
+        Returns: a Path object leading to the download directory.
         """
         state, slug = self._validate_agency_slug(agency_slug)
-        # Define the path to the JSON file
-        json_path = Path.home() / f".clean-scraper/exports/{agency_slug}.json"
-
-        # Load the JSON file
-        with open(json_path) as f:
-            data = json.load(f)
+        # Find the metadata export, JSON or JSON Lines
+        export = find_export(self.data_dir, agency_slug)
 
         # Create the download directory if it doesn't exist
         download_dir = self.assets_dir / f"{slug}"
         download_dir.mkdir(parents=True, exist_ok=True)
 
-        # Download each asset
-        for item in data:
-            asset_url = item.get("asset_url")
-            if asset_url:
-                current_date = datetime.now().strftime("%Y%m%d")
-                local_filepath = (
-                    download_dir
-                    / f"{current_date}/assets/{item.get('case_id')}/{item.get('name')}"
-                )
-                local_filepath.parent.mkdir(parents=True, exist_ok=True)
-                try:
-                    response = requests.get(
-                        asset_url,
-                        headers={"User-Agent": "Big Local News (biglocalnews.org)"},
+        # Feed each asset to the downloader, reading the export a record at a time
+        current_date = datetime.now().strftime("%Y%m%d")
+        records = 0
+
+        def queue():
+            nonlocal records
+            for item in read_export(export):
+                records += 1
+                asset_url = item.get("asset_url")
+                if asset_url:
+                    local_filepath = (
+                        download_dir
+                        / f"{current_date}/assets/{item.get('case_id')}/{item.get('name')}"
                     )
-                    response.raise_for_status()  # Check for request errors
-                    with open(local_filepath, "wb") as file:
-                        file.write(response.content)
-                    logger.info(f"Downloaded {asset_url} to {local_filepath}")
-                except Exception as e:
-                    logger.error(f"Failed to download asset {asset_url}: {e}")
+                    yield asset_url, local_filepath
+
+        # Download them
+        self._configure_rate_limit()
+        downloader = AssetDownloader(
+            max_workers=jobs, per_host=per_host, root=download_dir
+        )
+        with self._track(agency_slug, "download-agency") as report:
+            summary = downloader.run(queue())
+            report["output"] = str(download_dir)
+            report["records"] = records
+            report["assets"] = {
+                "queued": summary["queued"],
+                "downloaded": len(summary["succeeded"]),
+                "failed": len(summary["failed"]),
+            }
+            for failure in summary["failed"][: MAX_ERRORS - len(report["errors"])]:
+                report["errors"].append(f"{failure['url']}: {failure['error']}")
+        logger.info(
+            f"Downloaded {len(summary['succeeded']):,} assets for {agency_slug}; "
+            f"{len(summary['failed']):,} failed"
+        )
+        for failure in summary["failed"]:
+            logger.info(f" - {failure['url']}: {failure['error']}")
 
         return download_dir
 
+    def prune_cache(self, max_bytes: int, reindex: bool = False) -> dict:
+        """Shrink the cache to a byte budget, deleting least recently used files first.
+
+        Files scrapers pinned for incremental runs are kept.
+
+        Args:
+            max_bytes (int): Byte budget for the cache directory
+            reindex (bool): Index files cached before the index existed first (default: False)
+
+        Returns: The number of files removed and bytes freed
+        """
+        cache = Cache(self.cache_dir)
+        if reindex:
+            cache.reindex()
+        return cache.evict(max_bytes)
+
     def delete(self):
         """Delete the files in the output directories."""
         logger.debug(f"Deleting files in {self.data_dir}")
         shutil.rmtree(self.data_dir, ignore_errors=True)
         logger.debug(f"Deleting files in {self.cache_dir}")
         shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+def _init_worker(log_level: int):
+    """Mirror the parent's log level in worker processes started with spawn."""
+    logging.basicConfig(level=log_level, format="%(asctime)s - %(name)s - %(message)s")
+    logging.getLogger("urllib3").setLevel(logging.ERROR)
+
+
+def _scrape_meta_worker(
+    data_dir: Path,
+    cache_dir: Path,
+    assets_dir: Path,
+    throttle: float,
+    burst: int,
+    profile_dir: Optional[Path],
+    metrics_dir: Optional[Path],
+    reports_dir: Optional[Path],
+    parser: Optional[str],
+    export_format: Optional[str],
+    changes: bool,
+    agency_slug: str,
+) -> ScrapeResult:
+    """Scrape a single agency inside a worker process."""
+    runner = Runner(
+        data_dir,
+        cache_dir,
+        assets_dir,
+        throttle,
+        burst,
+        profile_dir,
+        metrics_dir,
+        reports_dir,
+        parser,
+        export_format,
+        changes,
+    )
+    return runner._scrape_meta_result(agency_slug)
+
+
+def _count_records(data_path) -> Optional[int]:
+    """Count the records in a metadata export, if it's readable."""
+    try:
+        return sum(1 for _ in read_export(data_path))
+    except (OSError, TypeError, ValueError):
+        return None
+
+
+def _save_changes(data_path, agency_slug: str) -> Dict[str, int]:
+    """Save the changes since the last export beside it, if it's readable."""
+    try:
+        if not Path(data_path).is_file():
+            return {}
+        data_dir = Path(data_path).parent
+        return write_changes(
+            Path(data_path),
+            snapshot_path(data_dir, agency_slug),
+            changes_path(data_dir, agency_slug),
+        )
+    except (OSError, TypeError, ValueError, sqlite3.Error) as e:
+        logger.warning(f"Couldn't compare {agency_slug} with its last export: {e}")
+        return {}
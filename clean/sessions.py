@@ -0,0 +1,168 @@
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .metrics import metrics
+from .ratelimit import limiter
+
+logger = logging.getLogger(__name__)
+
+# Number of connections to keep alive for each host, and how many hosts'
+# pools a session remembers. Override with environment variables.
+CLEAN_HTTP_POOL_MAXSIZE = int(os.environ.get("CLEAN_HTTP_POOL_MAXSIZE", 10))
+CLEAN_HTTP_POOL_CONNECTIONS = int(os.environ.get("CLEAN_HTTP_POOL_CONNECTIONS", 10))
+
+
+class PooledAdapter(HTTPAdapter):
+    """HTTP adapter that waits on the per-host rate limiter before each request.
+
+    Because the wait happens here, only requests that actually go out over
+    the network are throttled, and counted in :mod:`clean.metrics`.
+    """
+
+    def send(self, request, *args, **kwargs):
+        """Wait for the host's rate limit, then send the request."""
+        limiter.acquire(request.url)
+        start = time.perf_counter()
+        try:
+            response = super().send(request, *args, **kwargs)
+        except Exception:
+            metrics.observe_request(request.url, None, time.perf_counter() - start)
+            raise
+        metrics.observe_request(
+            request.url, response.status_code, time.perf_counter() - start
+        )
+        stream = kwargs.get("stream", args[0] if args else False)
+        if not stream:
+            # The session would read the body straight away anyway; do it
+            # here so its size can be counted. Streamed bodies are counted by
+            # whoever consumes them.
+            metrics.observe_bytes(request.url, len(response.content))
+        return response
+
+
+class PooledSession(requests.Session):
+    """Keep-alive session that forgets its cookies once each request is done.
+
+    Cookies a server sets while a request is under way, such as on a login
+    redirect, are still sent on to the next hop of that request.
+    """
+
+    def request(self, *args, **kwargs):
+        """Send the request, then clear whatever cookies it collected."""
+        try:
+            return super().request(*args, **kwargs)
+        finally:
+            self.cookies.clear()
+
+
+class SessionRegistry:
+    """Process-wide registry of keep-alive HTTP sessions, one per host.
+
+    Reusing a session lets requests to the same host share TCP and TLS
+    connections instead of paying a new handshake on every call. Sessions are
+    created lazily and are safe to share between threads. Worker processes
+    get their own sessions, since sockets can't be shared across a fork.
+
+    Shared sessions only pool connections. They don't keep cookies between
+    calls, so one scraper's cookies never leak into another's later requests. Pass
+    your own ``requests.Session`` to :func:`clean.utils.get_url` when a site
+    needs cookies to persist.
+
+    Example: ::
+
+        from clean.sessions import get_session
+
+        session = get_session("https://lacity.nextrequest.com/documents")
+        session.get("https://lacity.nextrequest.com/client/documents")
+
+    Args:
+        pool_maxsize (int): Connections to keep alive per host (default: CLEAN_HTTP_POOL_MAXSIZE or 10)
+        pool_connections (int): Host pools to cache per session (default: CLEAN_HTTP_POOL_CONNECTIONS or 10)
+    """
+
+    def __init__(
+        self,
+        pool_maxsize: int = CLEAN_HTTP_POOL_MAXSIZE,
+        pool_connections: int = CLEAN_HTTP_POOL_CONNECTIONS,
+    ):
+        """Initialize a new instance."""
+        self.pool_maxsize = pool_maxsize
+        self.pool_connections = pool_connections
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def configure(
+        self,
+        pool_maxsize: Optional[int] = None,
+        pool_connections: Optional[int] = None,
+    ):
+        """Change pool sizes. Existing sessions are closed and rebuilt on next use.
+
+        Args:
+            pool_maxsize (int): Connections to keep alive per host
+            pool_connections (int): Host pools to cache per session
+        """
+        with self._lock:
+            if pool_maxsize is not None:
+                self.pool_maxsize = pool_maxsize
+            if pool_connections is not None:
+                self.pool_connections = pool_connections
+            self._close_all()
+
+    def get(self, url: str) -> requests.Session:
+        """Return the shared session for the host of the provided URL.
+
+        Args:
+            url (str): Any URL on the host
+
+        Returns: A requests.Session with a keep-alive connection pool
+        """
+        parsed = urlparse(url)
+        key = f"{parsed.scheme}://{parsed.netloc}".lower()
+        with self._lock:
+            if self._pid != os.getpid():
+                # We're in a forked child; the parent's sockets aren't ours
+                self._sessions = {}
+                self._pid = os.getpid()
+            session = self._sessions.get(key)
+            if session is None:
+                logger.debug(f"Opening HTTP session for {key}")
+                session = self._new_session()
+                self._sessions[key] = session
+            return session
+
+    def close(self):
+        """Close every session and its pooled connections."""
+        with self._lock:
+            self._close_all()
+
+    def _close_all(self):
+        for session in self._sessions.values():
+            session.close()
+        self._sessions = {}
+
+    def _new_session(self) -> requests.Session:
+        session = PooledSession()
+        adapter = PooledAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+
+registry = SessionRegistry()
+
+
+def get_session(url: str) -> requests.Session:
+    """Return the process-wide keep-alive session for the host of the provided URL."""
+    return registry.get(url)
@@ -0,0 +1,259 @@
+import abc
+import io
+import json
+import logging
+import os
+import sqlite3
+import textwrap
+from pathlib import Path
+from typing import IO, Dict, List, Optional, Type, Union
+
+from . import compression as compression_module
+from .records import MetadataRecord
+from .utils import create_directory, write_dict_rows_to_csv
+
+logger = logging.getLogger(__name__)
+
+# Suffix for an export that's still being written
+PART_SUFFIX = ".part"
+
+# Suffix the records of a failed scrape are kept under, beside the previous export
+FAILED_SUFFIX = ".failed"
+
+# Records written to CSV and SQLite sinks per batch
+BATCH_SIZE = 500
+
+# MetadataDict fields, in the order CSV columns are written
+CSV_FIELDS = ["asset_url", "case_id", "name", "title", "parent_page", "details"]
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    position INTEGER PRIMARY KEY,
+    asset_url TEXT,
+    case_id TEXT,
+    name TEXT,
+    record TEXT NOT NULL
+);
+"""
+
+
+class Sink(abc.ABC):
+    """Somewhere to save a scrape's metadata records as they're found.
+
+    Records go to ``<path>.part`` as they're written, and the file is only
+    renamed to ``path`` once the block finishes cleanly, so the previous
+    export stays in place until the new one is complete. If the scrape
+    fails, the records gathered so far are moved to ``<path>.failed``,
+    leaving the previous export untouched. The next successful scrape
+    removes that file.
+
+    Example: ::
+
+        with JsonLinesSink(data_dir / "ca_san_diego_pd.jsonl") as sink:
+            for record in site.iter_meta():
+                sink.write(record)
+
+    Args:
+        path (Path): Where the finished export goes
+        codec (str): Compress the file with "gzip" or "zstd", if the format allows it (default: None)
+    """
+
+    suffix = ".json"
+    compressible = False
+
+    def __init__(self, path: Path, codec: Optional[str] = None):
+        """Initialize a new instance."""
+        self.path = Path(path)
+        self.codec = codec if self.compressible else None
+        self.part_path = self.path.with_name(self.path.name + PART_SUFFIX)
+        self.failed_path = self.path.with_name(self.path.name + FAILED_SUFFIX)
+        self.count = 0
+
+    def __enter__(self) -> "Sink":
+        """Start a fresh partial file."""
+        create_directory(self.part_path, is_file=True)
+        self.part_path.unlink(missing_ok=True)
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        """Move the finished export into place, or set aside what a failed scrape found."""
+        try:
+            self.close()
+        except BaseException:
+            self._keep_failed()
+            raise
+        if exc is None:
+            os.replace(self.part_path, self.path)
+            self.failed_path.unlink(missing_ok=True)
+        else:
+            self._keep_failed()
+        return False
+
+    def _keep_failed(self):
+        """Move the partial file out of the way of the previous export."""
+        if not self.part_path.exists():
+            return
+        os.replace(self.part_path, self.failed_path)
+        logger.warning(
+            f"Scrape failed; kept the previous export and saved the {self.count:,} "
+            f"records found to {self.failed_path}"
+        )
+
+    def write(self, record: Union[dict, MetadataRecord]):
+        """Save one record, either a dict or a :class:`clean.records.MetadataRecord`."""
+        if isinstance(record, MetadataRecord):
+            record = record.to_dict()
+        self.count += 1
+        self.add(record)
+
+    @abc.abstractmethod
+    def open(self):
+        """Prepare the partial file for records."""
+
+    @abc.abstractmethod
+    def add(self, record: dict):
+        """Save one record to the partial file."""
+
+    @abc.abstractmethod
+    def close(self):
+        """Flush and close the partial file, leaving it valid."""
+
+
+class TextSink(Sink):
+    """A sink that writes UTF-8 text, compressed if a codec was provided."""
+
+    compressible = True
+
+    def open(self):
+        """Open the partial file."""
+        raw = compression_module.open_write(self.part_path, self.codec)
+        self._fh: IO[str] = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+
+    def close(self):
+        """Close the file."""
+        self._fh.close()
+
+
+class JsonSink(TextSink):
+    """Save records as a JSON list, formatted the way ``json.dump(records, indent=4)`` would."""
+
+    suffix = ".json"
+
+    def add(self, record: dict):
+        """Append a record to the list."""
+        self._fh.write(",\n" if self.count > 1 else "[\n")
+        self._fh.write(textwrap.indent(json.dumps(record, indent=4), "    "))
+
+    def close(self):
+        """Close the list."""
+        self._fh.write("\n]" if self.count else "[]")
+        super().close()
+
+
+class JsonLinesSink(TextSink):
+    """Save records as JSON Lines, flushed as they're written so others can follow along."""
+
+    suffix = ".jsonl"
+
+    def add(self, record: dict):
+        """Write a record on its own line."""
+        self._fh.write(json.dumps(record) + "\n")
+        self._fh.flush()
+
+
+class CsvSink(Sink):
+    """Save records as CSV, one column per :class:`clean.utils.MetadataDict` field.
+
+    Nested ``details`` are stored as JSON text. Other fields are dropped.
+    """
+
+    suffix = ".csv"
+
+    def open(self):
+        """Write the header row."""
+        self._batch: List[dict] = []
+        write_dict_rows_to_csv(self.part_path, CSV_FIELDS, [])
+
+    def add(self, record: dict):
+        """Queue a row, writing the queue once it's a full batch."""
+        row = dict(record)
+        if "details" in row:
+            row["details"] = json.dumps(row["details"])
+        self._batch.append(row)
+        if len(self._batch) >= BATCH_SIZE:
+            self._flush()
+
+    def close(self):
+        """Write the remaining rows."""
+        self._flush()
+
+    def _flush(self):
+        if self._batch:
+            write_dict_rows_to_csv(
+                self.part_path, CSV_FIELDS, self._batch, "a", extrasaction="ignore"
+            )
+            self._batch = []
+
+
+class SqliteSink(Sink):
+    """Save records to a SQLite ``records`` table, committed a batch at a time.
+
+    Each row holds the record as JSON, plus its asset URL, case ID and name
+    in their own columns for querying.
+    """
+
+    suffix = ".sqlite3"
+
+    def open(self):
+        """Create the database and its table."""
+        self._conn = sqlite3.connect(self.part_path)
+        self._conn.executescript(SQLITE_SCHEMA)
+
+    def add(self, record: dict):
+        """Insert a record, committing every batch."""
+        self._conn.execute(
+            "INSERT INTO records VALUES (?, ?, ?, ?, ?)",
+            (
+                self.count,
+                record.get("asset_url"),
+                record.get("case_id"),
+                record.get("name"),
+                json.dumps(record),
+            ),
+        )
+        if self.count % BATCH_SIZE == 0:
+            self._conn.commit()
+
+    def close(self):
+        """Commit and close the database."""
+        self._conn.commit()
+        self._conn.close()
+
+
+SINKS: Dict[str, Type[Sink]] = {
+    "json": JsonSink,
+    "jsonl": JsonLinesSink,
+    "csv": CsvSink,
+    "sqlite": SqliteSink,
+}
+
+
+def sink_for(export_format: str, path: Path, codec: Optional[str] = None) -> Sink:
+    """Return a sink for the format, saving to ``path`` with the format's suffix.
+
+    Args:
+        export_format (str): "json", "jsonl", "csv" or "sqlite"
+        path (Path): The export's path; its suffix is replaced, e.g. ca_san_diego_pd.json becomes ca_san_diego_pd.csv
+        codec (str): Compression for formats that allow it (default: None)
+    """
+    sink_class = SINKS[export_format]
+    return sink_class(Path(path).with_suffix(sink_class.suffix), codec)
+
+
+def format_for(path: Path) -> Optional[str]:
+    """Return the export format a file's suffix belongs to, if any."""
+    for export_format, sink_class in SINKS.items():
+        if Path(path).suffix == sink_class.suffix:
+            return export_format
+    return None
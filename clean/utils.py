@@ -1,20 +1,19 @@
 import csv
-import importlib
+import fnmatch
 import json
 import logging
 import os
 from pathlib import Path
-from time import sleep
 from typing import List, Literal, Optional, TypedDict
 from urllib.parse import parse_qs, urlparse
 
-import requests
-import us  # type: ignore
-from dotenv import load_dotenv
-from pytube import Playlist, YouTube  # type: ignore
-from retry import retry
 from typing_extensions import NotRequired
-from yt_dlp import YoutubeDL
+
+from .profiling import phase
+from .ratelimit import limiter
+from .registry import SCRAPERS
+from .retries import default_policy
+from .sessions import get_session
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +30,7 @@ CLEAN_ASSETS_DIR = CLEAN_OUTPUT_DIR / "assets"
 CLEAN_CACHE_DIR = CLEAN_OUTPUT_DIR / "cache"
 CLEAN_DATA_DIR = CLEAN_OUTPUT_DIR / "exports"
 CLEAN_LOG_DIR = CLEAN_OUTPUT_DIR / "logs"
+CLEAN_PROFILE_DIR = CLEAN_OUTPUT_DIR / "profiles"
 
 
 class MetadataDict(TypedDict):
@@ -77,13 +77,13 @@ def fetch_if_not_cached(filename, url, throttle=0, **kwargs):
     create_directory(Path(filename), is_file=True)
     if not os.path.exists(filename):
         logger.debug(f"Fetching {filename} from {url}")
-        response = requests.get(url, **kwargs)
+        limiter.throttle(url, throttle)  # Pause between requests
+        response = get_session(url).get(url, **kwargs)
         if not response.ok:
             logger.error(f"Failed to fetch {url} to {filename}")
         else:
             with open(filename, "wb") as outfile:
                 outfile.write(response.content)
-        sleep(throttle)  # Pause between requests
     return
 
 
@@ -96,7 +96,8 @@ def save_if_good_url(filename, url, **kwargs):
     Notes: Should this even be in utils vs. cache? Should it exist?
     """
     create_directory(Path(filename), is_file=True)
-    response = requests.get(url, **kwargs)
+    limiter.throttle(url, 2)  # At most one request every two seconds to the host
+    response = get_session(url).get(url, **kwargs)
     if not response.ok:
         logger.error(f"URL {url} fetch failed with {response.status_code}")
         logger.error(f"Not saving to {filename}. Is a new year's URL not started?")
@@ -107,7 +108,6 @@ def save_if_good_url(filename, url, **kwargs):
             outfile.write(response.content)
             success_flag = True
             content = response.content
-    sleep(2)  # Pause between requests
     return success_flag, content
 
 
@@ -159,34 +159,51 @@ def write_dict_rows_to_csv(
 def get_all_scrapers():
     """Get all the agencies that have scrapers.
 
-    Returns: List of dicts containing agency slug and name
+    Reads the generated registry, so no scraper code is imported. Run
+    ``scripts/build_registry.py`` after adding a scraper to list it here.
+
+    Returns: Dict keyed by state postal code of lists of dicts containing the agency slug, name, module and platform
     """
-    # Get all folders in dir
-    folders = [p for p in Path(__file__).parent.iterdir() if p.is_dir()]
-    # Filter out anything not in a state folder
-    abbrevs = [state.abbr.lower() for state in us.states.STATES]
-    state_folders = [p for p in folders if p.stem in abbrevs]
-    scrapers = {}
-    unwanted_files = [
-        ".mypy_cache",
-        "config",
-    ]
-
-    for state_folder in state_folders:
-        state = state_folder.stem
-        for mod_path in state_folder.iterdir():
-            if not (mod_path.stem.startswith("__") or mod_path.stem in unwanted_files):
-                agency_mod = importlib.import_module(f"clean.{state}.{mod_path.stem}")
-                scrapers.setdefault(state, []).append(
-                    {
-                        "slug": f"{state}_{mod_path.stem}",
-                        "agency": agency_mod.Site.name,
-                    }
-                )
+    scrapers: dict = {}
+    for record in SCRAPERS:
+        scrapers.setdefault(record["state"], []).append(dict(record))
     return scrapers
 
 
-@retry(tries=3, delay=15, backoff=2)
+def match_scrapers(patterns: List[str]) -> List[str]:
+    """Expand agency slugs and glob patterns into a list of scraper slugs.
+
+    Plain slugs are passed through untouched, so a typo still surfaces as an
+    error when the scraper is run. Patterns containing glob characters
+    (e.g. ``ca_*_pd``) are matched against every available scraper.
+
+    Args:
+        patterns (list): Agency slugs or glob patterns (e.g. ['ca_san_diego_pd', 'ca_*_sheriff'])
+
+    Returns: De-duplicated list of agency slugs, in the order they were matched
+    """
+    slugs: List[str] = []
+    available = None
+    for pattern in patterns:
+        pattern = pattern.strip().lower()
+        if not any(char in pattern for char in "*?["):
+            matches = [pattern]
+        else:
+            if available is None:
+                available = sorted(
+                    record["slug"]
+                    for agencies in get_all_scrapers().values()
+                    for record in agencies
+                )
+            matches = fnmatch.filter(available, pattern)
+            if not matches:
+                logger.warning(f"No agencies match {pattern}")
+        for slug in matches:
+            if slug not in slugs:
+                slugs.append(slug)
+    return slugs
+
+
 def get_url(
     url, user_agent="Big Local News (biglocalnews.org)", session=None, **kwargs
 ):
@@ -204,12 +221,13 @@ def get_url(
         kwargs["headers"] = {}
     kwargs["headers"]["User-Agent"] = user_agent
 
-    # Go get it
+    # Go get it, retrying transient failures
     if session is not None:
         logger.debug(f"Requesting with session {session}")
-        response = session.get(url, **kwargs)
     else:
-        response = requests.get(url, **kwargs)
+        session = get_session(url)
+    with phase("fetch"):
+        response = default_policy.call(lambda: session.get(url, **kwargs), url)
     logger.debug(f"Response code: {response.status_code}")
 
     # Verify that the response is 200
@@ -225,6 +243,9 @@ def get_youtube_url(url: str) -> List[str]:
     Args:
         url (str): The URL of the video or playlist to download
     """
+    # The YouTube libraries are slow to import, so only load them when needed
+    from pytube import Playlist, YouTube  # type: ignore
+
     logger.debug(f"Requesting YouTube {url}")
     stream_urls = []
 
@@ -282,6 +303,8 @@ def get_credentials(keyname: str, return_error="") -> str:
     Returns:
         return_error (default empty string): What to return if keyname is not in any credentials
     """
+    from dotenv import load_dotenv
+
     # Load environment variables from the .env file
     load_dotenv(os.path.join("env", ".env"))
 
@@ -327,7 +350,6 @@ def get_repeated_asset_url(self, objects: List[MetadataDict]):
     return repeated_urls
 
 
-@retry(tries=3, delay=15, backoff=2)
 def post_url(
     url, user_agent="Big Local News (biglocalnews.org)", session=None, **kwargs
 ):
@@ -345,12 +367,13 @@ def post_url(
         kwargs["headers"] = {}
     kwargs["headers"]["User-Agent"] = user_agent
 
-    # Go get it
+    # Go get it, retrying transient failures
     if session is not None:
         logger.debug(f"Requesting with session {session}")
-        response = session.post(url, **kwargs)
     else:
-        response = requests.post(url, **kwargs)
+        session = get_session(url)
+    with phase("fetch"):
+        response = default_policy.call(lambda: session.post(url, **kwargs), url)
     logger.debug(f"Response code: {response.status_code}")
 
     # Verify that the response is 200
@@ -360,7 +383,6 @@ def post_url(
     return response
 
 
-@retry(tries=3, delay=15, backoff=2)
 def get_cookies(url, user_agent="Big Local News (biglocalnews.org)", **kwargs):
     """Request the provided URL and return cookie object.
 
@@ -374,7 +396,9 @@ def get_cookies(url, user_agent="Big Local News (biglocalnews.org)", **kwargs):
     if "headers" not in kwargs:
         kwargs["headers"] = {}
     kwargs["headers"]["User-Agent"] = user_agent
-    response = requests.get(url, **kwargs)
+    session = get_session(url)
+    with phase("fetch"):
+        response = default_policy.call(lambda: session.get(url, **kwargs), url)
 
     # Verify that the response is 200
     assert response.ok
@@ -391,6 +415,8 @@ def get_youtube_url_with_metadata(url: str) -> List[dict]:
     Args:
         url (str): The URL of the video or playlist to download
     """
+    from yt_dlp import YoutubeDL
+
     logger.debug(f"Requesting YouTube {url}")
     video_info_list = []
     cookie_file_path = os.path.join(os.getcwd(), "env", "youtube_cookie.txt")
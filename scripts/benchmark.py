@@ -0,0 +1,277 @@
+"""Benchmark each agency's scrape_meta against recorded HTTP traffic.
+
+Every scraper runs against a vcrpy cassette in tests/cassettes/benchmarks/,
+named after its slug, with a fresh cache and data directory, so runs are
+repeatable and never touch the network. For each agency the benchmark
+reports wall time, CPU time, HTTP requests issued, time spent building
+BeautifulSoup trees and peak Python memory.
+
+With --parity, each agency runs once per installed HTML parser backend,
+and the run fails if their exports differ.
+
+Usage:
+
+    python scripts/benchmark.py                      # every agency with a cassette
+    python scripts/benchmark.py ca_san_diego_pd      # one agency
+    python scripts/benchmark.py --json results.json  # also save the numbers
+    python scripts/benchmark.py --parser lxml        # parse with lxml
+    python scripts/benchmark.py --parity             # compare every parser's output
+    python scripts/benchmark.py ca_napa_pd --record  # record a missing cassette
+
+Recording needs network access and runs the real scrape once. Naming an
+agency without a cassette, or finding no cassettes at all, is an error
+rather than an empty benchmark.
+"""
+
+import argparse
+import hashlib
+import importlib
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, TypedDict
+from unittest.mock import patch
+
+import vcr  # type: ignore
+from bs4 import BeautifulSoup
+
+from clean.parsing import available_parsers, resolve_parser, use_parser
+from clean.ratelimit import limiter
+from clean.registry import SCRAPERS
+from clean.sessions import PooledAdapter, registry
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+CASSETTE_DIR = ROOT_DIR / "tests" / "cassettes" / "benchmarks"
+
+# Headers that shouldn't end up in a committed cassette
+FILTER_HEADERS = ["authorization", "cookie", "set-cookie", "x-api-key"]
+
+
+class BenchmarkResult(TypedDict):
+    name: str
+    parser: str
+    wall_time: float
+    cpu_time: float
+    requests: int
+    parse_time: float
+    peak_memory: int
+    checksum: Optional[str]
+    error: Optional[str]
+
+
+def make_vcr(cassette_dir: Path = CASSETTE_DIR, record: bool = False) -> vcr.VCR:
+    """Return a VCR that replays cassettes and, unless recording, refuses new requests."""
+    return vcr.VCR(
+        cassette_library_dir=str(cassette_dir),
+        record_mode="once" if record else "none",
+        match_on=["method", "scheme", "host", "port", "path", "query"],
+        filter_headers=FILTER_HEADERS,
+        decode_compressed_response=True,
+    )
+
+
+@contextmanager
+def _instrument(counts: dict) -> Iterator[None]:
+    """Count HTTP requests and time BeautifulSoup parsing while active."""
+    send = PooledAdapter.send
+    init = BeautifulSoup.__init__
+
+    def counting_send(adapter, request, **kwargs):
+        counts["requests"] += 1
+        return send(adapter, request, **kwargs)
+
+    def timed_init(soup, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            init(soup, *args, **kwargs)
+        finally:
+            counts["parse_time"] += time.perf_counter() - start
+
+    with patch.object(PooledAdapter, "send", counting_send), patch.object(
+        BeautifulSoup, "__init__", timed_init
+    ):
+        yield
+
+
+def measure(
+    name: str,
+    func: Callable[[], object],
+    cassette: Path,
+    record: bool = False,
+    parser: Optional[str] = None,
+    workdir: Optional[Path] = None,
+) -> BenchmarkResult:
+    """Run ``func`` against a cassette and measure it.
+
+    Args:
+        name (str): Label for the result, usually the agency slug
+        func (callable): The work to measure
+        cassette (Path): The cassette to replay, or record into
+        record (bool): Record missing requests rather than fail on them (default: False)
+        parser (str): HTML parser backend to use (default: the configured one)
+        workdir (Path): Throwaway folder the run writes to, left out of the checksum (default: None)
+
+    Returns: Timings, counts and a checksum of what ``func`` returned. A failed run reports its error rather than raising.
+    """
+    counts = {"requests": 0, "parse_time": 0.0}
+    parser_used = resolve_parser(parser)
+    checksum = None
+    error = None
+    # Throttles only slow down a replay, so turn them all off
+    limiter.reset()
+    # Pools opened before the cassette was loaded would bypass it
+    registry.close()
+    tracemalloc.start()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        recorder = make_vcr(cassette.parent, record)
+        with use_parser(parser), recorder.use_cassette(cassette.name), _instrument(
+            counts
+        ):
+            output = func()
+        checksum = _checksum(output, workdir)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        cpu_time = time.process_time() - cpu_start
+        wall_time = time.perf_counter() - wall_start
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        registry.close()
+    return {
+        "name": name,
+        "parser": parser_used,
+        "wall_time": wall_time,
+        "cpu_time": cpu_time,
+        "requests": counts["requests"],
+        "parse_time": counts["parse_time"],
+        "peak_memory": peak_memory,
+        "checksum": checksum,
+        "error": error,
+    }
+
+
+def benchmark_agency(
+    slug: str,
+    cassette_dir: Path = CASSETTE_DIR,
+    record: bool = False,
+    parser: Optional[str] = None,
+) -> BenchmarkResult:
+    """Run one agency's scrape_meta against its cassette, in throwaway directories."""
+    record_info = next(s for s in SCRAPERS if s["slug"] == slug)
+    site_class = importlib.import_module(record_info["module"]).Site
+    with tempfile.TemporaryDirectory() as workdir:
+        data_dir = Path(workdir) / "exports"
+        cache_dir = Path(workdir) / "cache"
+        data_dir.mkdir()
+        cache_dir.mkdir()
+        site = site_class(data_dir, cache_dir)
+        return measure(
+            slug,
+            lambda: site.scrape_meta(throttle=0),
+            cassette_dir / f"{slug}.yaml",
+            record,
+            parser,
+            Path(workdir),
+        )
+
+
+def find_mismatches(results: List[BenchmarkResult]) -> List[str]:
+    """Return the agencies whose parser backends produced different exports."""
+    checksums: Dict[str, set] = {}
+    for r in results:
+        checksums.setdefault(r["name"], set()).add(r["checksum"])
+    return [name for name, found in checksums.items() if len(found) > 1]
+
+
+def format_results(results: List[BenchmarkResult]) -> str:
+    """Lay out results as a plain-text table."""
+    header = f"{'agency':<45} {'parser':<11} {'wall s':>8} {'cpu s':>8} {'reqs':>6} {'parse s':>8} {'peak MB':>8}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        line = (
+            f"{r['name']:<45} {r['parser']:<11} {r['wall_time']:>8.2f} {r['cpu_time']:>8.2f} "
+            f"{r['requests']:>6} {r['parse_time']:>8.2f} {r['peak_memory'] / 2**20:>8.1f}"
+        )
+        if r["error"]:
+            line += f"  FAILED {r['error']}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("agencies", nargs="*", help="Agency slugs (default: all)")
+    parser.add_argument(
+        "--record", action="store_true", help="Record cassettes that don't exist yet"
+    )
+    parser.add_argument("--json", type=Path, help="Also write the results here")
+    parser.add_argument(
+        "--parser", help="HTML parser backend, e.g. lxml (default: fastest installed)"
+    )
+    parser.add_argument(
+        "--parity",
+        action="store_true",
+        help="Run with every installed parser and fail if their exports differ",
+    )
+    args = parser.parse_args(argv)
+
+    slugs = args.agencies or [s["slug"] for s in SCRAPERS]
+    backends = available_parsers() if args.parity else [args.parser]
+    if not args.record:
+        missing = [s for s in slugs if not (CASSETTE_DIR / f"{s}.yaml").exists()]
+        if args.agencies and missing:
+            print(
+                f"No cassette for {', '.join(missing)} in {CASSETTE_DIR}; "
+                "record one with --record",
+                file=sys.stderr,
+            )
+            return 2
+        if len(missing) == len(slugs):
+            print(
+                f"No benchmark cassettes in {CASSETTE_DIR}; "
+                "record them with --record (see its README)",
+                file=sys.stderr,
+            )
+            return 2
+        for slug in missing:
+            print(f"Skipping {slug}: no cassette", file=sys.stderr)
+        slugs = [s for s in slugs if s not in missing]
+    results = []
+    for slug in slugs:
+        for backend in backends:
+            results.append(benchmark_agency(slug, record=args.record, parser=backend))
+
+    print(format_results(results))
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    mismatches = find_mismatches(results) if args.parity else []
+    for name in mismatches:
+        print(f"{name}: parsers produced different exports", file=sys.stderr)
+    return 1 if mismatches or any(r["error"] for r in results) else 0
+
+
+def _checksum(output: object, workdir: Optional[Path] = None) -> str:
+    """Hash a run's output: the file's contents if it returned a path.
+
+    Exports can hold paths into the run's cache, so the throwaway folder is
+    cut out of them first to keep runs with different parsers comparable.
+    """
+    if isinstance(output, Path) and output.is_file():
+        data = output.read_bytes()
+    else:
+        data = json.dumps(output, sort_keys=True, default=str).encode("utf-8")
+    if workdir is not None:
+        # Strip the JSON-escaped spelling too, for Windows backslashes
+        for prefix in (json.dumps(str(workdir))[1:-1], str(workdir)):
+            data = data.replace(prefix.encode("utf-8"), b"")
+    return hashlib.sha256(data).hexdigest()
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,131 @@
+"""Regenerate clean/registry.py from the scraper modules.
+
+Reads each agency module's source rather than importing it, so a scraper with
+a broken import still gets listed.
+
+Usage:
+
+    python scripts/build_registry.py          # rewrite clean/registry.py
+    python scripts/build_registry.py --check  # exit 1 if it's out of date
+"""
+
+import ast
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+import us  # type: ignore
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent / "clean"
+REGISTRY_PATH = PACKAGE_DIR / "registry.py"
+
+# Folders inside a state directory that hold helpers rather than scrapers
+UNWANTED_FILES = [".mypy_cache", "config"]
+
+HEADER = '''"""Every agency scraper, readable without importing the scrapers themselves.
+
+Generated by scripts/build_registry.py from the Site classes in clean/<state>/.
+Don't edit it by hand; rerun the script after adding or renaming a scraper.
+"""
+
+from typing import List, Optional, TypedDict
+
+
+class ScraperInfo(TypedDict):
+    slug: str
+    state: str
+    agency: str
+    module: str
+    platform: Optional[str]
+
+
+SCRAPERS: List[ScraperInfo] = [
+'''
+
+
+def discover(package_dir: Path = PACKAGE_DIR) -> List[dict]:
+    """Find every scraper module under the package and describe it.
+
+    Returns: Scraper records sorted by slug
+    """
+    abbrevs = {state.abbr.lower() for state in us.states.STATES}
+    scrapers = []
+    for state_dir in sorted(package_dir.iterdir()):
+        if not (state_dir.is_dir() and state_dir.name in abbrevs):
+            continue
+        state = state_dir.name
+        for mod_path in sorted(state_dir.glob("*.py")):
+            if mod_path.stem.startswith("__") or mod_path.stem in UNWANTED_FILES:
+                continue
+            tree = ast.parse(mod_path.read_text(encoding="utf-8"), str(mod_path))
+            scrapers.append(
+                {
+                    "slug": f"{state}_{mod_path.stem}",
+                    "state": state,
+                    "agency": _site_name(tree, mod_path),
+                    "module": f"clean.{state}.{mod_path.stem}",
+                    "platform": _platform(tree),
+                }
+            )
+    return sorted(scrapers, key=lambda s: s["slug"])
+
+
+def render(scrapers: List[dict]) -> str:
+    """Return the source of clean/registry.py for the provided scrapers."""
+    lines = [HEADER]
+    for scraper in scrapers:
+        lines.append("    {\n")
+        for key, value in scraper.items():
+            literal = "None" if value is None else json.dumps(value, ensure_ascii=False)
+            lines.append(f'        "{key}": {literal},\n')
+        lines.append("    },\n")
+    lines.append("]\n")
+    return "".join(lines)
+
+
+def _site_name(tree: ast.Module, mod_path: Path) -> str:
+    """Read the literal ``name`` attribute of the module's Site class."""
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == "Site":
+            for stmt in node.body:
+                if (
+                    isinstance(stmt, ast.Assign)
+                    and any(
+                        isinstance(t, ast.Name) and t.id == "name" for t in stmt.targets
+                    )
+                    and isinstance(stmt.value, ast.Constant)
+                    and isinstance(stmt.value.value, str)
+                ):
+                    return stmt.value.value
+    raise ValueError(f"{mod_path} has no Site class with a literal name")
+
+
+def _platform(tree: ast.Module) -> Optional[str]:
+    """Return the shared platform a scraper is built on, if any."""
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.module:
+            parts = node.module.split(".")
+            if "platforms" in parts[:-1]:
+                return parts[parts.index("platforms") + 1]
+            if parts[-1] == "platforms" and node.names:
+                return node.names[0].name
+    return None
+
+
+def main(argv: List[str]) -> int:
+    scrapers = discover()
+    source = render(scrapers)
+    if "--check" in argv:
+        current = REGISTRY_PATH.read_text(encoding="utf-8")
+        if current != source:
+            print(f"{REGISTRY_PATH} is out of date; run scripts/build_registry.py")
+            return 1
+        return 0
+    REGISTRY_PATH.write_text(source, encoding="utf-8")
+    print(f"Wrote {len(scrapers)} scrapers to {REGISTRY_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
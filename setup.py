@@ -73,6 +73,7 @@ setup(
         clean-scraper=clean.cli:cli
     """,
     install_requires=parse_requirements("requirements.txt"),
+    extras_require={"lxml": ["lxml"], "zstd": ["zstandard"]},
     license="Apache 2.0 license",
     zip_safe=False,
     classifiers=[
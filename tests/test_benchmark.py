@@ -0,0 +1,108 @@
+import importlib.util
+from pathlib import Path
+
+from clean import utils
+from clean.parsing import make_soup
+
+SCRIPT_PATH = Path(__file__).parent.parent / "scripts" / "benchmark.py"
+
+CASSETTE = """interactions:
+- request:
+    body: null
+    headers: {}
+    method: GET
+    uri: https://agency.example.com/releases
+  response:
+    body:
+      string: '<html><a href="/video.mp4">Video</a></html>'
+    headers:
+      Content-Type:
+      - text/html
+    status:
+      code: 200
+      message: OK
+version: 1
+"""
+
+
+def _benchmark():
+    spec = importlib.util.spec_from_file_location("benchmark", SCRIPT_PATH)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _scrape():
+    response = utils.get_url("https://agency.example.com/releases")
+    soup = make_soup(response.text)
+    return [a["href"] for a in soup.find_all("a")]
+
+
+def test_measure_replays_cassette(tmp_path):
+    """A replayed scrape reports its requests, parse time and memory."""
+    cassette = tmp_path / "agency.yaml"
+    cassette.write_text(CASSETTE)
+    result = _benchmark().measure("agency", _scrape, cassette)
+    assert result["error"] is None
+    assert result["requests"] == 1
+    assert result["parse_time"] > 0
+    assert result["peak_memory"] > 0
+    assert result["wall_time"] >= result["parse_time"]
+
+
+def test_measure_reports_unrecorded_requests(tmp_path):
+    """Requests missing from the cassette fail the run rather than hit the network."""
+    cassette = tmp_path / "agency.yaml"
+    cassette.write_text(CASSETTE.replace("/releases", "/other"))
+    benchmark = _benchmark()
+    result = benchmark.measure("agency", _scrape, cassette)
+    assert result["error"] is not None
+    assert "agency" in benchmark.format_results([result])
+
+
+def test_parity(tmp_path):
+    """Runs with different parsers are labelled, and matching output is no mismatch."""
+    cassette = tmp_path / "agency.yaml"
+    cassette.write_text(CASSETTE)
+    benchmark = _benchmark()
+    results = [
+        benchmark.measure("agency", _scrape, cassette, parser=parser)
+        for parser in ("html.parser", "html5lib")
+    ]
+    assert [r["parser"] for r in results] == ["html.parser", "html5lib"]
+    assert results[0]["checksum"] == results[1]["checksum"]
+    assert benchmark.find_mismatches(results) == []
+    results[1]["checksum"] = "different"
+    assert benchmark.find_mismatches(results) == ["agency"]
+
+
+def test_committed_cassette_replays():
+    """The cassette shipped with the repo benchmarks San Diego without the network."""
+    benchmark = _benchmark()
+    result = benchmark.benchmark_agency("ca_san_diego_pd")
+    assert result["error"] is None
+    assert result["requests"] == 5
+    assert result["checksum"] is not None
+    assert benchmark.main(["ca_san_diego_pd"]) == 0
+
+
+def test_parity_ignores_cache_paths():
+    """Exports holding paths into each run's own cache still match across parsers."""
+    benchmark = _benchmark()
+    results = [
+        benchmark.benchmark_agency("ca_san_diego_pd", parser=parser)
+        for parser in ("html.parser", "html5lib")
+    ]
+    assert all(r["error"] is None for r in results)
+    assert benchmark.find_mismatches(results) == []
+
+
+def test_missing_cassettes_fail(tmp_path, monkeypatch, capsys):
+    """Asking for agencies without cassettes is an error, not an empty table."""
+    benchmark = _benchmark()
+    monkeypatch.setattr(benchmark, "CASSETTE_DIR", tmp_path)
+    assert benchmark.main(["ca_san_diego_pd"]) == 2
+    assert "No cassette for ca_san_diego_pd" in capsys.readouterr().err
+    assert benchmark.main([]) == 2
+    assert "No benchmark cassettes" in capsys.readouterr().err
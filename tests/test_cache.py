@@ -1,6 +1,14 @@
+import gzip
+import hashlib
+import http.server
+import sqlite3
+import threading
+from contextlib import nullcontext
+from pathlib import Path
 from unittest.mock import patch
 
 import pytest
+import requests
 
 from clean.cache import Cache
 
@@ -66,3 +74,307 @@ def test_download_with_additional_args(mock_get_url, cache):
     mock_get_url.assert_called_once_with(
         "http://example.com", stream=True, headers={"User-Agent": "Mozilla/5.0"}
     )
+
+
+@patch("clean.cache.get_url")
+def test_download_failure_leaves_no_partial_file(mock_get_url, cache):
+    def broken_stream(chunk_size):
+        yield b"first chunk"
+        raise ConnectionError("dropped")
+
+    response = mock_get_url.return_value.__enter__.return_value
+    response.iter_content.side_effect = broken_stream
+
+    with pytest.raises(ConnectionError):
+        cache.download("video.mp4", "http://example.com/video.mp4")
+
+    assert not (cache.path / "video.mp4").exists()
+    assert list(cache.path.iterdir()) == []
+
+
+class FakeResponse:
+    """Just enough of a streamed requests.Response for Cache.download."""
+
+    def __init__(self, body, status_code=200, headers=None, fail_after=None):
+        self.body = body
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.fail_after = fail_after
+        self.encoding = None
+
+    def iter_content(self, chunk_size):
+        sent = 0
+        for i in range(0, len(self.body), 4):
+            if self.fail_after is not None and sent >= self.fail_after:
+                raise requests.exceptions.ChunkedEncodingError("connection dropped")
+            chunk = self.body[i : i + 4]
+            sent += len(chunk)
+            yield chunk
+
+
+@patch("clean.cache.get_url")
+def test_download_resumes_with_range(mock_get_url, cache):
+    body = b"0123456789abcdef"
+    validators = {"Content-Length": "16", "ETag": '"v1"'}
+    mock_get_url.side_effect = [
+        nullcontext(FakeResponse(body, headers=validators, fail_after=8)),
+        nullcontext(
+            FakeResponse(
+                body[8:],
+                status_code=206,
+                headers={"Content-Range": "bytes 8-15/16", "ETag": '"v1"'},
+            )
+        ),
+    ]
+
+    result = cache.download("video.mp4", "http://example.com/video.mp4")
+
+    assert result.read_bytes() == body
+    resume_headers = mock_get_url.call_args_list[1].kwargs["headers"]
+    assert resume_headers["Range"] == "bytes=8-"
+    assert resume_headers["If-Range"] == '"v1"'
+    leftovers = [p.name for p in cache.path.iterdir() if p.name.endswith(".part")]
+    assert leftovers == []
+    assert cache.lookup("video.mp4")["etag"] == '"v1"'
+
+
+def test_download_gzip_response(cache):
+    """A gzipped body is saved decoded, whatever its Content-Length says."""
+    page = b"<html>" + b"<p>Officer-involved shooting</p>" * 2000 + b"</html>"
+    body = gzip.compress(page)
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/index.html"
+        result = cache.download("ca_a/index.html", url)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert result.read_bytes() == page
+    assert cache.lookup("ca_a/index.html")["size"] == len(page)
+
+
+@patch("clean.cache.get_url")
+def test_download_restarts_when_range_ignored(mock_get_url, cache):
+    body = b"0123456789abcdef"
+    validators = {"Content-Length": "16", "Last-Modified": "Tue, 01 Oct 2024"}
+    mock_get_url.side_effect = [
+        nullcontext(FakeResponse(b"stale bytes!", headers=validators, fail_after=8)),
+        nullcontext(FakeResponse(body, headers=validators)),
+    ]
+
+    result = cache.download("video.mp4", "http://example.com/video.mp4")
+
+    assert result.read_bytes() == body
+
+
+def test_partial_downloads_are_not_cache_hits(cache):
+    (cache.path / "video.mp4.part").write_bytes(b"0123")
+    (cache.path / "video.mp4.part.json").write_text("{}")
+    assert not cache.exists("video.mp4")
+    assert not cache.exists("video.mp4.part")
+    assert cache.files() == []
+
+
+@patch("clean.cache.get_url")
+def test_force_download_revalidates(mock_get_url, cache):
+    validators = {"ETag": '"v1"', "Last-Modified": "Tue, 01 Oct 2024 00:00:00 GMT"}
+    mock_get_url.side_effect = [
+        nullcontext(FakeResponse(b"<html>index</html>", headers=validators)),
+        nullcontext(FakeResponse(b"", status_code=304)),
+    ]
+
+    path = cache.download("index.html", "http://example.com/")
+    before = path.stat().st_mtime_ns
+    cache.download("index.html", "http://example.com/", force=True)
+
+    assert path.read_bytes() == b"<html>index</html>"
+    assert path.stat().st_mtime_ns >= before
+    headers = mock_get_url.call_args_list[1].kwargs["headers"]
+    assert headers["If-None-Match"] == '"v1"'
+    assert headers["If-Modified-Since"] == "Tue, 01 Oct 2024 00:00:00 GMT"
+    assert cache.files() == [str(path)]
+
+
+@patch("clean.cache.get_url")
+def test_force_download_replaces_modified_file(mock_get_url, cache):
+    mock_get_url.side_effect = [
+        nullcontext(FakeResponse(b"old", headers={"ETag": '"v1"'})),
+        nullcontext(FakeResponse(b"new", headers={"ETag": '"v2"'})),
+        nullcontext(FakeResponse(b"", status_code=304)),
+    ]
+
+    cache.download("index.html", "http://example.com/")
+    path = cache.download("index.html", "http://example.com/", force=True)
+    cache.download("index.html", "http://example.com/", force=True)
+
+    assert path.read_bytes() == b"new"
+    headers = mock_get_url.call_args_list[2].kwargs["headers"]
+    assert headers["If-None-Match"] == '"v2"'
+
+
+@patch("clean.cache.get_url")
+def test_index_tracks_downloads_and_writes(mock_get_url, cache):
+    headers = {"Content-Type": "text/html", "ETag": '"v1"'}
+    mock_get_url.return_value = nullcontext(FakeResponse(b"<p>hi</p>", headers=headers))
+
+    cache.download("ca_agency/index.html", "http://example.com/")
+    cache.write("ca_agency/notes.txt", "hello")
+    cache.write_json("ca_other/data.json", {"a": 1})
+
+    entry = cache.lookup("ca_agency/index.html")
+    assert entry["url"] == "http://example.com/"
+    assert entry["agency"] == "ca_agency"
+    assert entry["size"] == 9
+    assert entry["content_type"] == "text/html"
+    assert entry["sha256"] == hashlib.sha256(b"<p>hi</p>").hexdigest()
+    assert [e["name"] for e in cache.lookup_url("http://example.com/")] == [
+        "ca_agency/index.html"
+    ]
+    assert [e["name"] for e in cache.entries(agency="ca_agency")] == [
+        "ca_agency/index.html",
+        "ca_agency/notes.txt",
+    ]
+    assert [e["name"] for e in cache.entries("ca_other")] == ["ca_other/data.json"]
+    assert ".index.sqlite3" not in [Path(p).name for p in cache.files()]
+
+
+def test_reindex_picks_up_untracked_files(cache):
+    (cache.path / "ca_agency").mkdir()
+    (cache.path / "ca_agency" / "old.html").write_text("old")
+    cache.write("ca_agency/gone.html", "bye")
+    (cache.path / "ca_agency" / "gone.html").unlink()
+
+    assert cache.reindex() == {"added": 1, "removed": 1}
+    assert [e["name"] for e in cache.entries()] == ["ca_agency/old.html"]
+
+
+def test_evicts_least_recently_used_unpinned_files(tmp_path):
+    cache = Cache(tmp_path, max_bytes=35)
+    cache.write("ca_a/timestamplog.json", "0123456789")
+    cache.pin("ca_a/timestamplog.json")
+    cache.write("ca_a/old.html", "0123456789")
+    cache.write("ca_a/used.html", "0123456789")
+    cache.index.touch("ca_a/old.html", 1)
+    cache.index.touch("ca_a/timestamplog.json", 1)
+    cache.read("ca_a/used.html")
+
+    # Writing a fourth file pushes the cache over budget
+    cache.write("ca_a/new.html", "0123456789")
+
+    assert not (tmp_path / "ca_a" / "old.html").exists()
+    assert cache.lookup("ca_a/old.html") is None
+    for name in ("timestamplog.json", "used.html", "new.html"):
+        assert (tmp_path / "ca_a" / name).exists()
+
+    # Pinned files survive even an impossible budget
+    assert cache.evict(0) == {"removed": 2, "freed": 20}
+    assert [e["name"] for e in cache.entries()] == ["ca_a/timestamplog.json"]
+
+
+def test_eviction_frees_headroom(tmp_path):
+    """Going over budget evicts down to 90% of it, and sizes aren't summed on every write."""
+    cache = Cache(tmp_path, max_bytes=100)
+    with patch.object(
+        cache.index, "total_size", wraps=cache.index.total_size
+    ) as total_size:
+        for i in range(10):
+            cache.write(f"ca_a/{i}.html", "0123456789")
+        assert total_size.call_count == 1
+        cache.write("ca_a/10.html", "0123456789")
+
+    assert total_size.call_count == 2
+    assert cache.index.total_size() == 90
+    assert not (tmp_path / "ca_a" / "0.html").exists()
+    assert not (tmp_path / "ca_a" / "1.html").exists()
+    assert (tmp_path / "ca_a" / "10.html").exists()
+
+
+def test_old_indexes_are_migrated(tmp_path):
+    conn = sqlite3.connect(tmp_path / ".index.sqlite3")
+    conn.execute(
+        "CREATE TABLE entries (name TEXT PRIMARY KEY, url TEXT, agency TEXT, "
+        "fetched_at REAL, size INTEGER, sha256 TEXT, content_type TEXT, etag TEXT, "
+        "last_modified TEXT)"
+    )
+    conn.execute("INSERT INTO entries (name, size) VALUES ('ca_a/page.html', 5)")
+    conn.commit()
+    conn.close()
+
+    cache = Cache(tmp_path)
+    cache.pin("ca_a/page.html")
+    assert cache.lookup("ca_a/page.html")["pinned"] == 1
+
+
+def test_parse_reuses_results_for_unchanged_pages(cache):
+    calls = []
+
+    def extract(html, prefix):
+        calls.append(html)
+        return [prefix + html]
+
+    cache.write("ca_a/page.html", "one")
+    assert cache.parse("ca_a/page.html", extract, "x:") == ["x:one"]
+    assert cache.parse("ca_a/page.html", extract, "x:") == ["x:one"]
+    assert len(calls) == 1
+
+    # New content, new arguments and a changed scraper each parse again
+    cache.write("ca_a/page.html", "two")
+    assert cache.parse("ca_a/page.html", extract, "x:") == ["x:two"]
+    assert cache.parse("ca_a/page.html", extract, "y:") == ["y:two"]
+    with patch("clean.cache.extractor_key", return_value=("extract", "v2")):
+        assert cache.parse("ca_a/page.html", extract, "y:") == ["y:two"]
+    assert len(calls) == 4
+    assert cache.reindex() == {"added": 0, "removed": 0}
+
+
+def test_parse_keys_on_backend_regions_and_relative_page(tmp_path):
+    """Results are reparsed for another backend or regions, and survive a moved cache."""
+    from clean.parsing import use_parser
+
+    class Scraper:
+        page_regions = ("div.a",)
+
+        def __init__(self):
+            self.calls = 0
+
+        def extract(self, html):
+            self.calls += 1
+            return html
+
+    scraper = Scraper()
+    cache = Cache(tmp_path / "one", max_bytes=100)
+    cache.write("ca_a/page.html", "one")
+    with use_parser("html.parser"):
+        cache.parse("ca_a/page.html", scraper.extract)
+        cache.parse("ca_a/page.html", scraper.extract)
+    with use_parser("html5lib"):
+        cache.parse("ca_a/page.html", scraper.extract)
+    scraper.page_regions = ("div.b",)
+    with use_parser("html5lib"):
+        cache.parse("ca_a/page.html", scraper.extract)
+        assert scraper.calls == 3
+        (tmp_path / "one").rename(tmp_path / "two")
+        moved = Cache(tmp_path / "two", max_bytes=100)
+        moved.parse("ca_a/page.html", scraper.extract)
+    assert scraper.calls == 3
+
+    # Evicting a page forgets what was extracted from it
+    moved.evict(0)
+    with sqlite3.connect(tmp_path / "two" / ".parsed.sqlite3") as conn:
+        assert conn.execute("SELECT COUNT(*) FROM parsed").fetchone() == (0,)
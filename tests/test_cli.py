@@ -38,3 +38,63 @@ def test_cli_scrape_meta_command(mock_runner):
         ],
     )
     mock_runner.scrape_meta.assert_called_once_with("ca_san_diego_pd")
+
+
+@pytest.mark.usefixtures("set_default_env", "create_scraper_dir")
+def test_cli_scrape_meta_many_command(mock_runner):
+    """Test the 'scrape-meta' command with several agencies and a glob pattern."""
+    mock_runner.scrape_meta_many.return_value = [
+        {
+            "agency": "ca_san_diego_pd",
+            "ok": True,
+            "path": "ca_san_diego_pd.json",
+            "error": None,
+            "seconds": 1.0,
+        },
+        {
+            "agency": "ca_san_diego_harbor_pd",
+            "ok": False,
+            "path": None,
+            "error": "AssertionError: ",
+            "seconds": 2.0,
+        },
+    ]
+    runner = CliRunner()
+    result = runner.invoke(
+        cli,
+        ["scrape-meta", "ca_san_diego_pd", "ca_san_diego_h*", "--jobs", "2"],
+    )
+    mock_runner.scrape_meta_many.assert_called_once_with(
+        ["ca_san_diego_pd", "ca_san_diego_harbor_pd"], jobs=2
+    )
+    assert "1 succeeded, 1 failed" in result.stdout
+    assert result.exit_code == 1
+
+
+@pytest.mark.usefixtures("set_default_env", "create_scraper_dir")
+def test_cli_scrape_meta_requires_agency(mock_runner):
+    """Test that 'scrape-meta' without agencies or --all is an error."""
+    runner = CliRunner()
+    result = runner.invoke(cli, ["scrape-meta"])
+    assert result.exit_code == 2
+    mock_runner.scrape_meta.assert_not_called()
+
+
+@pytest.mark.usefixtures("set_default_env", "create_scraper_dir")
+def test_cli_bad_freshness_file(mock_runner, tmp_path, monkeypatch):
+    """A broken CLEAN_FRESHNESS_FILE stops scrapes with a clear error, but not `list`."""
+    from clean import freshness
+
+    bad = tmp_path / "freshness.json"
+    bad.write_text('[{"agency": "ca_a", "ttl": "soon"}]')
+    monkeypatch.setenv("CLEAN_FRESHNESS_FILE", str(bad))
+    monkeypatch.setattr(freshness, "_policy", None)
+    runner = CliRunner()
+
+    assert runner.invoke(cli, ["list"]).exit_code == 0
+    result = runner.invoke(cli, ["scrape-meta", "ca_san_diego_pd"])
+    assert result.exit_code == 1
+    assert (
+        f"Can't read freshness rules from CLEAN_FRESHNESS_FILE {bad}" in result.output
+    )
+    mock_runner.scrape_meta.assert_not_called()
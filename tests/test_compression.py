@@ -0,0 +1,63 @@
+import gzip
+from contextlib import nullcontext
+from unittest.mock import patch
+
+from clean import compression
+from clean.cache import Cache
+
+
+def test_compressed_text_round_trips(tmp_path):
+    """Text written with compression on should read back unchanged."""
+    cache = Cache(tmp_path, compression="gzip")
+    cache.write("ca_a/page.html", "<p>café</p>")
+    cache.write_json("ca_a/data.json", {"rows": [1, 2, 3]})
+    cache.write_binary("ca_a/raw.json", b'{"b": 1}')
+    cache.write_binary("ca_a/video.mp4", b"\x00\x01")
+
+    for name in ("page.html", "data.json", "raw.json"):
+        assert (tmp_path / "ca_a" / name).read_bytes()[:2] == compression.GZIP_MAGIC
+    assert (tmp_path / "ca_a" / "video.mp4").read_bytes() == b"\x00\x01"
+
+    assert cache.read("ca_a/page.html") == "<p>café</p>"
+    assert cache.read_json(tmp_path / "ca_a" / "data.json") == {"rows": [1, 2, 3]}
+    assert cache.read_json(tmp_path / "ca_a" / "raw.json") == {"b": 1}
+
+
+def test_plain_files_and_exports_stay_readable(tmp_path):
+    """Old uncompressed entries still read, and exports are never compressed."""
+    plain = Cache(tmp_path / "cache")
+    plain.write("ca_a/old.html", "<p>old</p>")
+    cache = Cache(tmp_path / "cache", compression="gzip")
+    assert cache.read("ca_a/old.html") == "<p>old</p>"
+
+    export = tmp_path / "exports" / "ca_a.json"
+    cache.write_json(export, [{"asset_url": "https://example.com/a.mp4"}])
+    assert export.read_text().startswith("[\n    {")
+
+
+@patch("clean.cache.get_url")
+def test_downloaded_pages_are_compressed(mock_get_url, tmp_path):
+    """Downloaded HTML should be stored compressed and indexed by its real content."""
+
+    class Response:
+        status_code = 200
+        headers = {"Content-Type": "text/html; charset=utf-8"}
+        encoding = "utf-8"
+
+        def iter_content(self, chunk_size):
+            yield b"<html>" + b"a" * 1000 + b"</html>"
+
+    mock_get_url.return_value = nullcontext(Response())
+    cache = Cache(tmp_path, compression="gzip")
+    path = cache.download("ca_a/index", "https://example.com/")
+
+    assert gzip.decompress(path.read_bytes()).startswith(b"<html>aaa")
+    assert cache.read("ca_a/index").endswith("</html>")
+    assert cache.lookup("ca_a/index")["size"] == path.stat().st_size
+
+
+def test_zstd_falls_back_to_gzip(monkeypatch):
+    """Without the zstandard package, zstd requests should use gzip."""
+    monkeypatch.setattr(compression, "zstandard", None)
+    assert compression.resolve_codec("zstd") == "gzip"
+    assert compression.resolve_codec("none") is None
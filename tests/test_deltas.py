@@ -0,0 +1,75 @@
+import json
+from unittest.mock import patch
+
+from clean.cache import Cache
+from clean.deltas import changes_path, snapshot_path, write_changes
+from clean.runner import Runner
+
+RECORDS = [
+    {"asset_url": "https://example.com/a.mp4", "case_id": "1", "name": "a.mp4"},
+    {"asset_url": "https://example.com/b.pdf", "case_id": "1", "name": "b.pdf"},
+    {"asset_url": "https://example.com/b.pdf", "case_id": "2", "name": "b.pdf"},
+    {"asset_url": "https://example.com/c.pdf", "name": "c.pdf"},
+]
+
+
+def _read(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_write_changes(tmp_path):
+    """Records are compared by asset URL and case ID across runs."""
+    cache = Cache(tmp_path / "cache")
+    snapshot = snapshot_path(tmp_path, "ca_a")
+    out = changes_path(tmp_path, "ca_a")
+
+    export = cache.write_export(tmp_path / "ca_a.json", RECORDS)
+    assert write_changes(export, snapshot, out) == {
+        "added": 4,
+        "removed": 0,
+        "changed": 0,
+    }
+    assert [c["record"] for c in _read(out)] == RECORDS
+
+    # Field order alone isn't a change
+    unchanged = [dict(reversed(list(r.items()))) for r in RECORDS]
+    export = cache.write_export(tmp_path / "ca_a.json", unchanged, "jsonl")
+    assert write_changes(export, snapshot, out)["changed"] == 0
+    assert out.read_text() == ""
+
+    later = [
+        RECORDS[0],
+        {**RECORDS[1], "name": "b (redacted).pdf", "details": {"pages": 3}},
+        RECORDS[3],
+        {"asset_url": "https://example.com/d.pdf", "case_id": "2", "name": "d.pdf"},
+    ]
+    export = cache.write_export(tmp_path / "ca_a.json", later, "csv")
+    assert write_changes(export, snapshot, out) == {
+        "added": 1,
+        "removed": 1,
+        "changed": 1,
+    }
+    changed, added, removed = _read(out)
+    assert changed["change"] == "changed"
+    assert changed["fields"] == {
+        "details": {"old": None, "new": {"pages": 3}},
+        "name": {"old": "b.pdf", "new": "b (redacted).pdf"},
+    }
+    assert added["asset_url"].endswith("d.pdf")
+    assert (removed["change"], removed["case_id"]) == ("removed", "2")
+
+
+def test_runner_saves_changes(tmp_path):
+    """Each scrape leaves a change set and reports its size."""
+    runner = Runner(data_dir=tmp_path / "exports", cache_dir=tmp_path / "cache")
+    export = tmp_path / "exports" / "ca_san_diego_pd.json"
+    cache = Cache(tmp_path / "cache")
+
+    def scrape(throttle=0):
+        return cache.write_export(export, RECORDS)
+
+    with patch("clean.ca.san_diego_pd.Site.scrape_meta", side_effect=scrape):
+        runner.scrape_meta("ca_san_diego_pd")
+        runner.scrape_meta("ca_san_diego_pd")
+    assert changes_path(export.parent, "ca_san_diego_pd").read_text() == ""
+    assert snapshot_path(export.parent, "ca_san_diego_pd").exists()
@@ -0,0 +1,110 @@
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from unittest.mock import patch
+
+from clean.downloads import AssetDownloader
+
+
+class FakeResponse:
+    """Just enough of a streamed requests.Response for Cache.download."""
+
+    status_code = 200
+    headers = {"Content-Type": "application/pdf", "ETag": '"v1"'}
+    encoding = None
+
+    def iter_content(self, chunk_size):
+        yield b"%PDF-1.4 asset"
+
+
+def test_run_respects_per_host_limit(tmp_path):
+    lock = threading.Lock()
+    active: dict = {}
+    peak: dict = {}
+
+    def fake_download(url, local_path):
+        host = url.split("/")[2]
+        with lock:
+            active[host] = active.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), active[host])
+        time.sleep(0.01)
+        with lock:
+            active[host] -= 1
+        if url.endswith("bad"):
+            raise ValueError("boom")
+
+    jobs = [(f"https://a.example.com/{i}", tmp_path / f"a{i}") for i in range(6)]
+    jobs += [(f"https://b.example.com/{i}", tmp_path / f"b{i}") for i in range(6)]
+    jobs.append(("https://c.example.com/bad", tmp_path / "c"))
+
+    downloader = AssetDownloader(max_workers=4, per_host=2)
+    downloader.download = fake_download  # type: ignore
+    summary = downloader.run(jobs)
+
+    assert len(summary["succeeded"]) == 12
+    assert summary["failed"] == [
+        {
+            "url": "https://c.example.com/bad",
+            "path": str(tmp_path / "c"),
+            "error": "boom",
+        }
+    ]
+    assert peak["a.example.com"] == 2
+    assert peak["b.example.com"] == 2
+
+
+def test_run_skips_duplicate_paths(tmp_path):
+    calls = []
+    downloader = AssetDownloader()
+    downloader.download = lambda url, path: calls.append(url)  # type: ignore
+    target = Path(tmp_path, "same.pdf")
+    summary = downloader.run(
+        [("https://example.com/1", target), ("https://example.com/2", target)]
+    )
+    assert calls == ["https://example.com/1"]
+    assert summary["queued"] == 1
+    assert summary["succeeded"] == ["https://example.com/1"]
+
+
+def test_run_reads_jobs_lazily(tmp_path):
+    """Only a bounded number of jobs are read ahead of the downloads."""
+    read = []
+    read_at_download = []
+
+    def jobs():
+        for i in range(50):
+            read.append(i)
+            yield f"https://example.com/{i}", tmp_path / f"{i}.pdf"
+
+    downloader = AssetDownloader(max_workers=2, lookahead=5)
+    downloader.download = lambda url, path: read_at_download.append(len(read))  # type: ignore
+    summary = downloader.run(jobs())
+
+    assert summary["queued"] == 50
+    assert len(summary["succeeded"]) == 50
+    # Jobs read never run more than the lookahead plus the workers ahead of downloads
+    assert all(count <= i + 1 + 5 + 2 for i, count in enumerate(read_at_download))
+
+
+@patch("clean.cache.get_url")
+def test_download_leaves_only_assets(mock_get_url, tmp_path, monkeypatch):
+    """Asset folders hold the assets and nothing the cache keeps for itself."""
+    # A cache budget smaller than one asset must not evict any of them
+    monkeypatch.setenv("CLEAN_CACHE_MAX_BYTES", "4")
+    mock_get_url.side_effect = lambda *args, **kwargs: nullcontext(FakeResponse())
+    jobs = [
+        (f"https://example.com/{i}.pdf", tmp_path / "assets" / "case" / f"{i}.pdf")
+        for i in range(3)
+    ]
+    summary = AssetDownloader(root=tmp_path).run(jobs)
+
+    assert len(summary["succeeded"]) == 3
+    assert all(path.read_bytes() == b"%PDF-1.4 asset" for _, path in jobs)
+    assert sorted(p.relative_to(tmp_path).as_posix() for p in tmp_path.rglob("*")) == [
+        "assets",
+        "assets/case",
+        "assets/case/0.pdf",
+        "assets/case/1.pdf",
+        "assets/case/2.pdf",
+    ]
@@ -0,0 +1,121 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from clean import exports, sinks
+from clean.cache import Cache
+from clean.exports import find_export, read_export
+from clean.runner import Runner
+from clean.sinks import SINKS
+
+RECORDS = [
+    {"asset_url": "https://example.com/a.mp4", "name": 'Café [1], "a"', "n": 12},
+    {"asset_url": "https://example.com/b.pdf", "details": {"ids": [1, 2.5, None]}},
+    {"asset_url": "https://example.com/c.pdf", "case_id": "}{"},
+]
+
+
+def test_json_export_matches_json_dump(tmp_path):
+    """Streamed JSON is byte-for-byte what json.dump used to write."""
+    cache = Cache(tmp_path / "cache")
+    path = cache.write_export(tmp_path / "exports" / "ca_a.json", iter(RECORDS))
+    assert path.read_text(encoding="utf-8") == json.dumps(RECORDS, indent=4)
+    empty = cache.write_export(tmp_path / "exports" / "ca_b.json", [])
+    assert json.loads(empty.read_text()) == []
+
+
+def test_read_export_streams_both_formats(tmp_path, monkeypatch):
+    """Both formats read back the same records, even across tiny read chunks."""
+    monkeypatch.setattr(exports, "CHUNK_SIZE", 7)
+    cache = Cache(tmp_path / "cache")
+    json_path = cache.write_export(tmp_path / "ca_a.json", RECORDS)
+    assert list(read_export(json_path)) == RECORDS
+    jsonl_path = cache.write_export(tmp_path / "ca_a.json", RECORDS, "jsonl")
+    assert jsonl_path.name == "ca_a.jsonl"
+    assert len(jsonl_path.read_text().splitlines()) == 3
+    assert list(read_export(jsonl_path)) == RECORDS
+    # The older JSON export is replaced, not left beside the new one
+    assert not json_path.exists()
+    assert find_export(tmp_path, "ca_a") == jsonl_path
+    with pytest.raises(FileNotFoundError):
+        find_export(tmp_path, "ca_b")
+
+
+def test_failed_export_keeps_previous_one(tmp_path):
+    """A scrape that fails partway keeps the last good export and sets aside what it found."""
+    cache = Cache(tmp_path / "cache")
+    path = cache.write_export(tmp_path / "ca_a.json", RECORDS)
+
+    def broken():
+        yield RECORDS[0]
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        cache.write_export(tmp_path / "ca_a.json", broken())
+    assert list(read_export(path)) == RECORDS
+    files = sorted(p.name for p in tmp_path.iterdir() if p.is_file())
+    assert files == ["ca_a.json", "ca_a.json.failed"]
+    assert json.loads((tmp_path / "ca_a.json.failed").read_text()) == RECORDS[:1]
+
+    cache.write_export(tmp_path / "ca_a.json", RECORDS)
+    assert not (tmp_path / "ca_a.json.failed").exists()
+
+
+def test_jsonl_records_saved_as_found(tmp_path):
+    """Each record reaches disk before the scraper finds the next one."""
+    cache = Cache(tmp_path / "cache")
+    part = tmp_path / "ca_a.jsonl.part"
+
+    def scrape():
+        for i, record in enumerate(RECORDS):
+            assert len(part.read_text().splitlines()) == i
+            yield record
+
+    path = cache.write_export(tmp_path / "ca_a.json", scrape(), "jsonl")
+    assert list(read_export(path)) == RECORDS
+    assert not part.exists()
+
+
+@pytest.mark.parametrize("export_format", ["csv", "sqlite"])
+def test_tabular_sinks(tmp_path, monkeypatch, export_format):
+    """CSV and SQLite exports save records in batches and read back intact."""
+    monkeypatch.setattr(sinks, "BATCH_SIZE", 2)
+    cache = Cache(tmp_path / "cache")
+    records = [{k: v for k, v in r.items() if k != "n"} for r in RECORDS]
+    with exports.use_format(export_format):
+        path = cache.write_export(tmp_path / "ca_a.json", iter(records))
+    assert path.suffix == SINKS[export_format].suffix
+    assert list(read_export(path)) == records
+    assert find_export(tmp_path, "ca_a") == path
+
+
+def test_sinks_must_implement_every_step(tmp_path):
+    """A sink that leaves out open, add or close can't be created."""
+
+    class Incomplete(sinks.Sink):
+        def open(self):
+            pass
+
+        def add(self, record):
+            pass
+
+    with pytest.raises(TypeError):
+        Incomplete(tmp_path / "ca_a.json")  # type: ignore[abstract]
+
+
+def test_download_agency_reads_jsonl_export(tmp_path):
+    """Downloads are queued from the export in the data directory, whatever its format."""
+    runner = Runner(
+        data_dir=tmp_path / "exports",
+        cache_dir=tmp_path / "cache",
+        assets_dir=tmp_path / "assets",
+    )
+    Cache(tmp_path / "cache").write_export(
+        tmp_path / "exports" / "ca_san_diego_pd.json", RECORDS, "jsonl"
+    )
+    with patch("clean.runner.AssetDownloader.run") as mock_run:
+        mock_run.return_value = {"queued": 0, "succeeded": [], "failed": []}
+        runner.download_agency("ca_san_diego_pd")
+    queue = mock_run.call_args.args[0]
+    assert [url for url, _ in queue] == [r["asset_url"] for r in RECORDS]
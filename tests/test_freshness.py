@@ -0,0 +1,109 @@
+import os
+import time
+from contextlib import nullcontext
+from unittest.mock import patch
+
+import pytest
+
+from clean import freshness
+from clean.cache import Cache
+from clean.freshness import FreshnessPolicy, parse_ttl
+
+
+def test_parse_ttl():
+    """Parse TTLs given as numbers, suffixed durations, always or never."""
+    assert parse_ttl("12h") == 12 * 60 * 60
+    assert parse_ttl("7d") == 7 * 24 * 60 * 60
+    assert parse_ttl(90) == 90.0
+    assert parse_ttl("always") == 0.0
+    assert parse_ttl("never") is None
+    with pytest.raises(ValueError):
+        parse_ttl("soon")
+
+
+def test_first_matching_rule_wins():
+    """Rules should be checked in order, and every pattern in a rule must match."""
+    policy = FreshnessPolicy(
+        [
+            {"agency": "ca_a", "path": "*/index.html", "ttl": "12h"},
+            {"agency": "ca_a", "url": "*nextrequest.com*", "ttl": "7d"},
+            {"path": "*/assets/*", "ttl": "never"},
+            {"agency": "ca_*", "ttl": 60},
+        ]
+    )
+    assert policy.ttl("ca_a", "https://x.gov/", "ca_a/index.html") == 43200
+    assert policy.ttl("ca_a", "https://a.nextrequest.com/1", "ca_a/1.json") == 604800
+    assert policy.ttl("ca_b", None, "ca_b/assets/1.mp4") is None
+    assert policy.ttl("ca_b", None, "ca_b/page.html") == 60
+    assert policy.ttl(None, None, "loose.html") is None
+
+
+def test_default_rules_only_recheck_index_pages():
+    """Agencies that update their index pages in place still trust their case pages."""
+    policy = FreshnessPolicy(freshness.DEFAULT_RULES)
+    index = "ca_grass_valley_pd/records-release.html"
+    assert policy.ttl("ca_grass_valley_pd", None, index) == 43200
+    case = "ca_grass_valley_pd/21-107.html"
+    assert policy.ttl("ca_grass_valley_pd", None, case) is None
+    assert policy.ttl("ca_redding_pd", None, "ca_redding_pd/a.pdf") is None
+
+
+@patch("clean.cache.get_url")
+def test_stale_files_are_revalidated(mock_get_url, tmp_path, monkeypatch):
+    """Cache.download should refetch a stale file but reuse a fresh one."""
+    monkeypatch.setattr(
+        freshness, "_policy", FreshnessPolicy([{"agency": "ca_a", "ttl": "1h"}])
+    )
+    cache = Cache(tmp_path)
+    page = tmp_path / "ca_a" / "index.html"
+    page.parent.mkdir()
+    page.write_text("old")
+    other = tmp_path / "ca_b" / "index.html"
+    other.parent.mkdir()
+    other.write_text("old")
+    two_hours_ago = time.time() - 2 * 60 * 60
+    for path in (page, other):
+        os.utime(path, (two_hours_ago, two_hours_ago))
+
+    assert not cache.is_fresh("ca_a/index.html")
+    assert cache.is_fresh("ca_b/index.html")
+
+    class Response:
+        status_code = 200
+        headers: dict = {}
+        encoding = "utf-8"
+
+        def iter_content(self, chunk_size):
+            yield b"new"
+
+    mock_get_url.return_value = nullcontext(Response())
+    cache.download("ca_a/index.html", "https://example.com/")
+    cache.download("ca_b/index.html", "https://example.com/")
+
+    assert mock_get_url.call_count == 1
+    assert page.read_text() == "new"
+    assert cache.is_fresh("ca_a/index.html")
+
+
+@patch("clean.platforms.nextrequest.utils.get_url")
+def test_nextrequest_freshness_uses_the_scrapers_cache(mock_get_url, tmp_path):
+    """Folders from NextRequest go stale under the agency's rule in a custom cache dir."""
+    from clean.platforms.nextrequest import fetch_nextrequest
+
+    cache = Cache(tmp_path / "elsewhere")
+    subpages = tmp_path / "elsewhere" / "ca_oakland_pd" / "subpages"
+    subpages.mkdir(parents=True)
+    start_url = "https://oaklandca.nextrequest.com/requests/21-1234"
+    folder = subpages / "21-1234.json"
+    folder.write_text("{}")
+    mock_get_url.return_value.ok = False
+
+    two_days_ago = time.time() - 2 * 24 * 60 * 60
+    os.utime(folder, (two_days_ago, two_days_ago))
+    fetch_nextrequest(subpages, start_url, cache=cache)
+    assert mock_get_url.call_count == 0
+
+    eight_days_ago = time.time() - 8 * 24 * 60 * 60
+    os.utime(folder, (eight_days_ago, eight_days_ago))
+    fetch_nextrequest(subpages, start_url, cache=cache)
+    assert mock_get_url.call_count == 1
@@ -0,0 +1,69 @@
+from unittest.mock import patch
+
+import pytest
+
+from clean.metrics import MetricsRegistry, metrics
+from clean.runner import Runner
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry(buckets=(0.1, 1.0))
+
+
+def test_render_counts(registry):
+    """Requests are counted per agency, command, host and status."""
+    with registry.agency("ca_san_diego_pd"):
+        registry.observe_request("https://www.sandiego.gov/a", 200, 0.05)
+        registry.observe_request("https://www.sandiego.gov/b", 200, 0.5)
+        registry.observe_request("https://www.sandiego.gov/c", 503, 5.0)
+        registry.observe_request("https://www.sandiego.gov/d", None, 0.1)
+        registry.observe_bytes("https://www.sandiego.gov/a", 1024)
+        registry.observe_retry("https://www.sandiego.gov/c")
+        registry.observe_throttle("https://www.sandiego.gov/b", 1.5)
+    registry.observe_request("https://example.com/", 200, 0.01)
+
+    text = registry.render("ca_san_diego_pd")
+    labels = 'agency="ca_san_diego_pd",command="scrape-meta",host="www.sandiego.gov"'
+    assert f'clean_http_requests_total{{{labels},status="200"}} 2' in text
+    assert f'clean_http_requests_total{{{labels},status="503"}} 1' in text
+    assert f'clean_http_requests_total{{{labels},status="error"}} 1' in text
+    # Buckets are cumulative and inclusive of their upper bound
+    assert f'clean_http_request_duration_seconds_bucket{{{labels},le="0.1"}} 2' in text
+    assert f'clean_http_request_duration_seconds_bucket{{{labels},le="1"}} 3' in text
+    assert f'clean_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 4' in text
+    assert f"clean_http_request_duration_seconds_count{{{labels}}} 4" in text
+    assert f"clean_http_request_duration_seconds_sum{{{labels}}} 5.65" in text
+    assert f"clean_http_response_bytes_total{{{labels}}} 1024" in text
+    assert f"clean_http_retries_total{{{labels}}} 1" in text
+    assert f"clean_http_throttle_seconds_total{{{labels}}} 1.5" in text
+    assert "clean_run_last_timestamp_seconds{" in text
+    # Other agencies' requests are left out
+    assert "example.com" not in text
+    assert 'agency="unknown"' in registry.render()
+
+
+def test_write_textfile(registry, tmp_path):
+    """The textfile is complete, newline-terminated and left without temp files."""
+    registry.observe_request('https://example.com/"quoted"', 200, 0.2)
+    path = registry.write_textfile(tmp_path / "metrics" / "clean.prom")
+    text = path.read_text()
+    assert text.endswith("\n")
+    assert "# TYPE clean_http_request_duration_seconds histogram" in text
+    assert [p.name for p in path.parent.iterdir()] == ["clean.prom"]
+
+
+def test_runner_writes_metrics(tmp_path):
+    """Each agency run leaves a textfile, even when it fails."""
+    runner = Runner(
+        data_dir=tmp_path / "exports",
+        cache_dir=tmp_path / "cache",
+        metrics_dir=tmp_path / "metrics",
+    )
+    with patch("clean.ca.san_diego_pd.Site.scrape_meta") as mock_scrape_meta:
+        mock_scrape_meta.side_effect = ValueError("boom")
+        with pytest.raises(ValueError):
+            runner.scrape_meta("ca_san_diego_pd")
+    text = (tmp_path / "metrics" / "clean_ca_san_diego_pd_scrape_meta.prom").read_text()
+    assert 'clean_run_last_timestamp_seconds{agency="ca_san_diego_pd"' in text
+    assert metrics.current == ("unknown", "none")
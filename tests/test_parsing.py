@@ -0,0 +1,109 @@
+import logging
+
+import pytest
+
+from clean import parsing
+from clean.ca.humboldt_pd import Site as HumboldtSite
+from clean.ca.san_diego_pd import Site
+from clean.parsing import (
+    ParserMismatch,
+    compare_parsers,
+    make_soup,
+    resolve_parser,
+    use_parser,
+)
+
+CHILD_PAGE = """<html><body>
+<nav><a href="/">Home</a><div class="menu">Menu</div></nav>
+<div class="view-header"> Officer-involved shooting, 2019 </div>
+<div class="view-content">
+  <ul>
+    <li><a href="https://www.sandiego.gov/a.mp4
+">Body camera &amp; audio</a>
+    <li><a href="https://www.sandiego.gov/b.pdf">Report<br>(redacted)</a>
+  </ul>
+</div>
+"""
+
+
+def test_use_parser():
+    """The chosen backend applies inside the block only."""
+    default = resolve_parser()
+    with use_parser("html5lib") as chosen:
+        assert chosen == "html5lib"
+        assert make_soup("<p>hi</p>").builder.NAME == "html5lib"
+    assert resolve_parser() == default
+    with pytest.raises(ValueError):
+        resolve_parser("regex")
+
+
+def test_missing_parser_falls_back(monkeypatch, caplog):
+    """Asking for a backend that isn't installed uses html.parser instead."""
+    monkeypatch.setattr(parsing, "available_parsers", lambda: ["html.parser"])
+    monkeypatch.setattr(parsing, "_warned", set())
+    with caplog.at_level(logging.WARNING):
+        assert resolve_parser("lxml") == "html.parser"
+        assert resolve_parser("auto") == "html.parser"
+        assert resolve_parser("lxml") == "html.parser"
+    assert len(caplog.records) == 1
+
+
+def test_scraper_parity(tmp_path):
+    """San Diego extracts identical metadata with every installed backend."""
+    site = Site(tmp_path / "exports", tmp_path / "cache")
+    case_dir = tmp_path / "cache" / site.agency_slug / "sb16-index"
+    case_dir.mkdir(parents=True)
+    (case_dir / "case_1.html").write_text(CHILD_PAGE)
+
+    results = compare_parsers(lambda: list(site._iter_assets()))
+    assert len(results) >= 2
+    records = next(iter(results.values()))
+    assert [r["name"] for r in records] == ["Body camera & audio", "Report(redacted)"]
+
+
+def test_regions(monkeypatch, tmp_path):
+    """Parsing only a scraper's regions leaves its extraction unchanged."""
+    soup = make_soup(CHILD_PAGE, "html.parser", only=["div.view-header", "nav"])
+    assert [tag.name for tag in soup.contents if tag.name] == ["nav", "div"]
+    assert make_soup("<p id='x'>a</p><p>b</p>", only=["p#x"]).text == "a"
+    with pytest.raises(ValueError):
+        make_soup("<p>a</p>", only=["div > p"])
+
+    site = Site(tmp_path / "exports", tmp_path / "cache")
+    case_dir = tmp_path / "cache" / site.agency_slug / "sb16-index"
+    case_dir.mkdir(parents=True)
+    (case_dir / "case_1.html").write_text(CHILD_PAGE)
+    strained = list(site._iter_assets())
+    monkeypatch.setattr(Site, "page_regions", None)
+    assert list(site._iter_assets()) == strained
+
+
+def test_humboldt_case_page_without_related_documents(tmp_path):
+    """Case pages that link a NextRequest folder from their header still yield a record."""
+    site = HumboldtSite(tmp_path / "exports", tmp_path / "cache")
+    page = f"{site.agency_slug}/21-107_Case.html"
+    site.cache.write(
+        page,
+        """<html><head><title> Case 21-107 </title></head><body>
+        <h1>Officer-involved shooting</h1>
+        <a href="/documents?folder_filter=21-107"><h2>View the records</h2></a>
+        </body></html>""",
+    )
+    records = site._get_asset_links([{"page_name": page}], "index.html")
+    assert records == [
+        {
+            "title": "Case 21-107",
+            "case_id": "21-107",
+            "parent_page": "index.html",
+            "download_page": page,
+            "asset_url": "https://humboldtgov.nextrequest.com/documents?folder_filter=21-107",
+            "name": "Officer-involved shooting",
+        }
+    ]
+
+
+def test_parity_mismatch():
+    """Backends that build different trees are reported."""
+    with pytest.raises(ParserMismatch) as error:
+        compare_parsers(lambda: str(make_soup("<p>a<p>b")), ["html.parser", "html5lib"])
+    assert set(error.value.results) == {"html.parser", "html5lib"}
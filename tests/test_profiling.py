@@ -0,0 +1,65 @@
+import pstats
+import threading
+import time
+
+from bs4 import BeautifulSoup
+
+from clean.profiling import PhaseTimer, phase, profile
+
+
+def test_phase_charges_innermost():
+    """Time inside a nested phase isn't counted against its parent too."""
+    timer = PhaseTimer()
+    timer.enabled = True
+    with timer.phase("fetch children"):
+        time.sleep(0.02)
+        with timer.phase("fetch"):
+            time.sleep(0.05)
+            # Re-entering the same phase folds into it
+            with timer.phase("fetch"):
+                pass
+    totals = dict((key, seconds) for key, _, seconds in timer.summary())
+    assert set(totals) == {"fetch children", "fetch children/fetch"}
+    assert totals["fetch children/fetch"] >= 0.05
+    assert 0.02 <= totals["fetch children"] < 0.05
+    assert timer.counts["fetch children/fetch"] == 1
+
+
+def test_phase_disabled():
+    """Nothing is recorded until the timer is enabled."""
+    timer = PhaseTimer()
+    with timer.phase("fetch"):
+        pass
+    assert timer.summary() == []
+
+
+def test_phase_threads():
+    """Each thread keeps its own stack of phases."""
+    timer = PhaseTimer()
+    timer.enabled = True
+
+    def work():
+        with timer.phase("download"):
+            time.sleep(0.01)
+
+    threads = [threading.Thread(target=work) for _ in range(3)]
+    with timer.phase("run"):
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert timer.counts == {"run": 1, "download": 3}
+
+
+def test_profile_writes_stats_and_summary(tmp_path):
+    """A profiled run leaves cProfile stats and a text summary with phases."""
+    output = tmp_path / "profiles" / "run.prof"
+    with profile(output):
+        with phase("fetch index"):
+            BeautifulSoup("<html><p>Hi</p></html>", "html.parser")
+    pstats.Stats(str(output))
+    summary = output.with_suffix(".txt").read_text()
+    assert "fetch index/parse" in summary
+    assert "cumulative" in summary
+    # Parsing is only timed while profiling
+    assert BeautifulSoup.__init__.__qualname__ == "BeautifulSoup.__init__"
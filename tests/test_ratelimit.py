@@ -0,0 +1,71 @@
+from clean import ratelimit
+from clean.ratelimit import RateLimiter
+
+
+def test_limiter_spaces_requests_per_host(monkeypatch):
+    """Requests to one host should wait for tokens; other hosts are untouched."""
+    clock = [100.0]
+    waits = []
+
+    def fake_sleep(seconds):
+        waits.append(seconds)
+        clock[0] += seconds
+
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(ratelimit.time, "sleep", fake_sleep)
+
+    limiter = RateLimiter()
+    limiter.configure(rate=0.5, burst=2, host="slow.example.com")
+
+    # The burst goes through immediately, then one request every two seconds
+    for _ in range(4):
+        limiter.acquire("https://slow.example.com/page")
+    assert waits == [2.0, 2.0]
+
+    # Hosts without a rule and no default aren't limited
+    assert limiter.acquire("https://fast.example.com/") == 0.0
+    assert waits == [2.0, 2.0]
+
+
+def test_limiter_default_and_throttle(monkeypatch):
+    """The default rule should cover every host until a host-specific throttle is set."""
+    clock = [0.0]
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(
+        ratelimit.time, "sleep", lambda s: clock.__setitem__(0, clock[0] + s)
+    )
+
+    limiter = RateLimiter()
+    limiter.configure(rate=4)
+    limiter.acquire("https://a.example.com/")
+    assert limiter.acquire("https://a.example.com/") == 0.25
+
+    limiter.throttle("https://a.example.com/documents", 3)
+    limiter.acquire("https://a.example.com/")
+    assert limiter.acquire("https://a.example.com/") == 3.0
+
+    limiter.configure(rate=None)
+    assert limiter.acquire("https://b.example.com/") == 0.0
+
+
+def test_throttle_only_tightens(monkeypatch):
+    """Repeated throttles keep the host's spacing and never loosen a stricter rule."""
+    clock = [0.0]
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(
+        ratelimit.time, "sleep", lambda s: clock.__setitem__(0, clock[0] + s)
+    )
+
+    limiter = RateLimiter()
+    limiter.throttle("https://a.example.com/", 2)
+    limiter.acquire("https://a.example.com/")
+    limiter.throttle("https://a.example.com/next", 2)
+    assert limiter.acquire("https://a.example.com/") == 2.0
+
+    limiter.configure(rate=0.1, host="b.example.com")
+    limiter.throttle("https://b.example.com/", 2)
+    limiter.acquire("https://b.example.com/")
+    assert limiter.acquire("https://b.example.com/") == 10.0
+
+    limiter.throttle("https://c.example.com/", 0)
+    assert limiter.acquire("https://c.example.com/") == 0.0
@@ -0,0 +1,56 @@
+import json
+import sys
+
+import pytest
+
+from clean.cache import Cache
+from clean.records import MetadataRecord
+
+RECORD = {
+    "asset_url": "https://lacity.nextrequest.com/documents/1/download?token=",
+    "case_id": "F009-01",
+    "name": "Report.pdf",
+    "parent_page": "subpages/F009-01.json",
+    "title": "Report.pdf",
+    "details": {"file_extension": "pdf", "count": 3, "highlights": None},
+}
+
+
+def test_records_serialize_like_dicts(tmp_path):
+    """Exports of records are identical to exports of the dicts they came from."""
+    reordered = {"title": "a", "parent_page": "p", "asset_url": "u", "name": "n"}
+    dicts = [RECORD, reordered, {**RECORD, "details": {}}]
+    records = [MetadataRecord.from_dict(d) for d in dicts]
+    assert records == dicts
+    assert [r.to_dict() for r in records] == dicts
+
+    cache = Cache(tmp_path / "cache")
+    for export_format in ("json", "csv"):
+        expected = cache.write_export(tmp_path / "dicts.json", dicts, export_format)
+        actual = cache.write_export(tmp_path / "records.json", records, export_format)
+        assert actual.read_bytes() == expected.read_bytes()
+
+
+def test_records_share_repeated_values():
+    """Records with the same case and detail names don't each keep a copy."""
+    a = MetadataRecord.from_dict(json.loads(json.dumps(RECORD)))
+    b = MetadataRecord.from_dict(json.loads(json.dumps(RECORD)))
+    assert a.case_id is b.case_id
+    assert a._detail_names is b._detail_names
+    assert sys.getsizeof(a) < sys.getsizeof(dict(RECORD))
+    with pytest.raises(AttributeError):
+        a.extra = 1  # type: ignore
+    with pytest.raises(ValueError):
+        MetadataRecord(asset_url="u", extra=1)
+
+
+def test_update_details():
+    """Details are read-only, but can be added to as scrapers enrich records."""
+    record = MetadataRecord.from_dict(RECORD)
+    with pytest.raises(TypeError):
+        record["details"]["officer_name"] = "Smith"  # type: ignore
+    record.update_details({"officer_name": "Smith", "count": 4})
+    assert record["details"] == {**RECORD["details"], "officer_name": "Smith", "count": 4}  # type: ignore
+    bare = MetadataRecord(asset_url="u", name="n")
+    bare.update_details({"year": 2024})
+    assert bare.to_dict() == {"asset_url": "u", "name": "n", "details": {"year": 2024}}
@@ -0,0 +1,54 @@
+import importlib.util
+import subprocess
+import sys
+from pathlib import Path
+
+from clean import utils
+from clean.registry import SCRAPERS
+
+SCRIPT_PATH = Path(__file__).parent.parent / "scripts" / "build_registry.py"
+
+
+def _build_registry():
+    spec = importlib.util.spec_from_file_location("build_registry", SCRIPT_PATH)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_registry_in_sync():
+    """The committed registry matches the scraper modules on disk."""
+    build_registry = _build_registry()
+    expected = build_registry.render(build_registry.discover())
+    assert build_registry.REGISTRY_PATH.read_text(encoding="utf-8") == expected
+
+
+def test_registry_matches_site_names():
+    """Each registry entry names its module's Site class."""
+    for record in SCRAPERS:
+        module = importlib.import_module(record["module"])
+        assert module.Site.name == record["agency"]
+
+
+def test_get_all_scrapers():
+    """Agencies are grouped by state."""
+    scrapers = utils.get_all_scrapers()
+    slugs = [record["slug"] for record in scrapers["ca"]]
+    assert "ca_san_diego_pd" in slugs
+    oakland = next(r for r in scrapers["ca"] if r["slug"] == "ca_oakland_pd")
+    assert oakland["platform"] == "nextrequest"
+
+
+def test_get_all_scrapers_skips_imports():
+    """Listing agencies doesn't import any scraper code."""
+    probe = (
+        "import sys\n"
+        "from clean import utils\n"
+        "utils.get_all_scrapers()\n"
+        "print(any(m.startswith('clean.ca.') for m in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
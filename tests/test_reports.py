@@ -0,0 +1,73 @@
+import json
+import logging
+from unittest.mock import patch
+
+import pytest
+
+from clean.cache import Cache
+from clean.profiling import phase
+from clean.reports import RunRecorder, read_reports
+from clean.runner import Runner
+
+
+def test_recorder_collects_run(tmp_path):
+    """A report holds phases, cache totals, bytes written and logged errors."""
+    cache = Cache(tmp_path / "cache")
+    cache.write("ca_test_pd/index.html", "<html></html>")
+    with RunRecorder("ca_test_pd", "scrape-meta", tmp_path / "reports") as report:
+        with phase("fetch index"):
+            assert cache.is_fresh("ca_test_pd/index.html")
+            assert not cache.is_fresh("ca_test_pd/missing.html")
+            cache.write_json("ca_test_pd/out.json", [{"a": 1}])
+        logging.getLogger("clean.ca.test_pd").error("Page 2 is missing")
+        report["records"] = 1
+
+    assert report["ok"] is True
+    assert "fetch index" in report["phases"]
+    assert report["totals"]["cache_hits"] == 1
+    assert report["totals"]["cache_misses"] == 1
+    assert report["cache_hit_ratio"] == 0.5
+    assert report["totals"]["bytes_written"] > 0
+    assert report["errors"] == ["clean.ca.test_pd: Page 2 is missing"]
+    saved = read_reports(tmp_path / "reports", "ca_test_pd")
+    assert saved == [json.loads(json.dumps(report))]
+
+
+def test_runner_reports_failures(tmp_path):
+    """A failed scrape still leaves a report, with the error."""
+    runner = Runner(
+        data_dir=tmp_path / "exports",
+        cache_dir=tmp_path / "cache",
+        reports_dir=tmp_path / "reports",
+    )
+    with patch("clean.ca.san_diego_pd.Site.scrape_meta") as mock_scrape_meta:
+        export = tmp_path / "exports" / "ca_san_diego_pd.json"
+        mock_scrape_meta.return_value = export
+        export.parent.mkdir()
+        export.write_text(json.dumps([{"asset_url": "a"}, {"asset_url": "b"}]))
+        runner.scrape_meta("ca_san_diego_pd")
+        mock_scrape_meta.side_effect = ValueError("boom")
+        with pytest.raises(ValueError):
+            runner.scrape_meta("ca_san_diego_pd")
+
+    first, second = read_reports(tmp_path / "reports", "ca_san_diego_pd")
+    assert first["ok"] and first["records"] == 2
+    assert first["output"] == str(export)
+    assert not second["ok"]
+    assert second["errors"][-1] == "ValueError: boom"
+
+
+def test_parse_timing_only_while_reporting(tmp_path):
+    """Parsing is only timed for saved reports, and untimed again even on failure."""
+    from bs4 import BeautifulSoup
+
+    init = BeautifulSoup.__init__
+    with RunRecorder("ca_test_pd", "scrape-meta") as report:
+        assert BeautifulSoup.__init__ is init
+    assert report["phases"] == {}
+
+    with pytest.raises(ValueError):
+        with RunRecorder("ca_test_pd", "scrape-meta", tmp_path):
+            assert BeautifulSoup.__init__ is not init
+            raise ValueError("boom")
+    assert BeautifulSoup.__init__ is init
@@ -0,0 +1,63 @@
+from io import BytesIO
+
+import pytest
+import requests
+
+from clean import retries
+from clean.retries import RetryPolicy
+
+
+def _response(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.raw = BytesIO(b"")
+    response.headers.update(headers or {})
+    return response
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record waits instead of sleeping."""
+    calls = []
+    monkeypatch.setattr(retries.time, "sleep", calls.append)
+    return calls
+
+
+def test_permanent_status_fails_fast(sleeps):
+    """A 404 should come straight back without retrying."""
+    responses = iter([_response(404)])
+    response = RetryPolicy().call(lambda: next(responses), "https://example.com/")
+    assert response.status_code == 404
+    assert sleeps == []
+
+
+def test_retry_after_is_honoured(sleeps):
+    """A 429 with Retry-After should wait that long, then succeed."""
+    responses = iter([_response(429, {"Retry-After": "7"}), _response(200)])
+    response = RetryPolicy().call(lambda: next(responses), "https://example.com/")
+    assert response.status_code == 200
+    assert sleeps == [7.0]
+
+
+def test_total_wait_is_capped(sleeps):
+    """A Retry-After beyond the budget should give up and return the response."""
+    responses = iter([_response(503, {"Retry-After": "3600"})])
+    response = RetryPolicy(max_total=60).call(
+        lambda: next(responses), "https://example.com/"
+    )
+    assert response.status_code == 503
+    assert sleeps == []
+
+
+def test_connection_errors_retry_with_jitter(sleeps):
+    """Connection errors should be retried with jittered waits, then re-raised."""
+
+    def send():
+        raise requests.exceptions.ConnectionError("reset")
+
+    policy = RetryPolicy(tries=3, base_delay=2, max_delay=3)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        policy.call(send, "https://example.com/")
+    assert len(sleeps) == 2
+    assert 0 <= sleeps[0] <= 2
+    assert 0 <= sleeps[1] <= 3
@@ -16,3 +16,27 @@ def test_scrape_meta(runner):
         runner.scrape_meta("ca_san_diego_pd")
         # Assert that the scrape_meta method was called
         mock_scrape_meta.assert_called_once_with(throttle=0)
+
+
+def test_scrape_meta_many_reports_failures(runner):
+    # A failing agency should not stop the others from running
+    with patch("clean.ca.san_diego_pd.Site.scrape_meta") as mock_scrape_meta:
+        mock_scrape_meta.return_value = "ca_san_diego_pd.json"
+        results = runner.scrape_meta_many(["ca_san_diego_pd", "ca_not_a_real_pd"])
+
+    assert [r["agency"] for r in results] == ["ca_san_diego_pd", "ca_not_a_real_pd"]
+    assert results[0]["ok"] and results[0]["path"] == "ca_san_diego_pd.json"
+    assert not results[1]["ok"] and "ModuleNotFoundError" in results[1]["error"]
+
+
+def test_scrape_meta_profile(tmp_path):
+    runner = Runner(
+        data_dir=tmp_path / "exports",
+        cache_dir=tmp_path / "cache",
+        profile_dir=tmp_path / "profiles",
+    )
+    with patch("clean.ca.san_diego_pd.Site.scrape_meta"):
+        runner.scrape_meta("ca_san_diego_pd")
+    stats = list((tmp_path / "profiles").glob("ca_san_diego_pd-*.prof"))
+    assert len(stats) == 1
+    assert stats[0].with_suffix(".txt").exists()
@@ -0,0 +1,63 @@
+import http.server
+import threading
+
+from clean.sessions import SessionRegistry
+
+
+class CookieHandler(http.server.BaseHTTPRequestHandler):
+    """Set a cookie on a redirect and report which cookies came back."""
+
+    def do_GET(self):
+        if self.path == "/login":
+            self.send_response(302)
+            self.send_header("Set-Cookie", "session=abc; Path=/")
+            self.send_header("Location", "/page")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = (self.headers.get("Cookie") or "").encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_sessions_are_shared_per_host():
+    """One pooled session should be reused for every URL on a host."""
+    registry = SessionRegistry(pool_maxsize=4)
+    session = registry.get("https://example.com/a")
+    assert registry.get("https://EXAMPLE.com/b?page=2") is session
+    assert registry.get("https://example.org/a") is not session
+    assert registry.get("http://example.com/a") is not session
+    adapter = session.get_adapter("https://example.com/a")
+    assert adapter._pool_maxsize == 4
+
+
+def test_configure_rebuilds_sessions():
+    """Changing pool sizes should replace the existing sessions."""
+    registry = SessionRegistry()
+    session = registry.get("https://example.com/")
+    registry.configure(pool_maxsize=2, pool_connections=3)
+    rebuilt = registry.get("https://example.com/")
+    assert rebuilt is not session
+    adapter = rebuilt.get_adapter("https://example.com/")
+    assert adapter._pool_maxsize == 2
+    assert adapter._pool_connections == 3
+
+
+def test_cookies_last_for_one_request():
+    """Cookies set on a redirect reach the next hop but not the next call."""
+    server = http.server.HTTPServer(("127.0.0.1", 0), CookieHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    try:
+        session = SessionRegistry().get(base)
+        assert session.get(f"{base}/login").text == "session=abc"
+        assert not session.cookies
+        assert session.get(f"{base}/page").text == ""
+    finally:
+        server.shutdown()
+        server.server_close()
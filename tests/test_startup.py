@@ -0,0 +1,38 @@
+import json
+import subprocess
+import sys
+
+# Imported only when a scraper actually needs them
+HEAVY_MODULES = ("yt_dlp", "pytube", "us", "dotenv", "bs4")
+
+# Generous enough for a slow CI runner, tight enough to catch yt_dlp creeping back
+STARTUP_BUDGET = 1.5
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import clean.cli
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def _probe() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout)
+
+
+def test_cli_import_skips_heavy_modules():
+    """Importing the CLI doesn't load the YouTube, parsing or credential libraries."""
+    loaded = set(_probe()["modules"])
+    assert not loaded & set(HEAVY_MODULES)
+    assert not any(name.startswith("clean.ca.") for name in loaded)
+
+
+def test_cli_import_time():
+    """Importing the CLI stays within the startup budget."""
+    # Take the best of a few runs to smooth over a noisy machine
+    elapsed = min(_probe()["elapsed"] for _ in range(3))
+    assert elapsed < STARTUP_BUDGET